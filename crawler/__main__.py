@@ -0,0 +1,38 @@
+import argparse
+import importlib
+import sys
+
+# ==========================================
+# 🧭 통합 CLI: python -m crawler <명령> [옵션]
+# ==========================================
+# 명령 → (모듈, 설명). 모듈은 그 명령을 실행할 때만 import (도움말/짧은 명령은 바로 시작)
+COMMANDS = {
+    "crawl": ("crawler.cu_crawler", "편의점 행사상품 크롤링 (CU / GS25 / 7-Eleven)"),
+    "reprocess": ("crawler.reprocess", "보관된 원본 페이지를 다시 파싱/분류해 DB에 반영"),
+    "bench": ("crawler.bench", "저장된 응답으로 오프라인 벤치마크"),
+    "verify": ("crawler.selector_health", "저장된 응답으로 셀렉터/파서 점검"),
+    "history": ("crawler.history", "상품 하나의 가격/행사 이력 조회"),
+    "dedup": ("crawler.dedup", "GS25 임시 ID 중복 행 병합 (1회성)"),
+    "match": ("crawler.matching", "CU / GS25 / 7-Eleven 같은 상품 매칭 표 갱신"),
+    "db": ("crawler.storage", "로컬 SQLite 저장소 관리 (Supabase 복사 / Parquet 내보내기)"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m crawler", description="편의점 행사상품 크롤러",
+        epilog="명령별 옵션: python -m crawler <명령> --help",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", metavar="<명령>", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        commands.add_parser(name, help=help_text, add_help=False)
+    args, rest = parser.parse_known_args(argv)
+
+    module = importlib.import_module(COMMANDS[args.command][0])
+    sys.argv[0] = f"python -m crawler {args.command}"   # 하위 명령 도움말/오류의 prog 이름
+    result = module.main(rest)
+    return result if isinstance(result, int) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
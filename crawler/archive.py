@@ -0,0 +1,246 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstandard 미설치 시 zlib 프레임으로 저장
+    zstandard = None
+
+# ==========================================
+# 🗄️ 원본 페이지 아카이브 (append-only 압축 세그먼트 + 인덱스)
+# ==========================================
+# 비어 있으면(기본) 저장하지 않음. 예: CRAWLER_ARCHIVE_DIR=.cache/archive
+ARCHIVE_DIR = os.environ.get("CRAWLER_ARCHIVE_DIR", "")
+
+# 세그먼트 파일 하나의 최대 크기 (넘으면 다음 세그먼트로)
+SEGMENT_BYTES = 64 * 1024 * 1024
+
+INDEX_NAME = "index.jsonl"
+CODEC = "zstd" if zstandard else "zlib"
+
+
+def _segment_name(seg):
+    return f"segment-{seg:06d}.bin"
+
+
+def _compress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, 9)
+
+
+def _decompress(frame, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd 프레임을 읽으려면 zstandard 패키지가 필요합니다")
+        return zstandard.ZstdDecompressor().decompress(frame)
+    return zlib.decompress(frame)
+
+
+def page_key(brand, args):
+    """같은 목록 페이지를 가리키는 키 (최신 응답만 고를 때)"""
+    return brand + "\x1f" + json.dumps(sorted(args.items()), ensure_ascii=False)
+
+
+def list_key(brand, args):
+    """같은 목록(카테고리/행사 탭)을 가리키는 키 (args에서 page만 뺀 것)"""
+    return page_key(brand, {k: v for k, v in args.items() if k != "page"})
+
+
+class PageArchive:
+    """
+    크롤링한 원본 응답을 압축 프레임으로 세그먼트 파일 끝에만 덧붙이고,
+    index.jsonl에 한 줄씩 위치를 기록합니다.
+      {"brand": "cu", "args": {"raw_cat": "간편식사", "category": 10, "page": 1},
+       "at": 1700000000.0, "run": "1700000000-a1b2c3", "hash": "...", "seg": 0, "off": 1234, "len": 567, "size": 20480, "codec": "zlib"}
+    - run: 이 아카이브 객체(= 크롤러 프로세스 한 번)의 실행 ID
+    - 본문 해시가 이미 있는 페이지는 프레임을 다시 쓰지 않고 인덱스 줄만 추가합니다. (중복 제거)
+    - 읽기는 세그먼트를 mmap해서 프레임만 잘라 풀기 때문에 재처리/벤치마크 재생이 빠릅니다.
+    - save(brand, args, text)만 있으면 되므로 크롤러는 어떤 저장소인지 알 필요가 없습니다.
+      text 없이 부르면 (304 Not Modified) 같은 페이지의 마지막 프레임을 다시 가리키는 인덱스 줄만 추가합니다.
+    """
+
+    def __init__(self, directory=ARCHIVE_DIR, segment_bytes=SEGMENT_BYTES, codec=CODEC):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.codec = codec
+        self.run = f"{int(time.time())}-{os.urandom(3).hex()}"
+        self.saved = 0
+        self.deduped = 0
+        self.entries = []
+        self._frames = {}     # hash → (seg, off, len, codec)
+        self._last = {}       # page_key → 마지막 본문 (hash, size) (304 응답용)
+        self._maps = {}       # seg → (file, mmap)
+        self._lock = threading.Lock()
+        self._segment = 0
+        self._segment_file = None
+        self._index_file = None
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.directory, INDEX_NAME), encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # 강제 종료로 잘린 마지막 줄
+            self.entries.append(entry)
+            self._frames.setdefault(entry["hash"], (entry["seg"], entry["off"], entry["len"], entry["codec"]))
+            self._last[page_key(entry["brand"], entry["args"])] = (entry["hash"], entry["size"])
+            self._segment = max(self._segment, entry["seg"])
+
+    # --- 쓰기 ---
+    def _open_segment(self, size):
+        path = os.path.join(self.directory, _segment_name(self._segment))
+        if self._segment_file is None:
+            self._segment_file = open(path, "ab")
+        if self._segment_file.tell() and self._segment_file.tell() + size > self.segment_bytes:
+            self._segment_file.close()
+            self._segment += 1
+            self._segment_file = open(os.path.join(self.directory, _segment_name(self._segment)), "ab")
+        return self._segment_file
+
+    def save(self, brand, args, text=None):
+        """페이지 하나를 기록. text가 None이면 같은 페이지의 마지막 본문을 다시 가리킴 (없으면 False)"""
+        key = page_key(brand, args)
+        data = digest = None
+        if text is not None:
+            data = text.encode("utf-8")
+            digest, size = hashlib.blake2b(data, digest_size=16).hexdigest(), len(data)
+        with self._lock:
+            if digest is None:
+                if key not in self._last:
+                    return False
+                digest, size = self._last[key]
+            frame = self._frames.get(digest)
+            if frame is None:
+                blob = _compress(data, self.codec)
+                f = self._open_segment(len(blob))
+                frame = (self._segment, f.tell(), len(blob), self.codec)
+                f.write(blob)
+                f.flush()   # 인덱스가 가리키는 프레임은 항상 디스크에 먼저
+                self._frames[digest] = frame
+            else:
+                self.deduped += 1
+            seg, off, length, codec = frame
+            entry = {"brand": brand, "args": args, "at": time.time(), "run": self.run, "hash": digest,
+                     "seg": seg, "off": off, "len": length, "size": size, "codec": codec}
+            if self._index_file is None:
+                self._index_file = open(os.path.join(self.directory, INDEX_NAME), "a", encoding="utf-8")
+            self._index_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._index_file.flush()
+            self.entries.append(entry)
+            self._last[key] = (digest, size)
+            self.saved += 1
+        return True
+
+    # --- 읽기 ---
+    def pages(self, brands=None, latest=True):
+        """
+        인덱스 항목. latest면 목록(카테고리/행사 탭)마다 페이지별 가장 최근 응답을 페이지 순서대로 (목록은 처음 본 순서).
+        목록이 줄었으면 최근 실행의 빈 페이지가 예전 실행의 뒤쪽 페이지보다 앞에 오므로,
+        재처리가 첫 빈 페이지에서 멈추면 지금 목록(마지막으로 끝까지 본 목록)만 남습니다.
+        증분 실행이 건너뛴 뒤쪽 페이지는 그 전 실행의 응답으로 채웁니다. (상품이 페이지를 옮겼으면 재처리에서 최신 값 우선)
+        """
+        entries = [e for e in self.entries if not brands or e["brand"] in brands]
+        if not latest:
+            return entries
+        lists = {}
+        for e in entries:
+            newest = lists.setdefault(list_key(e["brand"], e["args"]), {})
+            page = e["args"].get("page", 0)
+            if page not in newest or e["at"] >= newest[page]["at"]:
+                newest[page] = e
+        return [newest[page] for newest in lists.values() for page in sorted(newest)]
+
+    def _view(self, seg, end):
+        cached = self._maps.get(seg)
+        if cached is None or len(cached[1]) < end:
+            # 쓰는 중인 세그먼트가 그새 커졌으면 다시 매핑
+            if cached is not None:
+                cached[1].close()
+                cached[0].close()
+            f = open(os.path.join(self.directory, _segment_name(seg)), "rb")
+            cached = self._maps[seg] = (f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        return cached[1]
+
+    def read(self, entry):
+        """항목의 원본 본문 (str)"""
+        with self._lock:
+            if self._segment_file is not None:
+                self._segment_file.flush()
+            view = self._view(entry["seg"], entry["off"] + entry["len"])
+            frame = view[entry["off"]:entry["off"] + entry["len"]]
+        return _decompress(frame, entry["codec"]).decode("utf-8")
+
+    def load(self, entry):
+        """reprocess용: {"brand", "args", "text"}"""
+        return {"brand": entry["brand"], "args": entry["args"], "text": self.read(entry)}
+
+    def summary(self):
+        return f"원본 저장 {self.saved}건 (중복 {self.deduped}건은 인덱스만)"
+
+    def close(self):
+        with self._lock:
+            for f in (self._segment_file, self._index_file):
+                if f is not None:
+                    f.close()
+            self._segment_file = self._index_file = None
+            for f, view in self._maps.values():
+                view.close()
+                f.close()
+            self._maps = {}
+
+
+_ARCHIVES = {}
+_ARCHIVES_LOCK = threading.Lock()
+
+
+def open_archive(directory=ARCHIVE_DIR):
+    """
+    프로세스 안에서 디렉터리별 PageArchive 하나를 공유합니다.
+    (병렬로 도는 브랜드 크롤러가 같은 세그먼트에 덧붙이고, 재처리 워커는 mmap을 재사용)
+    """
+    with _ARCHIVES_LOCK:
+        archive = _ARCHIVES.get(directory)
+        if archive is None:
+            archive = _ARCHIVES[directory] = PageArchive(directory)
+        return archive
+
+
+def response_saver(archive, brand, args, encoding=None):
+    """
+    fetch_parsed(on_response=...)에 넘길 콜백. 캐시 적중(304/같은 본문)으로 파싱을 건너뛴 페이지도 보관되도록
+    응답마다 부릅니다. 200은 본문, 304는 같은 페이지의 마지막 본문을 가리킴. archive가 없으면 None
+    """
+    if not archive:
+        return None
+
+    def save(r):
+        if r.status_code == 200:
+            if encoding: r.encoding = encoding
+            archive.save(brand, args, r.text)
+        elif r.status_code == 304:
+            archive.save(brand, args)
+    return save
+
+
+def default_archive():
+    """CRAWLER_ARCHIVE_DIR이 없으면 None (원본 저장 안 함)"""
+    if ARCHIVE_DIR.lower() in ("", "0", "off", "none"):
+        return None
+    try:
+        return open_archive(ARCHIVE_DIR)
+    except OSError as e:
+        print(f"⚠️ 원본 페이지 아카이브 사용 불가: {e}")
+        return None
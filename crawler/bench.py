@@ -0,0 +1,512 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from crawler.archive import PageArchive
+from crawler.classifier import CU_CLASSIFIER, SEVEN_CLASSIFIER
+from crawler.cu_crawler import (BRAND_LIMITS, crawl_cu, crawl_gs25, parse_cu_page,
+                                parse_gs25_results)
+from crawler.fetcher import FetchEngine, create_session
+from crawler.reprocess import PAGE_PARSERS
+from crawler.selector_health import FIXTURES_DIR
+from crawler.seven_crawler import crawl_seven, parse_seven_page
+from crawler.storage import LocalClient
+from crawler.writer import BulkWriter
+
+# ==========================================
+# ⏱️ 오프라인 벤치마크 (저장된 응답 스텁 서버 + 메모리 DB)
+# ==========================================
+# 긴 숫자(상품 ID/바코드)를 바꿔 페이지마다 다른 상품처럼 보이게 함
+_ID_RE = re.compile(r"\d{6,}")
+
+
+def _vary_ids(text, salt):
+    if not salt: return text
+    return _ID_RE.sub(lambda m: str(int(m.group()) + salt), text)
+
+
+def _form_int(form, name, default=1):
+    try:
+        return int(form.get(name, [default])[0])
+    except (TypeError, ValueError):
+        return default
+
+
+def _route(method, path, form, pages):
+    """
+    요청 → (fixture 파일명, ID salt). 모르는 경로면 None.
+    목록은 pages 페이지까지 채워서 주고 그 뒤로는 빈 페이지를 줍니다.
+    """
+    if method == "POST" and path == "/product/productAjax.do":
+        page, cat = _form_int(form, "pageIndex"), _form_int(form, "searchMainCategory")
+        if page > pages: return "cu_productAjax_empty.html", 0
+        return "cu_productAjax_p1.html", cat * 10000 + page * 10
+    if method == "GET" and path == "/gscvs/ko/products/event-goods":
+        return "gs25_event_goods.html", 0
+    if method == "POST" and path == "/gscvs/ko/products/event-goods-search":
+        page = _form_int(form, "pageNum")
+        if page > pages: return "gs25_event_goods_search_empty.json", 0
+        promo = 2 if form.get("parameterList", [""])[0] == "TWO_TO_ONE" else 1
+        return "gs25_event_goods_search_p1.json", promo * 10000 + page * 10
+    if method == "POST" and path == "/product/dosirakNewMoreAjax.asp":
+        page = _form_int(form, "intCurrPage")
+        if page > pages: return "seven_listMoreAjax_empty.html", 0
+        return "seven_dosirakNewMoreAjax_p1.html", page * 10
+    if method == "POST" and path == "/product/listMoreAjax.asp":
+        page, tab = _form_int(form, "intCurrPage"), _form_int(form, "pTab")
+        if page > pages: return "seven_listMoreAjax_empty.html", 0
+        return "seven_listMoreAjax_tab1_p1.html", tab * 10000 + page * 10
+    return None
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 재사용까지 실제와 비슷하게
+
+    def do_GET(self):
+        self._serve("GET")
+
+    def do_POST(self):
+        self._serve("POST")
+
+    def _serve(self, method):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode("utf-8")) if length else {}
+        path = urlsplit(self.path).path
+
+        if stub.latency: time.sleep(stub.latency)
+        route = _route(method, path, form, stub.pages)
+        if route is None:
+            status, body = 404, b"not found"
+        elif stub.should_fail():
+            status, body = 500, b"stub error"
+        else:
+            status, body = 200, _vary_ids(stub.fixture(route[0]), route[1]).encode("utf-8")
+        stub.record(path, status, len(body))
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8" if path.endswith("-search")
+                         else "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """
+    fixtures/의 응답을 CU/GS25/7-Eleven 경로 그대로 돌려주는 로컬 HTTP 서버.
+    - pages: 목록마다 채워진 페이지 수 (그 다음 페이지는 빈 응답)
+    - latency: 응답마다 추가 지연(초)
+    - error_rate: 500 응답을 돌려줄 확률 (seed로 재현 가능)
+    """
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, pages=5, latency=0.0, error_rate=0.0, seed=0):
+        self.fixtures_dir = fixtures_dir
+        self.pages = pages
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = {}
+        self.errors = 0
+        self.bytes_sent = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._fixtures = {}
+        self._httpd = None
+        self._thread = None
+
+    def fixture(self, name):
+        if name not in self._fixtures:
+            with open(os.path.join(self.fixtures_dir, name), encoding="utf-8") as f:
+                self._fixtures[name] = f.read()
+        return self._fixtures[name]
+
+    def should_fail(self):
+        if not self.error_rate: return False
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def record(self, path, status, size):
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            self.bytes_sent += size
+            if status >= 500: self.errors += 1
+
+    def total_requests(self):
+        with self._lock:
+            return sum(self.requests.values())
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ==========================================
+# 🧪 메모리 Supabase (table().upsert/update/select ... execute() 흉내)
+# ==========================================
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _MemoryQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.action = "select"
+        self.payload = None
+        self.on_conflict = None
+        self.filters = []
+        self.order_by = []
+        self.bounds = None
+
+    def select(self, columns="*"):
+        self.action = "select"
+        return self
+
+    def upsert(self, rows, on_conflict=""):
+        self.action, self.payload, self.on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def insert(self, rows):
+        self.action, self.payload = "insert", rows
+        return self
+
+    def update(self, values):
+        self.action, self.payload = "update", values
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda r: r.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda r: r.get(column) in values)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda r: r.get(column) is not None and r.get(column) >= value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda r: r.get(column) is not None and r.get(column) < value)
+        return self
+
+    def or_(self, expression):
+        # 벤치마크에서는 쓰레기 데이터 정리 조건을 해석하지 않음 (아무 행도 매칭 안 됨)
+        self.filters.append(lambda r: False)
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by.append((column, desc))
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def execute(self):
+        return self.db._execute(self)
+
+
+class MemorySupabase:
+    """
+    크롤러가 쓰는 supabase 클라이언트 체인만 구현한 메모리 저장소.
+    latency만큼 execute()마다 지연을 넣어 네트워크 왕복을 흉내 냅니다.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.tables = {}
+        self.calls = 0
+        self.rows_written = 0
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return _MemoryQuery(self, name)
+
+    def rows(self, table="new_products"):
+        with self._lock:
+            return list(self.tables.get(table, {}).values())
+
+    def _execute(self, q):
+        if self.latency: time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+            store = self.tables.setdefault(q.table, {})
+            if q.action in ("upsert", "insert"):
+                rows = q.payload if isinstance(q.payload, list) else [q.payload]
+                cols = [c for c in (q.on_conflict or "").split(",") if c]
+                for row in rows:
+                    key = tuple(row.get(c) for c in cols) if cols else len(store)
+                    store[key] = dict(store.get(key, {}), **row)
+                self.rows_written += len(rows)
+                return _Result(rows)
+            matched = [(k, r) for k, r in store.items() if all(f(r) for f in q.filters)]
+            if q.action == "update":
+                for _, r in matched: r.update(q.payload)
+                return _Result([r for _, r in matched])
+            if q.action == "delete":
+                for k, _ in matched: del store[k]
+                return _Result([r for _, r in matched])
+            data = [dict(r) for _, r in matched]
+            for column, desc in reversed(q.order_by):   # 안정 정렬: 뒤 키부터
+                data.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+            if q.bounds:
+                data = data[q.bounds[0]:q.bounds[1] + 1]
+            return _Result(data)
+
+
+# ==========================================
+# 🏃 측정
+# ==========================================
+PARSE_CASES = {
+    "cu": ("cu_productAjax_p1.html", lambda t: parse_cu_page(t, "간편식사")),
+    "gs25": ("gs25_event_goods_search_p1.json", lambda t: parse_gs25_results(t, "ONE_TO_ONE")),
+    "seven": ("seven_listMoreAjax_tab1_p1.html", lambda t: parse_seven_page(t, None)),
+}
+
+# 저장소: memory = MemorySupabase(db_latency 지연), sqlite = 메모리 SQLite LocalClient (실제 SQL Upsert 비용)
+SINKS = ("memory", "sqlite")
+
+
+def open_sink(sink="memory", db_latency=0.0):
+    return LocalClient(":memory:") if sink == "sqlite" else MemorySupabase(latency=db_latency)
+
+
+BRAND_RUNNERS = {
+    "cu": lambda db, engine, base: crawl_cu(db, {}, engine, cache=False, base_url=base),
+    "gs25": lambda db, engine, base: crawl_gs25(db, {}, engine, cache=False, base_url=base),
+    "seven": lambda db, engine, base: crawl_seven(db, {}, engine, cache=False, base_url=base),
+}
+
+
+def _read_fixture(fixtures_dir, name):
+    with open(os.path.join(fixtures_dir, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def bench_parsers(fixtures_dir=FIXTURES_DIR, repeat=50):
+    """브랜드별 목록 한 페이지 파싱(분류 포함) 평균 ms"""
+    result = {}
+    for brand, (name, parse) in PARSE_CASES.items():
+        text = _read_fixture(fixtures_dir, name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                parse(text)
+        result[brand] = (time.perf_counter() - started) * 1000 / repeat
+    return result
+
+
+def bench_classifier(fixtures_dir=FIXTURES_DIR, repeat=200):
+    """fixture에서 나온 상품명으로 분류기 한 번 호출당 평균 µs"""
+    titles = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, parse in PARSE_CASES.values():
+            titles.extend(p["title"] for p in parse(_read_fixture(fixtures_dir, name)) or [])
+    result = {}
+    for brand, classifier in (("cu", CU_CLASSIFIER), ("seven", SEVEN_CLASSIFIER)):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for title in titles:
+                classifier.classify(title)
+        result[brand] = (time.perf_counter() - started) * 1e6 / (repeat * len(titles))
+    return result
+
+
+def bench_replay(archive_dir, brands=None):
+    """원본 페이지 아카이브(crawler/archive.py) 재생: mmap 읽기+압축 해제와 파싱(분류 포함) 시간"""
+    archive = PageArchive(archive_dir)
+    entries = [e for e in archive.pages(brands) if e["brand"] in PAGE_PARSERS]
+    read_s = parse_s = 0.0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for e in entries:
+            started = time.perf_counter()
+            text = archive.read(e)
+            read_s += time.perf_counter() - started
+            started = time.perf_counter()
+            PAGE_PARSERS[e["brand"]](text, e["args"])
+            parse_s += time.perf_counter() - started
+    archive.close()
+    total = read_s + parse_s
+    return {
+        "pages": len(entries),
+        "read_ms_per_page": read_s * 1000 / len(entries) if entries else 0.0,
+        "parse_ms_per_page": parse_s * 1000 / len(entries) if entries else 0.0,
+        "pages_per_s": len(entries) / total if total else 0.0,
+    }
+
+
+def bench_writer(rows=2000, db_latency=0.01, sink="memory"):
+    """BulkWriter로 합성 행을 메모리 DB에 upsert 했을 때 rows/s"""
+    db = open_sink(sink, db_latency)
+    data = [{
+        "title": f"벤치 상품 {i}", "price": 1000 + i, "image_url": f"https://example.invalid/{i}.jpg",
+        "category": "간편식사", "original_category": "간편식사", "promotion_type": "1+1",
+        "brand_id": 1, "source_url": "", "is_active": True, "external_id": i, "is_new": False,
+    } for i in range(rows)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = BulkWriter(db, label="bench").write(data)
+    return stats["written"] / stats["seconds"] if stats["seconds"] else 0.0
+
+
+def bench_crawl(brand, server, db_latency=0.01, pacing=True, verbose=False, sink="memory"):
+    """스텁 서버를 상대로 브랜드 크롤러 전체를 한 번 실행"""
+    limits = BRAND_LIMITS[brand]
+    engine = FetchEngine(create_session(limits["headers"]), max_workers=limits["max_workers"],
+                         per_host=limits["per_host"], rate=limits["rate"] if pacing else None,
+                         max_rate=limits["max_rate"], name=brand)
+    db = open_sink(sink, db_latency)
+    before, errors_before = server.total_requests(), server.errors
+
+    out = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with out:
+        started = time.perf_counter()
+        BRAND_RUNNERS[brand](db, engine, server.base_url)
+        seconds = time.perf_counter() - started
+
+    pages = server.total_requests() - before
+    return {
+        "pages": pages,
+        "seconds": seconds,
+        "pages_per_s": pages / seconds if seconds else 0.0,
+        "rows_stored": len(db.rows()),
+        "http_errors": server.errors - errors_before,
+    }
+
+
+def run_benchmark(brands=("cu", "gs25", "seven"), pages=5, latency=0.02, error_rate=0.0, db_latency=0.01,
+                  repeat=50, pacing=True, seed=0, fixtures_dir=FIXTURES_DIR, verbose=False, archive=None,
+                  sink="memory"):
+    params = {"brands": list(brands), "pages": pages, "latency": latency, "error_rate": error_rate,
+              "db_latency": db_latency, "repeat": repeat, "pacing": pacing, "seed": seed, "archive": archive,
+              "sink": sink}
+    result = {
+        "meta": {"commit": _git_commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "python": platform.python_version(), "params": params},
+        "parse_ms_per_page": bench_parsers(fixtures_dir, repeat),
+        "classifier_us_per_title": bench_classifier(fixtures_dir, repeat * 4),
+        "upsert_rows_per_s": bench_writer(db_latency=db_latency, sink=sink),
+        "crawl": {},
+    }
+    with StubServer(fixtures_dir, pages=pages, latency=latency, error_rate=error_rate, seed=seed) as server:
+        for brand in brands:
+            result["crawl"][brand] = bench_crawl(brand, server, db_latency, pacing, verbose, sink)
+    if archive:
+        result["replay"] = bench_replay(archive, brands)
+    return result
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def flatten(result, prefix=""):
+    """meta를 뺀 숫자 지표를 'crawl.cu.pages_per_s' 같은 평면 dict로"""
+    flat = {}
+    for key, value in result.items():
+        if key == "meta": continue
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def print_report(result, baseline=None):
+    base = flatten(baseline) if baseline else {}
+    for name, value in flatten(result).items():
+        line = f" {name:<36} {value:>12.3f}"
+        if base.get(name):
+            line += f"  ({(value - base[name]) / base[name] * 100:+.1f}%)"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="저장된 응답으로 크롤링 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--brands", default="cu,gs25,seven", help="측정할 브랜드 (쉼표 구분)")
+    parser.add_argument("--pages", type=int, default=5, help="목록마다 채워진 페이지 수")
+    parser.add_argument("--latency", type=float, default=0.02, help="스텁 서버 응답 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="스텁 서버 500 응답 비율")
+    parser.add_argument("--db-latency", type=float, default=0.01, help="메모리 DB execute() 지연(초)")
+    parser.add_argument("--repeat", type=int, default=50, help="파싱/분류 측정 반복 횟수")
+    parser.add_argument("--no-pacing", action="store_true", help="브랜드별 요청 간격 제한 끄기")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--verbose", action="store_true", help="크롤러 로그 출력")
+    parser.add_argument("--archive", help="재생할 원본 페이지 아카이브 디렉터리 (실제 크롤링 응답으로 파싱 측정)")
+    parser.add_argument("--sink", choices=SINKS, default="memory",
+                        help="저장소 (memory: 지연만 흉내 / sqlite: 로컬 SQLite에 실제 Upsert)")
+    args = parser.parse_args(argv)
+
+    brands = [b.strip() for b in args.brands.split(",") if b.strip()]
+    unknown = [b for b in brands if b not in BRAND_RUNNERS]
+    if unknown:
+        parser.error(f"알 수 없는 브랜드: {', '.join(unknown)}")
+
+    result = run_benchmark(brands, args.pages, args.latency, args.error_rate, args.db_latency,
+                           args.repeat, not args.no_pacing, args.seed, verbose=args.verbose, archive=args.archive,
+                           sink=args.sink)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print(f"⏱️ 벤치마크 결과 ({result['meta']['commit'] or 'unknown'})")
+    print_report(result, baseline)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"💾 {args.out} 저장")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+# ==========================================
+# 📍 크롤링 체크포인트 (중단된 실행을 이어서)
+# ==========================================
+CHECKPOINT_PATH = os.environ.get("CRAWLER_CHECKPOINT", ".cache/checkpoint.jsonl")
+
+# 이보다 오래된 미완료 실행은 이어받지 않고 새로 시작 (어제 데이터와 섞이지 않도록)
+CHECKPOINT_MAX_AGE = 12 * 60 * 60
+
+
+class CheckpointJournal:
+    """
+    실행 하나의 진행 상황을 JSON lines로 덧붙여 기록합니다.
+      {"event": "start", "run": ..., "at": ..., "brands": ["cu", "gs25"]}
+      {"event": "page", "brand": "cu", "job": "10", "page": 3, "flushed": 120}
+          → 해당 job의 3페이지까지 모든 행이 DB에 저장됨 (flushed = 그 시점까지 저장된 행 수)
+      {"event": "job", "brand": "cu", "job": "10", "outcome": "end"}
+      {"event": "finished", "brand": "cu"}
+    resume=True면 마지막 실행이 아직 안 끝났고 CHECKPOINT_MAX_AGE 이내일 때 그 상태를 이어받고,
+    아니면 파일을 비우고 새 실행을 시작합니다.
+    """
+
+    def __init__(self, path=CHECKPOINT_PATH, resume=False, brands=(), max_age=CHECKPOINT_MAX_AGE):
+        self.path = path
+        self.run = None
+        self.brands = list(brands)
+        self.pages = {}
+        self.jobs = {}
+        self.finished = set()
+        self.resumed_brands = set()
+        self._lock = threading.Lock()
+
+        if resume:
+            self._load(max_age)
+        if self.run is None:
+            self.pages, self.jobs, self.finished = {}, {}, set()
+        self.resumed_brands = {b for b, _ in self.pages} | {b for b, _ in self.jobs} | self.finished
+
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._file = open(path, "a" if self.run else "w", encoding="utf-8")
+        if self.run is None:
+            self.run = uuid.uuid4().hex[:12]
+            self._append({"event": "start", "run": self.run, "at": time.time(), "brands": self.brands})
+
+    def _load(self, max_age):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        started = None
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # 강제 종료로 잘린 마지막 줄
+            event = entry.get("event")
+            if event == "start":
+                self.run, started = entry.get("run"), entry.get("at", 0)
+                run_brands = set(entry.get("brands") or [])
+                self.pages, self.jobs, self.finished = {}, {}, set()
+            elif event == "page":
+                key = (entry["brand"], entry["job"])
+                self.pages[key] = max(self.pages.get(key, 0), entry["page"])
+            elif event == "job":
+                self.jobs[(entry["brand"], entry["job"])] = entry["outcome"]
+            elif event == "finished":
+                self.finished.add(entry["brand"])
+
+        if self.run is None:
+            return
+        touched = {b for b, _ in self.pages} | {b for b, _ in self.jobs}
+        if time.time() - (started or 0) > max_age or (run_brands | touched) <= self.finished:
+            self.run = None  # 오래됐거나 이미 끝난 실행
+
+    def _append(self, entry):
+        with self._lock:
+            if self._file.closed: return  # 시간 초과로 남은 브랜드 스레드의 늦은 기록
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def resumed(self, brand):
+        """이 브랜드가 이전 실행에서 이어받은 상태가 있는지 (있으면 사라진 상품 비활성화 생략)"""
+        return brand in self.resumed_brands
+
+    def start_page(self, brand, job):
+        """이어서 시작할 페이지 번호 (기록이 없으면 1)"""
+        return self.pages.get((brand, str(job)), 0) + 1
+
+    def job_done(self, brand, job):
+        return (brand, str(job)) in self.jobs
+
+    def brand_finished(self, brand):
+        return brand in self.finished
+
+    def page(self, brand, job, page, flushed=None):
+        with self._lock:
+            key = (brand, str(job))
+            if page <= self.pages.get(key, 0):
+                return
+            self.pages[key] = page
+        self._append({"event": "page", "brand": brand, "job": str(job), "page": page, "flushed": flushed})
+
+    def page_marker(self, brand, job, page):
+        """ProductPipeline.mark에 넘길 callback (저장이 끝나면 page 기록)"""
+        return lambda written: self.page(brand, job, page, written)
+
+    def job_marker(self, brand, job, outcome="end"):
+        return lambda written: self.job(brand, job, outcome)
+
+    def job(self, brand, job, outcome):
+        self.jobs[(brand, str(job))] = outcome
+        self._append({"event": "job", "brand": brand, "job": str(job), "outcome": outcome})
+
+    def finish(self, brand):
+        self.finished.add(brand)
+        self._append({"event": "finished", "brand": brand})
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def open_checkpoint(resume=False, brands=(), path=CHECKPOINT_PATH):
+    """CRAWLER_CHECKPOINT=off 이거나 파일을 열 수 없으면 None (체크포인트 없이 진행)"""
+    if not path or path.lower() in ("0", "off", "none"):
+        return None
+    try:
+        journal = CheckpointJournal(path, resume=resume, brands=brands)
+    except OSError as e:
+        print(f"⚠️ 체크포인트 사용 불가: {e}")
+        return None
+    if journal.resumed_brands:
+        print(f"📍 체크포인트 이어받기 (run {journal.run}): {', '.join(sorted(journal.resumed_brands))}")
+    return journal
@@ -0,0 +1,188 @@
+import re
+from bisect import bisect_right
+
+# ==========================================
+# 🧠 컴파일된 카테고리 분류기 (키워드 테이블 공용)
+# ==========================================
+# 규칙 리스트의 순서가 곧 우선순위입니다. (위쪽 규칙이 먼저 적용)
+# - keywords: 제목에 포함되면 해당 카테고리
+# - pattern: 추가 정규식 (있으면 키워드와 OR)
+# - suffixes: 제목이 이 문자열로 끝나면 해당 카테고리
+
+# CU 원본 카테고리 → 표준 카테고리 (None = 수집 제외)
+CU_RAW_CATEGORIES = {
+    "간편식사": "간편식사",
+    "과자류": "과자류",
+    "아이스크림": "아이스크림",
+    "음료": "음료",
+    "생활용품": "생활용품",
+    "식품": "식품",
+    "즉석조리": None,
+}
+
+CU_RULES = [
+    {"category": "생활용품", "keywords": ['치약', '칫솔', '가글', '가그린', '페리오', '메디안', '2080', '리치', '덴탈', '마우스', '쉐이빙', '면도기', '물티슈', '티슈', '마스크', '생리대', '중형', '대형', '소형', '오버나이트', '입는오버', '패드', '라이너', '탐폰', '팬티', '라엘', '쏘피', '화이트', '좋은느낌', '시크릿데이', '애니데이', '디어스킨', '순수한면', '샴푸', '린스', '트리트먼트', '헤어', '세럼', '비누', '엘라스틴', '케라시스', '오가니스트', '온더바디', '바디워시', '로션', '핸드크림', '수딩젤', '클렌징', '워터마이드', '에센셜', '존슨즈', '아비노', '니베아', '메디힐', '립케어', '오일', '세제', '락스', '슈가버블', '무균무때', '퐁퐁', '피지', '건전지', '스타킹', '밴드', '일회용', '제거', '클린핏', '우산', '양말', '바디']},
+    {"category": "간편식사", "keywords": ['도시락', '김밥', '주먹밥', '샌드위치', '햄버거', '버거', '샐러드', '죽', '컵반', '비빔밥']},
+    {"category": "식품", "pattern": r'바\s*\d+g', "keywords": ['라면', '면', '우동', '국밥', '탕', '찌개', '국', '햇반', '핫바', '소시지', '후랑크', '만두', '닭가슴살', '치킨', '육개장', '베이컨', '스테이크', '육포', '어묵', '크랩', '튀김', '브리또', '파스타', '직화', '꼬치', '떡볶이', '3XL', '킬바사', '오징어', '밥바']},
+    {"category": "과자류", "keywords": ['스낵', '젤리', '사탕', '껌', '초코', '쿠키', '칩', '빵', '케익', '약과', '양갱', '프레첼', '팝콘', '아몬드', '맛밤', '말차빵', '허쉬', '그릭요거트', '오팜', '푸딩', '디저트', '킷캣', '도넛', '크런키', '자유시간']},
+    {"category": "아이스크림", "keywords": ['하겐', '소르베', '라라스윗', '나뚜루', '벤앤', '아이스', '콘', '파인트', '설레임', '폴라포', '스크류', '돼지바', '빙수', '샤베트', '찰옥수수', '미니컵', '비비빅', '메로나', '누가바', '쌍쌍바', '바밤바', '옥동자', '와일드바디', '붕어싸만코', '더위사냥', '빵빠레', '구슬', '탱크보이', '빠삐코', '요맘때', '쿠앤크', '수박바', '죠스바', '제로윗', '로우윗', '서주', '동그린', '삼우', '파르페', '쿨리쉬']},
+    {"category": "음료", "keywords": ['우유', '커피', '라떼', '아메리카노', '콜라', '사이다', '에이드', '주스', '보리차', '옥수수수염차', '비타', '박카스', '쌍화', '두유', '요구르트', '요거트', '물', '워터', '프로틴', '콤부차', '드링크', '이온', '티', 'TEA', '바리스타', '콘트라', '카페', '마이노멀', '서울FB', '맥주', '하이볼']},
+]
+
+# 세븐일레븐 (기존 로직 유지: 분류 결과와 키워드가 CU와 다름)
+SEVEN_RAW_CATEGORIES = {"간편식사": "간편식사"}
+
+SEVEN_RULES = [
+    {"category": "생활용품", "keywords": ['치약', '칫솔', '가글', '생리대', '샴푸', '린스', '면도기', '물티슈', '마스크', '스타킹', '건전지', '비누', '로션', '립케어', '세제', '락스', '우산', '양말']},
+    {"category": "간편식사", "keywords": ['도시락', '김밥', '주먹밥', '샌드위치', '햄버거', '버거', '샐러드']},
+    {"category": "식품", "pattern": r'바\s*\d+g', "keywords": ['라면', '우동', '국수', '햇반', '핫바', '후랑크', '소시지', '만두', '치킨', '육개장', '죽', '탕', '찌개']},
+    {"category": "과자류", "keywords": ['스낵', '젤리', '사탕', '껌', '초코', '쿠키', '칩', '빵', '약과', '양갱', '팝콘', '아몬드']},
+    {"category": "아이스", "suffixes": ['바'], "keywords": ['하겐', '소르베', '나뚜루', '아이스', '콘', '파인트', '설레임', '폴라포', '스크류', '돼지바', '빙수', '구슬', '빵빠레']},
+    {"category": "음료", "keywords": ['우유', '커피', '라떼', '콜라', '사이다', '에이드', '주스', '보리차', '비타', '박카스', '두유', '요거트', '물', '워터', '맥주', '하이볼']},
+]
+
+# 배치 분류 시 제목을 이어붙일 구분자 (제목에 등장하지 않고 \s 에도 걸리지 않는 문자)
+_SEP = "\x00"
+
+
+def _trie_regex(words):
+    """
+    키워드들을 접두사 트리 형태의 정규식으로 만듭니다.
+    같은 위치에서 여러 키워드가 맞으면 가장 긴 키워드가 잡힙니다.
+    """
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def emit(node):
+        terminal = "" in node
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            body = ("(?:" + body + ")" if len(branches) == 1 else body) + "?"
+        return body
+
+    return emit(trie)
+
+
+class CategoryClassifier:
+    """
+    규칙 테이블을 한 번만 컴파일해 두고, 제목 하나를 한 번의 스캔으로 분류합니다.
+
+    모든 키워드를 하나의 정규식(트리 구조 alternation)으로 합쳐 키워드가 시작되는
+    모든 위치에서 '가장 긴 키워드'를 찾고, 그 키워드와 그 접두사 키워드들의 최고 우선순위를
+    미리 계산해 둔 표로 조회합니다. 결과는 규칙을 위에서부터 any()로 검사하던
+    기존 방식과 정확히 같습니다.
+    """
+
+    def __init__(self, rules, raw_categories=None, default="기타"):
+        self.rules = rules
+        self.raw_categories = raw_categories or {}
+        self.default = default
+        self.categories = [r["category"] for r in rules]
+
+        # 키워드 → 우선순위 (여러 규칙에 있으면 가장 높은 우선순위)
+        priority = {}
+        for idx, rule in enumerate(rules):
+            for k in rule.get("keywords", []):
+                priority.setdefault(k, idx)
+        # 어떤 키워드가 맞으면 그 키워드의 접두사 키워드도 같은 위치에서 맞는다
+        self._best = {
+            k: min(p for w, p in priority.items() if k.startswith(w))
+            for k in priority
+        }
+        self._regex = re.compile(_trie_regex(priority)) if priority else None
+
+        # 정규식/접미사 규칙은 키워드 결과보다 우선순위가 높을 때만 검사
+        self._extras = []
+        for idx, rule in enumerate(rules):
+            pattern = re.compile(rule["pattern"]) if rule.get("pattern") else None
+            suffixes = tuple(rule.get("suffixes", ()))
+            if pattern or suffixes:
+                self._extras.append((idx, pattern, suffixes))
+
+    def _matches(self, text):
+        # 겹치는 키워드도 놓치지 않도록 매 매치 시작 위치 +1 부터 다시 검색
+        # (선두 문자 집합으로 C 레벨에서 후보 위치만 건너뛰며 찾음)
+        search = self._regex.search
+        m = search(text)
+        while m:
+            yield m
+            m = search(text, m.start() + 1)
+
+    def _keyword_priority(self, title):
+        best = len(self.rules)
+        if self._regex is None:
+            return best
+        lookup = self._best
+        for m in self._matches(title):
+            p = lookup[m.group()]
+            if p < best:
+                best = p
+                if best == 0:
+                    break
+        return best
+
+    def _apply_extras(self, title, best):
+        for idx, pattern, suffixes in self._extras:
+            if idx >= best:
+                break
+            if (pattern and pattern.search(title)) or (suffixes and title.endswith(suffixes)):
+                return idx
+        return best
+
+    def _result(self, best):
+        return self.categories[best] if best < len(self.rules) else self.default
+
+    def classify(self, title, raw_category=None):
+        if raw_category and raw_category in self.raw_categories:
+            return self.raw_categories[raw_category]
+        best = self._keyword_priority(title)
+        return self._result(self._apply_extras(title, best))
+
+    def classify_many(self, titles, raw_categories=None):
+        """
+        제목 리스트를 한 번에 분류합니다. (전체 테이블 재분류용)
+        중복 제목은 한 번만 계산하고, 나머지 제목들은 구분자로 이어붙여
+        정규식 스캔 한 번으로 처리합니다.
+        """
+        results = [None] * len(titles)
+        todo = {}
+        for i, title in enumerate(titles):
+            raw = raw_categories[i] if raw_categories is not None else None
+            if raw and raw in self.raw_categories:
+                results[i] = self.raw_categories[raw]
+            else:
+                todo.setdefault(title, []).append(i)
+        if not todo:
+            return results
+
+        unique = list(todo)
+        best = [len(self.rules)] * len(unique)
+        if self._regex is not None:
+            starts = []
+            pos = 0
+            for t in unique:
+                starts.append(pos)
+                pos += len(t) + 1
+            lookup = self._best
+            for m in self._matches(_SEP.join(unique)):
+                j = bisect_right(starts, m.start()) - 1
+                p = lookup[m.group()]
+                if p < best[j]:
+                    best[j] = p
+
+        for j, title in enumerate(unique):
+            category = self._result(self._apply_extras(title, best[j]))
+            for i in todo[title]:
+                results[i] = category
+        return results
+
+
+CU_CLASSIFIER = CategoryClassifier(CU_RULES, CU_RAW_CATEGORIES)
+SEVEN_CLASSIFIER = CategoryClassifier(SEVEN_RULES, SEVEN_RAW_CATEGORIES)
@@ -1,116 +1,117 @@
 import os
-import time
+import sqlite3
+import argparse
+import asyncio
 import re
 import json
-import requests
-from bs4 import BeautifulSoup
-from supabase import create_client
+import sys
 import urllib3
 
+from crawler.checkpoint import open_checkpoint
+from crawler.classifier import CU_CLASSIFIER
+from crawler.fetcher import CrawlCancelled, FetchEngine, create_session
+from crawler.history import default_history
+from crawler.http_cache import default_cache, fetch_parsed
+from crawler.incremental import CRAWL_MODE, CRAWL_MODES, QuietPages, SweepSchedule
+from crawler.metrics import METRICS, METRICS_PATH
+from crawler.orchestrator import BrandTask, run_brands
+from crawler.pipeline import ProductPipeline
+from crawler.product import BRAND_CU, BRAND_GS25, Product, stable_id
+from crawler.archive import default_archive, response_saver
+from crawler.seven_crawler import SEVEN_HEADERS, crawl_seven
+from crawler.snapshot import SNAPSHOT_COLUMNS, SNAPSHOT_PATH, ExistingSnapshot, fetch_rows, set_stamp_writes
+from crawler.storage import LOCAL_DB, open_client
+from crawler.sweep import deactivate_missing
+from crawler.writer import BulkWriter
+
+try:
+    from crawler import lxml_parser
+except ImportError:  # lxml 미설치 시 BeautifulSoup 경로만 사용
+    lxml_parser = None
+
 # SSL 경고 무시
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # ==========================================
 # ⚙️ 환경 변수 설정
 # ==========================================
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
+# 저장소: SUPABASE_URL / SUPABASE_SERVICE_KEY 또는 로컬 SQLite(CRAWLER_DB, crawler/storage.py)
+
+# HTML 파서: lxml(기본, 고속) / bs4(기존 BeautifulSoup 경로)
+HTML_BACKEND = os.environ.get("CRAWLER_HTML_BACKEND", "lxml")
 
 # ==========================================
 # 🧠 통합 카테고리 분류기 (최신 확정판)
 # ==========================================
 def get_standard_category(title, raw_category=None):
-    # [1] CU 원본 카테고리 절대 적용
-    if raw_category:
-        if raw_category == "간편식사": return "간편식사"
-        if raw_category == "과자류": return "과자류"
-        if raw_category == "아이스크림": return "아이스크림"
-        if raw_category == "음료": return "음료"
-        if raw_category == "생활용품": return "생활용품"
-        if raw_category == "식품": return "식품"
-        if raw_category == "즉석조리": return None
-
-    # [2] 키워드 분류
-    # 1. 생활용품
-    if any(k in title for k in ['치약', '칫솔', '가글', '가그린', '페리오', '메디안', '2080', '리치', '덴탈', '마우스', '쉐이빙', '면도기', '물티슈', '티슈', '마스크', '생리대', '중형', '대형', '소형', '오버나이트', '입는오버', '패드', '라이너', '탐폰', '팬티', '라엘', '쏘피', '화이트', '좋은느낌', '시크릿데이', '애니데이', '디어스킨', '순수한면', '샴푸', '린스', '트리트먼트', '헤어', '세럼', '비누', '엘라스틴', '케라시스', '오가니스트', '온더바디', '바디워시', '로션', '핸드크림', '수딩젤', '클렌징', '워터마이드', '에센셜', '존슨즈', '아비노', '니베아', '메디힐', '립케어', '오일', '세제', '락스', '슈가버블', '무균무때', '퐁퐁', '피지', '건전지', '스타킹', '밴드', '일회용', '제거', '클린핏', '우산', '양말', '바디']):
-        return "생활용품"
-
-    # 2. 간편식사
-    if any(k in title for k in ['도시락', '김밥', '주먹밥', '샌드위치', '햄버거', '버거', '샐러드', '죽', '컵반', '비빔밥']):
-        return "간편식사"
-
-    # 3. 식품
-    is_food_bar = re.search(r'바\s*\d+g', title)
-    if is_food_bar or any(k in title for k in ['라면', '면', '우동', '국밥', '탕', '찌개', '국', '햇반', '핫바', '소시지', '후랑크', '만두', '닭가슴살', '치킨', '육개장', '베이컨', '스테이크', '육포', '어묵', '크랩', '튀김', '브리또', '파스타', '직화', '꼬치', '떡볶이', '3XL', '킬바사', '오징어', '밥바']):
-        return "식품"
-
-    # 4. 과자류
-    if any(k in title for k in ['스낵', '젤리', '사탕', '껌', '초코', '쿠키', '칩', '빵', '케익', '약과', '양갱', '프레첼', '팝콘', '아몬드', '맛밤', '말차빵', '허쉬', '그릭요거트', '오팜', '푸딩', '디저트', '킷캣', '도넛', '크런키', '자유시간']):
-        return "과자류"
-
-    # 5. 아이스크림
-    if any(k in title for k in ['하겐', '소르베', '라라스윗', '나뚜루', '벤앤', '아이스', '콘', '파인트', '설레임', '폴라포', '스크류', '돼지바', '빙수', '샤베트', '찰옥수수', '미니컵', '비비빅', '메로나', '누가바', '쌍쌍바', '바밤바', '옥동자', '와일드바디', '붕어싸만코', '더위사냥', '빵빠레', '구슬', '탱크보이', '빠삐코', '요맘때', '쿠앤크', '수박바', '죠스바', '제로윗', '로우윗', '서주', '동그린', '삼우', '파르페', '쿨리쉬']):
-        return "아이스크림"
-
-    # 6. 음료
-    if any(k in title for k in ['우유', '커피', '라떼', '아메리카노', '콜라', '사이다', '에이드', '주스', '보리차', '옥수수수염차', '비타', '박카스', '쌍화', '두유', '요구르트', '요거트', '물', '워터', '프로틴', '콤부차', '드링크', '이온', '티', 'TEA', '바리스타', '콘트라', '카페', '마이노멀', '서울FB', '맥주', '하이볼']):
-        return "음료"
-
-    return "기타"
+    # CU 원본 카테고리 우선 → 키워드 우선순위 순으로 한 번에 분류 (crawler/classifier.py)
+    return CU_CLASSIFIER.classify(title, raw_category)
 
 # ==========================================
 # 🛠️ 기존 데이터 로드 유틸리티
 # ==========================================
-def fetch_existing_data_map(supabase):
+def fetch_existing_data_map(supabase, snapshot_path=SNAPSHOT_PATH):
     """
     Supabase에서 현재 저장된 모든 상품의 (brand_id, external_id)를 키로 하고
     {'title': ..., 'category': ...}를 값으로 하는 딕셔너리를 반환합니다.
+    로컬 스냅샷(crawler/snapshot.py)을 유지하면서 updated_at 워터마크 이후
+    변경된 행만 가져오고, 일정 기간마다 전체를 다시 불러옵니다.
+    updated_at 컬럼이 확인되면 이번 실행의 쓰기에도 updated_at을 넣습니다. (없는 테이블은 매번 전체 로드, 안 넣음)
     """
     print("📡 기존 데이터 백업 로드 중...")
-    existing_map = {}
     try:
-        # 데이터가 많을 경우 페이지네이션이 필요할 수 있으나, 편의점 상품 수(수천 건) 정도면 한 번에 가져오거나 루프로 처리가능
-        # 여기서는 안전하게 1000건씩 끊어서 가져오는 방식 예시
-        start = 0
-        batch_size = 1000
-        while True:
-            response = supabase.table("new_products")\
-                .select("brand_id, external_id, title, category")\
-                .range(start, start + batch_size - 1)\
-                .execute()
-            
-            rows = response.data
-            if not rows:
-                break
-            
-            for row in rows:
-                key = (row['brand_id'], row['external_id'])
-                existing_map[key] = {
-                    'title': row['title'],
-                    'category': row['category']
-                }
-            
-            start += batch_size
-            time.sleep(0.1)
-            
-        print(f"✅ 기존 데이터 {len(existing_map)}건 로드 완료 (수동 수정본 보존용)")
-        return existing_map
+        snapshot = ExistingSnapshot(snapshot_path)
+    except sqlite3.Error as e:
+        print(f"⚠️ 로컬 스냅샷을 열 수 없어 메모리에서 전체 로드: {e}")
+        snapshot = ExistingSnapshot(":memory:")
+
+    full = snapshot.needs_full_refresh
+    if full:
+        snapshot.reset()
+    fetched = 0
+    try:
+        for rows in fetch_rows(supabase, since=None if full else snapshot.watermark):
+            snapshot.apply(rows)
+            fetched += len(rows)
+        if full:
+            snapshot.mark_full_refresh()
+        set_stamp_writes(True)
     except Exception as e:
-        print(f"⚠️ 기존 데이터 로드 실패 (덮어쓰기 위험 있음): {e}")
-        return {}
+        if full and fetched == 0:
+            # updated_at 컬럼이 없는 테이블: 예전처럼 매번 전체 로드 (워터마크 없음), 쓰기에도 넣지 않음
+            print(f"⚠️ updated_at 기준 조회 실패, 전체 로드로 전환: {e}")
+            set_stamp_writes(False)
+            try:
+                for rows in fetch_rows(supabase, columns=SNAPSHOT_COLUMNS[:-1]):
+                    snapshot.apply(rows)
+                    fetched += len(rows)
+            except Exception as e:
+                print(f"⚠️ 기존 데이터 로드 실패 (덮어쓰기 위험 있음): {e}")
+        else:
+            print(f"⚠️ 기존 데이터 로드 실패 (로컬 스냅샷 기준으로 진행): {e}")
+            set_stamp_writes(snapshot.watermark is not None)   # 워터마크가 있으면 컬럼도 있음
+
+    existing_map = snapshot.load_map()
+    snapshot.close()
+    mode = "전체" if full else "증분"
+    print(f"✅ 기존 데이터 {len(existing_map)}건 로드 완료 ({mode} 조회 {fetched}건, 수동 수정본 보존용)")
+    return existing_map
 
 # ==========================================
 # 🏪 1. CU 크롤링 (NEW 이미지 감지 복구 / 증분만 수행)
 # ==========================================
+CU_VIEW_CALL_RE = re.compile(r"view\(")
+CU_VIEW_RE = re.compile(r"view\s*\(\s*['\"]?(\d+)['\"]?\s*\)")
+
 def parse_cu_product(item, raw_cat_name):
     try:
         name_tag = item.find("div", class_="name")
-        if not name_tag: return None
+        if not name_tag: return METRICS.drop("cu", "no_title")
         title = name_tag.get_text(strip=True)
 
         # 제외 로직
-        if raw_cat_name == "즉석조리": return None
-        if "GET" in title and ("아메리카노" in title or "라떼" in title or "커피" in title): return None
+        if raw_cat_name == "즉석조리": return METRICS.drop("cu", "excluded_category")
+        if "GET" in title and ("아메리카노" in title or "라떼" in title or "커피" in title): return METRICS.drop("cu", "excluded_coffee")
 
         price_tag = item.find("div", class_="price")
         price = 0
@@ -153,42 +154,52 @@ def parse_cu_product(item, raw_cat_name):
                 if clean: promo = clean
 
         # 덤증정 제외
-        if "덤" in promo or "증정" in promo: return None
+        if "덤" in promo or "증정" in promo: return METRICS.drop("cu", "excluded_gift")
 
         # ID 추출
         gdIdx = None
-        onclick = item.find("div", onclick=re.compile(r"view\("))
+        onclick = item.find("div", onclick=CU_VIEW_CALL_RE)
         if onclick:
-            m = re.search(r"view\s*\(\s*['\"]?(\d+)['\"]?\s*\)", onclick.get('onclick'))
+            m = CU_VIEW_RE.search(onclick.get('onclick'))
             if m: gdIdx = int(m.group(1))
 
         if not gdIdx:
             photo_div = item.find("div", class_="photo")
             if photo_div and photo_div.find("a"):
                 onclick = photo_div.find("a").get("onclick") or ""
-                m = re.search(r"view\s*\(\s*['\"]?(\d+)['\"]?\s*\)", onclick)
+                m = CU_VIEW_RE.search(onclick)
                 if m: gdIdx = int(m.group(1))
 
-        if not gdIdx: return None
-
-        std_category = get_standard_category(title, raw_cat_name)
-
-        return {
-            "title": title,
-            "price": price,
-            "image_url": img_src,
-            "category": std_category,
-            "original_category": raw_cat_name,
-            "promotion_type": promo,
-            "brand_id": 1,
-            "source_url": f"https://cu.bgfretail.com/product/view.do?category=product&gdIdx={gdIdx}",
-            "is_active": True,
-            "external_id": gdIdx,
-            "is_new": is_new
-        }
-    except: return None
-
-def crawl_cu(supabase, existing_map):
+        if not gdIdx: return METRICS.drop("cu", "no_id")
+
+        std_category = METRICS.timed("cu", "classify", get_standard_category, title, raw_cat_name)
+
+        return Product(BRAND_CU, gdIdx, title, price, img_src, std_category, raw_cat_name, promo, is_new)
+    except: return METRICS.drop("cu", "error")
+
+def parse_cu_page(html, raw_cat_name, backend=None):
+    """
+    productAjax.do 응답 한 페이지를 Product 리스트로 변환합니다.
+    li.prod_list가 하나도 없으면 None (카테고리 마지막 페이지).
+    """
+    if (backend or HTML_BACKEND) == "lxml" and lxml_parser:
+        return lxml_parser.parse_cu_page(html, raw_cat_name)
+    from bs4 import BeautifulSoup   # bs4 경로에서만 로드 (시작 시간)
+    soup = BeautifulSoup(html, "html.parser")
+    items = soup.select("li.prod_list")
+    if not items: return None
+    return [p for p in (parse_cu_product(item, raw_cat_name) for item in items) if p]
+
+CU_BASE_URL = "https://cu.bgfretail.com"
+CU_AJAX_PATH = "/product/productAjax.do"
+CU_AJAX_URL = CU_BASE_URL + CU_AJAX_PATH
+CU_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    "Referer": "https://cu.bgfretail.com"
+}
+
+def crawl_cu(supabase, existing_map, engine=None, cache=None, base_url=CU_BASE_URL, checkpoint=None, schedule=None,
+             archive=None):
     print("\n🚀 CU 크롤링 시작 (수동 수정본 보존 모드)...")
 
     cu_categories = [
@@ -200,152 +211,289 @@ def crawl_cu(supabase, existing_map):
         {"id": "70", "name": "생활용품"}
     ]
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-        "Referer": "https://cu.bgfretail.com"
-    }
-
-    for cat in cu_categories:
-        print(f"🔎 CU 조회: {cat['name']}")
-
-        all_cu_items = []
-        for page in range(1, 21):
-            try:
-                r = requests.post("https://cu.bgfretail.com/product/productAjax.do",
-                                  data={"pageIndex": page, "searchMainCategory": cat['id'], "listType": 0},
-                                  headers=headers, timeout=10)
-                r.encoding = 'utf-8'
-                soup = BeautifulSoup(r.text, "html.parser")
-                items = soup.select("li.prod_list")
-                if not items: break
-
-                for item in items:
-                    p = parse_cu_product(item, cat['name'])
-                    if p:
-                        # ⭐️ 핵심: 이미 DB에 있는 상품이면 제목과 카테고리는 DB값 유지
-                        key = (p['brand_id'], p['external_id'])
-                        if key in existing_map:
-                            p['title'] = existing_map[key]['title']       # 사용자가 수정한 제목 유지
-                            p['category'] = existing_map[key]['category'] # 사용자가 수정한 카테고리 유지
-                        
-                        all_cu_items.append(p)
-                time.sleep(0.1)
-            except: break
-
-        # Upsert
-        if len(all_cu_items) > 0:
-            print(f" 💾 {len(all_cu_items)}개 Upsert 중...")
-            try:
-                unique_items = {p['external_id']: p for p in all_cu_items}.values()
-                items_list = list(unique_items)
-
-                for i in range(0, len(items_list), 100):
-                    supabase.table("new_products").upsert(
-                        items_list[i:i+100],
-                        on_conflict="brand_id,external_id"
-                    ).execute()
-            except Exception as e: print(f"❌ CU 저장 실패: {e}")
+    # 카테고리 x 페이지를 하나의 keep-alive 세션으로 병렬 요청
+    engine = engine or FetchEngine(create_session(CU_HEADERS), max_workers=8, per_host=4, name="cu")
+    if cache is None: cache = default_cache()
+    if archive is None: archive = default_archive()
+
+    def fetch_page(cat, page):
+        def parse(r):
+            r.raise_for_status()  # 에러 페이지를 빈 페이지(목록 끝)로 오인하지 않도록
+            r.encoding = 'utf-8'
+            with METRICS.timer("cu", "parse"):
+                products = parse_cu_page(r.text, cat['name'])
+            METRICS.incr("cu", "parse.items", len(products or []))
+            return products
+
+        # 지난 실행과 같은 응답이면 파싱 없이 캐시된 결과 사용
+        # 원본 보관은 캐시 적중과 상관없이 → 파서/분류기가 바뀌면 crawler/reprocess.py로 재처리
+        return fetch_parsed(engine, cache, "POST", base_url + CU_AJAX_PATH, parse,
+                            data={"pageIndex": page, "searchMainCategory": cat['id'], "listType": 0},
+                            on_response=response_saver(archive, "cu", {"raw_cat": cat['name'], "category": cat['id'],
+                                                                       "page": page}, encoding='utf-8'),
+                            timeout=10)
+
+    # 📍 체크포인트: 끝난 카테고리는 건너뛰고, 나머지는 저장까지 끝난 다음 페이지부터
+    jobs, start_pages = cu_categories, None
+    if checkpoint:
+        jobs = [c for c in cu_categories if not checkpoint.job_done("cu", c['id'])]
+        start_pages = [checkpoint.start_page("cu", c['id']) for c in jobs]
+
+    print(f"🔎 CU 조회: {', '.join(c['name'] for c in jobs)}")
+    # ⏩ 증분 모드: 신규/변경 상품 없는 페이지가 이어지면 그 카테고리는 중단
+    quiet = schedule.quiet_pages("cu") if schedule else QuietPages()
+    if schedule: print(f"⏩ CU {schedule.describe('cu')}")
+    counts = {cat['id']: 0 for cat in jobs}
+    outcome = []
+    # ⭐️ 핵심: 이미 DB에 있는 상품이면 제목과 카테고리는 DB값 유지 (ProductPipeline)
+    # 페이지가 도착하는 대로 걸러서 바로 Upsert → 카테고리 전체를 메모리에 모으지 않음
+    with ProductPipeline(BulkWriter(supabase, label="CU", brand="cu"), existing_map,
+                         history=default_history(supabase, "CU", "cu")) as pipeline:
+        for cat, page, products in engine.crawl_pages(jobs, fetch_page, max_pages=20, outcome=outcome,
+                                                      start_pages=start_pages,
+                                                      stop=lambda cat: quiet.stopped(cat['id'])):
+            counts[cat['id']] += len(products)
+            quiet.page(cat['id'], pipeline.feed(products))
+            if checkpoint: pipeline.mark(checkpoint.page_marker("cu", cat['id'], page))
+        if checkpoint:
+            for cat, o in zip(jobs, outcome):
+                if o in ("end", "stopped"): pipeline.mark(checkpoint.job_marker("cu", cat['id'], o))
+        print(" 📦 CU " + ", ".join(f"{c['name']} {counts[c['id']]}개" for c in jobs))
+        stopped = [c['name'] for c, o in zip(jobs, outcome) if o == "stopped"]
+        if stopped: print(f" ⏩ CU 변경 없는 페이지가 이어져 조기 종료: {', '.join(stopped)}")
+        print(f" 💾 CU {pipeline.summary()} → {pipeline.queued}개 Upsert")
+
+    if cache: print(f" 🗃️ CU {cache.summary()}")
+
+    # 🧹 모든 카테고리를 끝(빈 페이지)까지 본 경우에만 사라진 상품 비활성화
+    complete = all(o == "end" for o in outcome)
+    if checkpoint and checkpoint.resumed("cu"):
+        print(" ⏭️ CU 체크포인트에서 이어받은 실행 → 비활성화 생략")
+    elif complete:
+        deactivate_missing(supabase, 1, pipeline.seen_ids(1), existing_map, label="CU")
+        if schedule and not pipeline.write_stats["failed"]: schedule.record("cu")
+    elif stopped and all(o in ("end", "stopped") for o in outcome):
+        print(" ⏭️ CU 증분 실행 → 비활성화는 전체 순회에서만")
+    else:
+        print(f" ⏭️ CU 일부 카테고리 미완료 {outcome} → 비활성화 생략")
+    if checkpoint and all(o in ("end", "stopped") for o in outcome) and not pipeline.write_stats["failed"]:
+        checkpoint.finish("cu")
 
 # ==========================================
 # 🏪 2. GS25 크롤링 (증분 백업)
 # ==========================================
-def get_gs25_token():
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Referer": "https://gs25.gsretail.com/gscvs/ko/products/event-goods",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
-    })
-    for i in range(3):
+GS25_BASE_URL = "https://gs25.gsretail.com"
+GS25_EVENT_PATH = "/gscvs/ko/products/event-goods"
+GS25_SEARCH_PATH = "/gscvs/ko/products/event-goods-search"
+GS25_EVENT_URL = GS25_BASE_URL + GS25_EVENT_PATH
+GS25_SEARCH_URL = GS25_BASE_URL + GS25_SEARCH_PATH
+GS25_HEADERS = {
+    "Referer": GS25_EVENT_URL,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+}
+
+def extract_gs25_token(html):
+    from bs4 import BeautifulSoup   # 토큰 페이지는 실행당 한 번이라 GS25 경로에서만 로드
+    soup = BeautifulSoup(html, "html.parser")
+    token_input = soup.find("input", {"name": "CSRFToken"})
+    if token_input and token_input.get('value'): return token_input['value']
+    m = re.search(r"CSRFToken\s*[:=]\s*['\"]([^'\"]+)['\"]", html)
+    if m: return m.group(1)
+    return None
+
+def get_gs25_token(engine, base_url=GS25_BASE_URL, attempts=3):
+    # 연결 실패/5xx는 엔진이 재시도, 여기서는 토큰이 없는 응답만 백오프 후 다시 요청
+    for attempt in range(attempts):
         try:
-            r = session.get("https://gs25.gsretail.com/gscvs/ko/products/event-goods", timeout=15)
-            soup = BeautifulSoup(r.text, "html.parser")
-            token_input = soup.find("input", {"name": "CSRFToken"})
-            if token_input and token_input.get('value'): return session, token_input['value']
-            m = re.search(r"CSRFToken\s*[:=]\s*['\"]([^'\"]+)['\"]", r.text)
-            if m: return session, m.group(1)
-            time.sleep(1)
-        except: time.sleep(1)
-    return session, None
-
-def crawl_gs25(supabase, existing_map):
+            if attempt: engine.sleep(engine.retry.delay(attempt - 1))
+            r = engine.get(base_url + GS25_EVENT_PATH, timeout=15)
+            token = extract_gs25_token(r.text)
+            if token: return token
+        except CrawlCancelled: return None
+        except Exception as e: print(f"⚠️ GS25 토큰 요청 실패: {e}")
+    return None
+
+GS25_PROMO_MAP = {"ONE_TO_ONE": "1+1", "TWO_TO_ONE": "2+1"}
+
+# 연속으로 이만큼 페이지가 실패하면 해당 행사 목록은 중단
+GS25_MAX_PAGE_FAILURES = 3
+
+def gs25_id(title, image_url):
+    """attFileId가 없는 GS25 상품의 결정적 external_id (crawler/dedup.py의 병합 기준과 같음)"""
+    return stable_id(title, image_url)
+
+def parse_gs25_results(text, p_type):
+    """event-goods-search 응답 본문 → Product 리스트 (results가 비어 있으면 빈 리스트)"""
+    data = json.loads(text)
+    if isinstance(data, str): data = json.loads(data)
+
+    promo = GS25_PROMO_MAP.get(p_type, "행사")
+    products = []
+    for item in data.get("results", []):
+        title = item.get("goodsNm", "").strip()
+        image = item.get("attFileNm", "")
+        id_match = re.search(r'(\d+)', item.get("attFileId", ""))
+        if not id_match: METRICS.incr("gs25", "parse.fallback_id")
+        # attFileId에 숫자가 없으면 제목+이미지 해시 (실행마다 같은 값이라 중복 행이 생기지 않음)
+        ext_id = int(id_match.group(1)[-18:]) if id_match else gs25_id(title, image)
+
+        products.append(Product(BRAND_GS25, ext_id, title, int(item.get("price", 0)), image,
+                                METRICS.timed("gs25", "classify", get_standard_category, title, None),
+                                None, promo))
+    return products
+
+def crawl_gs25(supabase, existing_map, engine=None, cache=None, base_url=GS25_BASE_URL, checkpoint=None,
+               schedule=None, archive=None):
     print("\n🚀 GS25 크롤링 시작 (수동 수정본 보존 모드)...")
-    session, token = get_gs25_token()
+    engine = engine or FetchEngine(create_session(GS25_HEADERS), max_workers=2, per_host=2, name="gs25")
+    if cache is None: cache = default_cache()
+    if archive is None: archive = default_archive()
+    token = get_gs25_token(engine, base_url)
     if not token:
         print("❌ GS25 토큰 실패")
         return
 
-    session.headers.update({"Accept": "application/json", "X-Requested-With": "XMLHttpRequest"})
-
-    for p_type in ["ONE_TO_ONE", "TWO_TO_ONE"]:
-        print(f"🔎 GS25 조회: {p_type}")
-        all_gs_items = []
-        for page in range(1, 20):
-            try:
-                url = "https://gs25.gsretail.com/gscvs/ko/products/event-goods-search"
+    engine.session.headers.update({"Accept": "application/json", "X-Requested-With": "XMLHttpRequest"})
+
+    def parse(r, p_type, page):
+        r.raise_for_status()
+        with METRICS.timer("gs25", "parse"):
+            products = parse_gs25_results(r.text, p_type)
+        METRICS.incr("gs25", "parse.items", len(products))
+        return products
+
+    complete = True   # 모든 행사 목록을 끝까지 봄 (비활성화 가능)
+    done = True       # 모든 행사 목록을 끝까지 봤거나 증분 모드로 멈춤 (체크포인트 완료)
+    quiet = schedule.quiet_pages("gs25") if schedule else QuietPages()
+    if schedule: print(f"⏩ GS25 {schedule.describe('gs25')}")
+    # ⭐️ 핵심: 이미 DB에 있는 상품이면 제목과 카테고리는 DB값 유지 (ProductPipeline)
+    with ProductPipeline(BulkWriter(supabase, label="GS25", brand="gs25"), existing_map,
+                         history=default_history(supabase, "GS25", "gs25")) as pipeline:
+        for p_type in ["ONE_TO_ONE", "TWO_TO_ONE"]:
+            if checkpoint and checkpoint.job_done("gs25", p_type):
+                print(f"📍 GS25 {p_type} 이전 실행에서 완료 → 건너뜀")
+                continue
+            start = checkpoint.start_page("gs25", p_type) if checkpoint else 1
+            print(f"🔎 GS25 조회: {p_type}" + (f" ({start}페이지부터)" if start > 1 else ""))
+            reached_end = False
+            stopped = False
+            failures = 0
+            skipped = False
+            for page in range(start, 20):
                 payload = {
                     "CSRFToken": token, "pageNum": str(page), "pageSize": "50",
                     "parameterList": p_type
                 }
-                r = session.post(url, data=payload, timeout=10)
-                try: data = r.json()
-                except: data = json.loads(r.text)
-                if isinstance(data, str): data = json.loads(data)
-
-                results = data.get("results", [])
-                if not results: break
-
-                for item in results:
-                    title = item.get("goodsNm", "").strip()
-                    price = int(item.get("price", 0))
-                    att_id = item.get("attFileId", "")
-                    id_match = re.search(r'(\d+)', att_id)
-                    ext_id = int(id_match.group(1)[-18:]) if id_match else int(time.time()*1000)
-                    promo_map = {"ONE_TO_ONE": "1+1", "TWO_TO_ONE": "2+1"}
-
-                    p = {
-                        "title": title,
-                        "price": int(item.get("price", 0)),
-                        "image_url": item.get("attFileNm", ""),
-                        "category": get_standard_category(title, None),
-                        "original_category": None,
-                        "promotion_type": promo_map.get(p_type, "행사"),
-                        "brand_id": 2,
-                        "source_url": "http://gs25.gsretail.com/gscvs/ko/products/event-goods",
-                        "is_active": True,
-                        "external_id": ext_id,
-                        "is_new": False
-                    }
-
-                    # ⭐️ 핵심: 이미 DB에 있는 상품이면 제목과 카테고리는 DB값 유지
-                    key = (p['brand_id'], p['external_id'])
-                    if key in existing_map:
-                        p['title'] = existing_map[key]['title']
-                        p['category'] = existing_map[key]['category']
-
-                    all_gs_items.append(p)
-                time.sleep(0.1)
-            except: break
-
-        if len(all_gs_items) > 0:
-            print(f" 💾 GS25 {len(all_gs_items)}개 Upsert 중...")
-            try:
-                unique_gs = {p['external_id']: p for p in all_gs_items}.values()
-                items_list = list(unique_gs)
-                for i in range(0, len(items_list), 100):
-                    supabase.table("new_products").upsert(items_list[i:i+100], on_conflict="brand_id,external_id").execute()
-            except Exception as e: print(f"❌ GS25 저장 실패: {e}")
+                try:
+                    # 요청 간격/재시도는 엔진이 담당 (호스트별 적응형 속도 제한)
+                    results = fetch_parsed(engine, cache, "POST", base_url + GS25_SEARCH_PATH,
+                                           lambda r: parse(r, p_type, page),
+                                           data=payload, ignore=("CSRFToken",), timeout=10,
+                                           on_response=response_saver(archive, "gs25", {"p_type": p_type, "page": page}))
+                except CrawlCancelled: break
+                except Exception as e:
+                    # 재시도까지 실패한 페이지만 건너뛰고 다음 페이지 계속 (이번 실행은 비활성화 생략)
+                    print(f" ⚠️ GS25 {p_type} {page}페이지 실패: {e}")
+                    complete = False
+                    skipped = True
+                    failures += 1
+                    if failures >= GS25_MAX_PAGE_FAILURES: break
+                    continue
+                failures = 0
+                if not results:
+                    reached_end = True
+                    break
+                changed = pipeline.feed(results)
+                # 건너뛴 페이지가 있으면 그 뒤로는 체크포인트를 진행하지 않음 (재개 시 다시 받도록)
+                if checkpoint and not skipped: pipeline.mark(checkpoint.page_marker("gs25", p_type, page))
+                if quiet.page(p_type, changed):
+                    print(f" ⏩ GS25 {p_type} {page}페이지까지 변경 없는 페이지가 이어져 조기 종료")
+                    stopped = True
+                    break
+            if checkpoint and (reached_end or stopped) and not skipped:
+                pipeline.mark(checkpoint.job_marker("gs25", p_type, "end" if reached_end else "stopped"))
+            complete = complete and reached_end
+            done = done and (reached_end or stopped) and not skipped
+        print(f" 💾 GS25 {pipeline.summary()} → {pipeline.queued}개 Upsert")
+
+    if cache: print(f" 🗃️ GS25 {cache.summary()}")
+
+    if checkpoint and checkpoint.resumed("gs25"):
+        print(" ⏭️ GS25 체크포인트에서 이어받은 실행 → 비활성화 생략")
+    elif complete:
+        deactivate_missing(supabase, 2, pipeline.seen_ids(2), existing_map, label="GS25")
+        if schedule and not pipeline.write_stats["failed"]: schedule.record("gs25")
+    elif done:
+        print(" ⏭️ GS25 증분 실행 → 비활성화는 전체 순회에서만")
+    else:
+        print(" ⏭️ GS25 일부 행사 목록 미완료 → 비활성화 생략")
+    if checkpoint and done and not pipeline.write_stats["failed"]:
+        checkpoint.finish("gs25")
 
 # ==========================================
 # 🚀 메인 실행
 # ==========================================
-def main():
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        print("❌ 설정 오류: 환경변수가 없습니다.")
-        return
-
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+BRAND_CRAWLERS = {
+    "cu": lambda supabase, existing_map, engine, checkpoint, schedule:
+        crawl_cu(supabase, existing_map, engine, checkpoint=checkpoint, schedule=schedule),
+    "gs25": lambda supabase, existing_map, engine, checkpoint, schedule:
+        crawl_gs25(supabase, existing_map, engine, checkpoint=checkpoint, schedule=schedule),
+    "seven": lambda supabase, existing_map, engine, checkpoint, schedule:
+        crawl_seven(supabase, existing_map, engine, checkpoint=checkpoint, schedule=schedule),
+}
+
+# 브랜드별 속도 제한(초당 요청 수: 시작값 rate → 응답이 좋으면 max_rate까지)과 제한시간
+BRAND_LIMITS = {
+    "cu": {"headers": CU_HEADERS, "max_workers": 8, "per_host": 4, "rate": 20, "max_rate": 40, "timeout": 600},
+    "gs25": {"headers": GS25_HEADERS, "max_workers": 2, "per_host": 2, "rate": 10, "max_rate": 20, "timeout": 300},
+    "seven": {"headers": SEVEN_HEADERS, "max_workers": 4, "per_host": 2, "rate": 10, "max_rate": 20, "timeout": 300},
+}
+
+def build_brand_tasks(supabase, existing_map, brands, checkpoint=None, schedule=None):
+    tasks = []
+    for brand in brands:
+        limits = BRAND_LIMITS[brand]
+        crawler = BRAND_CRAWLERS[brand]
+        tasks.append(BrandTask(
+            brand,
+            run=lambda engine, crawler=crawler: crawler(supabase, existing_map, engine, checkpoint, schedule),
+            make_engine=lambda limits=limits, brand=brand: FetchEngine(
+                create_session(limits["headers"]),
+                max_workers=limits["max_workers"],
+                per_host=limits["per_host"],
+                rate=limits["rate"],
+                max_rate=limits["max_rate"],
+                name=brand,
+            ),
+            timeout=limits["timeout"],
+        ))
+    return tasks
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="편의점 행사상품 크롤러")
+    parser.add_argument("--brands", default="cu,gs25,seven",
+                        help="실행할 브랜드 (쉼표 구분, 선택: cu,gs25,seven)")
+    parser.add_argument("--resume", action="store_true",
+                        help="중단된 이전 실행의 체크포인트에서 이어서 크롤링")
+    parser.add_argument("--mode", choices=CRAWL_MODES, default=CRAWL_MODE,
+                        help="full: 목록 끝까지 / incremental: 변경 없는 페이지가 이어지면 중단 / "
+                             "auto: 마지막 전체 순회가 오래됐을 때만 full (기본: CRAWLER_MODE 또는 auto)")
+    parser.add_argument("--db", default=LOCAL_DB,
+                        help="Supabase 대신 이 로컬 SQLite 파일에 저장 (기본: CRAWLER_DB)")
+    parser.add_argument("--metrics", default=METRICS_PATH,
+                        help="단계별 실행 지표 JSON 저장 경로 ('-'는 표준출력, 기본: CRAWLER_METRICS)")
+    args = parser.parse_args(argv)
+    if args.metrics: METRICS.enable()
+    brands = [b.strip() for b in args.brands.split(",") if b.strip()]
+    unknown = [b for b in brands if b not in BRAND_CRAWLERS]
+    if unknown:
+        parser.error(f"알 수 없는 브랜드: {', '.join(unknown)}")
+
+    supabase = open_client(args.db)
+    if supabase is None:
+        print("❌ 설정 오류: 환경변수가 없습니다. (로컬 실행은 --db 경로)")
+        return 1
+    if args.db: print(f"🗄️ 로컬 DB에 저장: {args.db}")
 
     # 1. 🧹 [안전장치] 쓰레기 데이터 삭제
     try:
@@ -356,11 +504,28 @@ def main():
     # 이 맵을 각 크롤러에 전달하여 Upsert 전에 덮어쓰기 방지
     existing_data_map = fetch_existing_data_map(supabase)
 
-    # 3. 크롤링 실행 (세븐일레븐 제외됨)
-    crawl_cu(supabase, existing_data_map)
-    crawl_gs25(supabase, existing_data_map)
-
-    print("\n🎉 모든 크롤링 작업 완료!")
+    # 3. 크롤링 실행 (브랜드 병렬)
+    checkpoint = open_checkpoint(resume=args.resume, brands=brands)
+    if checkpoint:
+        done = [b for b in brands if checkpoint.brand_finished(b)]
+        if done: print(f"📍 이전 실행에서 완료된 브랜드 건너뜀: {', '.join(done)}")
+        brands = [b for b in brands if b not in done]
+    schedule = SweepSchedule(args.mode)
+    results = asyncio.run(run_brands(build_brand_tasks(supabase, existing_data_map, brands, checkpoint, schedule)))
+    if checkpoint: checkpoint.close()
+
+    ok = all(status == "ok" for status, _ in results.values())
+    if ok:
+        print("\n🎉 모든 크롤링 작업 완료!")
+    else:
+        print(f"\n⚠️ 일부 브랜드 미완료: {results}")
+
+    if METRICS.enabled:
+        METRICS.dump(args.metrics, extra={
+            "results": {name: {"status": status, "elapsed_s": round(elapsed, 3)}
+                        for name, (status, elapsed) in results.items()},
+        })
+    return 0 if ok else 1   # 시간 초과/실패한 브랜드가 있으면 CI에서 실패로 보이도록
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
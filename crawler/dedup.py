@@ -0,0 +1,116 @@
+import argparse
+import os
+import sys
+
+from crawler.product import BRAND_GS25, ROW_FIELDS, SOURCE_URLS, stable_id
+from crawler.snapshot import SNAPSHOT_PATH, ExistingSnapshot, stamp_fields
+from crawler.storage import open_client
+from crawler.sweep import DEACTIVATE_CHUNK
+
+# ==========================================
+# 🧬 GS25 중복 행 병합 (1회성: 시간 기반 임시 ID → 결정적 ID)
+# ==========================================
+# 예전 크롤러는 attFileId에 숫자가 없으면 int(time.time()*1000)을 external_id로 써서
+# 실행마다 같은 상품이 새 행으로 쌓였습니다. 그 값은 이 범위의 ms 타임스탬프입니다. (2017-07 ~ 2033-05)
+LEGACY_ID_RANGE = (1_500_000_000_000, 2_000_000_000_000)
+
+
+def is_legacy_id(external_id, id_range=LEGACY_ID_RANGE):
+    return external_id is not None and id_range[0] <= external_id < id_range[1]
+
+
+def fetch_brand_rows(supabase, brand_id=BRAND_GS25, batch_size=1000):
+    rows, start = [], 0
+    while True:
+        data = supabase.table("new_products").select(", ".join(ROW_FIELDS))\
+            .eq("brand_id", brand_id)\
+            .order("external_id")\
+            .range(start, start + batch_size - 1)\
+            .execute().data
+        rows.extend(data)
+        if len(data) < batch_size:
+            return rows
+        start += batch_size
+
+
+def plan_merge(rows, id_range=LEGACY_ID_RANGE):
+    """
+    임시 ID 행을 제목+이미지 기준 결정적 ID(crawl_gs25와 같은 stable_id)로 묶습니다.
+    반환: [(새 ID로 쓸 행 또는 None, 지울 임시 ID 리스트)]
+      - 묶음마다 활성 → 최근(임시 ID가 큰) 순으로 한 행만 남김
+      - 결정적 ID 행이 이미 있으면 (이전 병합/새 크롤러가 씀) 그 행을 두고 임시 행만 지움
+    제목을 수동으로 고친 행은 크롤러가 보는 원래 제목과 해시가 달라 병합되지 않을 수 있습니다.
+    """
+    existing = {r["external_id"] for r in rows}
+    groups = {}
+    for r in rows:
+        if is_legacy_id(r["external_id"], id_range):
+            groups.setdefault(stable_id(r.get("title"), r.get("image_url")), []).append(r)
+
+    plan = []
+    for new_id, group in groups.items():
+        group.sort(key=lambda r: (bool(r.get("is_active")), r["external_id"]), reverse=True)
+        keep = None
+        if new_id not in existing:
+            keep = {f: group[0].get(f) for f in ROW_FIELDS}
+            keep["external_id"] = new_id
+            keep["source_url"] = SOURCE_URLS[keep["brand_id"]].format(new_id)
+            keep.update(stamp_fields())
+        plan.append((keep, [r["external_id"] for r in group]))
+    return plan
+
+
+def apply_merge(supabase, plan, brand_id=BRAND_GS25, chunk=DEACTIVATE_CHUNK):
+    """
+    남길 행을 먼저 Upsert한 뒤 임시 ID 행을 지웁니다. (중간에 끊겨도 다시 실행하면 이어서 정리됨)
+    지운 (brand_id, external_id) 리스트를 반환합니다.
+    """
+    keeps = [keep for keep, _ in plan if keep]
+    for i in range(0, len(keeps), chunk):
+        supabase.table("new_products").upsert(keeps[i:i + chunk], on_conflict="brand_id,external_id").execute()
+    doomed = sorted(ext for _, old in plan for ext in old)
+    for i in range(0, len(doomed), chunk):
+        supabase.table("new_products").delete()\
+            .eq("brand_id", brand_id)\
+            .in_("external_id", doomed[i:i + chunk])\
+            .execute()
+    return [(brand_id, ext) for ext in doomed]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GS25 시간 기반 임시 ID 중복 행을 결정적 ID로 병합 (1회성)")
+    parser.add_argument("--apply", action="store_true", help="실제로 병합 (기본은 계획만 출력)")
+    parser.add_argument("--min-id", type=int, default=LEGACY_ID_RANGE[0], help="임시 ID 하한")
+    parser.add_argument("--max-id", type=int, default=LEGACY_ID_RANGE[1], help="임시 ID 상한 (미포함)")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH, help="함께 정리할 로컬 스냅샷 경로")
+    args = parser.parse_args(argv)
+
+    supabase = open_client()
+    if supabase is None:
+        print("❌ 설정 오류: 환경변수가 없습니다.")
+        return 1
+
+    rows = fetch_brand_rows(supabase)
+    plan = plan_merge(rows, (args.min_id, args.max_id))
+    legacy = sum(len(old) for _, old in plan)
+    print(f"🧬 GS25 {len(rows)}행 중 임시 ID {legacy}행 → 상품 {len(plan)}개로 병합 "
+          f"(새로 쓸 행 {sum(1 for keep, _ in plan if keep)}개)")
+    for keep, old in plan[:10]:
+        title = keep["title"] if keep else "(기존 결정적 ID 행 유지)"
+        print(f"   {title}: {len(old)}행 {old[:3]}{' ...' if len(old) > 3 else ''}")
+    if not args.apply:
+        print("ℹ️ 확인 후 --apply로 실행하세요.")
+        return 0
+
+    removed = apply_merge(supabase, plan)
+    if os.path.exists(args.snapshot):
+        snapshot = ExistingSnapshot(args.snapshot)
+        snapshot.discard(removed)
+        snapshot.apply([keep for keep, _ in plan if keep])   # updated_at을 못 찍는 테이블이어도 스냅샷에 바로 반영
+        snapshot.close()
+    print(f"✅ 임시 ID 행 {len(removed)}개 삭제")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import hashlib
+
+# ==========================================
+# 🔍 변경 감지 (바뀐 행만 Upsert)
+# ==========================================
+# 이 필드들이 같으면 다시 쓸 필요가 없는 행으로 봅니다.
+# (title/category는 기존 DB 값을 유지하므로 비교 대상이 아님)
+HASH_FIELDS = ("price", "promotion_type", "image_url", "is_new", "is_active", "original_category")
+
+
+def content_hash(row):
+    """HASH_FIELDS 값으로 만든 부호 있는 64비트 해시 (SQLite INTEGER에 그대로 저장 가능)"""
+    raw = repr(tuple(row.get(f) for f in HASH_FIELDS)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "big", signed=True)
+
+
+def change_kind(p, existing_map, digest=None):
+    """기존 데이터 대비 'inserted' / 'updated' / 'unchanged' (digest는 미리 계산한 content_hash)"""
+    known = (existing_map or {}).get((p['brand_id'], p['external_id']))
+    if known is None:
+        return "inserted"
+    if known.get('hash') != (content_hash(p) if digest is None else digest):
+        return "updated"
+    return "unchanged"
+
+
+def format_stats(stats):
+    return f"신규 {stats['inserted']} / 변경 {stats['updated']} / 동일 {stats['unchanged']} / 건너뜀 {stats['skipped']}"
@@ -0,0 +1,306 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from crawler.metrics import METRICS
+
+# ==========================================
+# 🌐 공용 페치 엔진 (커넥션 풀 + 호스트별 동시성 제한)
+# ==========================================
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+def create_session(headers=None, pool_size=16):
+    """
+    keep-alive 커넥션을 재사용하는 requests.Session을 만듭니다.
+    pool_size는 호스트당 유지할 커넥션 수입니다.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+_FAILED = object()
+_CANCELLED = object()
+
+# 잠시 뒤 다시 보내면 성공할 수 있는 응답 코드
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CrawlCancelled(Exception):
+    """오케스트레이터가 시간 초과 등으로 크롤링 중단을 요청했을 때 발생"""
+
+
+class FetchError(Exception):
+    """재시도를 다 써도 429/5xx가 계속될 때 발생 (마지막 응답은 .response)"""
+
+    def __init__(self, url, response):
+        super().__init__(f"HTTP {response.status_code}: {url}")
+        self.response = response
+
+
+class RetryPolicy:
+    """
+    실패한 요청 하나만 다시 보내는 규칙.
+    대기 시간은 backoff * 2^attempt 상한 안에서 무작위(full jitter)이고,
+    서버가 Retry-After를 주면 그 값을 따릅니다.
+    """
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30.0):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(self.max_backoff, retry_after)
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After") if response is not None else None
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None  # HTTP-date 형식은 무시하고 기본 백오프
+
+
+class HostLimiter:
+    """
+    호스트 하나의 토큰 버킷. 응답을 보고 속도를 조절합니다. (AIMD)
+    - 429/5xx/연결 실패: 속도를 절반으로
+    - 응답이 target_latency보다 느림: 속도를 20% 줄임
+    - 그 외 성공: step만큼 늘림 (max_rate까지)
+    """
+
+    def __init__(self, rate, max_rate=None, min_rate=0.5, burst=None, target_latency=2.0):
+        self.rate = float(rate)
+        self.max_rate = float(max_rate or rate)
+        self.min_rate = min(float(min_rate), self.rate)
+        self.burst = burst or max(1.0, self.rate / 4)
+        self.target_latency = target_latency
+        self.step = max(0.5, self.rate * 0.1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 예약하고, 보내기 전에 기다려야 할 시간(초)을 돌려줍니다."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def on_response(self, status, latency):
+        with self._lock:
+            if status in RETRY_STATUSES:
+                self.rate = max(self.min_rate, self.rate / 2)
+            elif latency > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * 0.8)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.step)
+
+    def on_failure(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def pause(self, seconds):
+        """Retry-After 동안 이 호스트로는 아무것도 보내지 않음"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class FetchEngine:
+    """
+    하나의 세션을 공유하면서 요청을 병렬로 보내는 엔진.
+    - max_workers: 전체 동시 작업 수
+    - per_host: 호스트 하나에 동시에 보낼 수 있는 최대 요청 수
+    - rate / max_rate: 호스트별 초당 요청 수 (시작값 / 상한, HostLimiter가 응답을 보고 조절)
+      rate가 None이면 속도 제한 없음
+    - retry: 연결 실패와 429/5xx 응답을 그 요청만 다시 보내는 RetryPolicy
+    - name: 계측(crawler/metrics.py)에 쓰는 브랜드 이름
+    """
+
+    def __init__(self, session=None, max_workers=8, per_host=4, rate=None, max_rate=None,
+                 retry=None, name=""):
+        self.session = session or create_session(pool_size=max(per_host, 4))
+        self.name = name
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.rate = rate
+        self.max_rate = max_rate
+        self.retry = retry or RetryPolicy()
+        self._host_slots = {}
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """진행 중인 요청은 끝까지 두고, 이후 요청은 모두 CrawlCancelled로 거절합니다."""
+        self._cancelled.set()
+
+    def _slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def limiter(self, url):
+        """호스트별 HostLimiter (속도 제한이 없으면 None)"""
+        if not self.rate:
+            return None
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = HostLimiter(self.rate, self.max_rate)
+            return self._limiters[host]
+
+    def sleep(self, seconds):
+        """취소되면 바로 깨어나 CrawlCancelled를 던지는 대기"""
+        if seconds > 0 and self._cancelled.wait(seconds):
+            raise CrawlCancelled()
+
+    def request(self, method, url, **kwargs):
+        """
+        요청 하나를 보내고 응답을 돌려줍니다. 연결 실패/타임아웃과 429/5xx는
+        RetryPolicy에 따라 이 요청만 다시 보내고, 끝내 실패하면 마지막 예외
+        (또는 FetchError)를 던집니다.
+        """
+        limiter = self.limiter(url)
+        for attempt in range(self.retry.retries + 1):
+            if self.cancelled:
+                raise CrawlCancelled(url)
+            r = error = None
+            with self._slot(url):
+                if limiter:
+                    self.sleep(limiter.acquire())
+                started = time.monotonic()
+                try:
+                    with METRICS.timer(self.name, "fetch"):
+                        r = self.session.request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+                    if limiter: limiter.on_failure()
+            if r is not None:
+                if limiter: limiter.on_response(r.status_code, time.monotonic() - started)
+                if METRICS.enabled:
+                    METRICS.incr(self.name, "fetch.bytes", len(r.content))
+                    METRICS.incr(self.name, f"fetch.status.{r.status_code}")
+                if r.status_code not in RETRY_STATUSES:
+                    return r
+                error = FetchError(url, r)
+
+            if attempt == self.retry.retries:
+                raise error
+            METRICS.incr(self.name, "fetch.retries")
+            retry_after = _retry_after(r)
+            if limiter and retry_after is not None:
+                limiter.pause(min(self.retry.max_backoff, retry_after))  # 같은 호스트의 다른 요청도 함께 대기
+            else:
+                self.sleep(self.retry.delay(attempt, retry_after))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def crawl_pages(self, jobs, fetch_page, max_pages, prefetch=3, outcome=None, start_pages=None, stop=None):
+        """
+        jobs(카테고리 등) x 페이지를 병렬로 가져오며 (job, page, items)를 yield 합니다.
+
+        fetch_page(job, page)는 아이템 리스트를 반환하고, 더 이상 데이터가 없으면
+        None을 반환합니다. (목록은 있으나 파싱된 상품이 없으면 빈 리스트)
+        각 job은 기존 순차 크롤링과 동일하게 '첫 빈 페이지 또는 첫 에러'에서 멈추며,
+        그 이후 페이지 결과는 버려집니다.
+        job마다 prefetch 개의 페이지를 앞서 요청해 둡니다.
+        start_pages(job별 시작 페이지 리스트)를 넘기면 그 페이지부터 요청합니다. (체크포인트 재개)
+        stop(job)을 넘기면 페이지를 하나 yield한 뒤마다 호출해 True면 그 job을 멈춥니다. (증분 모드)
+
+        outcome 리스트를 넘기면 job별 종료 사유가 같은 인덱스에 기록됩니다.
+          - "end": 빈 페이지까지 정상 도달 (전체 목록을 다 봄)
+          - "error": 요청/파싱 에러로 중단
+          - "max_pages": 페이지 상한에 걸려 중단 (뒤에 상품이 더 있을 수 있음)
+          - "stopped": stop(job)이 True를 반환해 중단 (증분 모드)
+          - "cancelled": 엔진 취소
+        """
+        starts = start_pages or [1] * len(jobs)
+        states = [{"next_submit": s, "next_yield": s, "done": False, "results": {}} for s in starts]
+        if outcome is not None:
+            outcome[:] = ["max_pages" if s > max_pages else "cancelled" for s in starts]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {}
+
+            def submit(idx):
+                st = states[idx]
+                if st["done"] or st["next_submit"] > max_pages or self.cancelled:
+                    return
+                page = st["next_submit"]
+                st["next_submit"] += 1
+                pending[pool.submit(fetch_page, jobs[idx], page)] = (idx, page)
+
+            def finish(idx, reason):
+                states[idx]["done"] = True
+                if outcome is not None:
+                    outcome[idx] = reason
+                for f, (j, _) in list(pending.items()):
+                    if j == idx and f.cancel():
+                        pending.pop(f)
+
+            for idx in range(len(jobs)):
+                for _ in range(prefetch):
+                    submit(idx)
+
+            while pending:
+                finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                touched = set()
+                for f in finished:
+                    idx, page = pending.pop(f)
+                    if f.cancelled():
+                        continue
+                    try:
+                        items = f.result()
+                    except CrawlCancelled:
+                        items = _CANCELLED
+                    except Exception:
+                        items = _FAILED
+                    states[idx]["results"][page] = items
+                    touched.add(idx)
+
+                for idx in touched:
+                    st = states[idx]
+                    while not st["done"] and st["next_yield"] in st["results"]:
+                        page = st["next_yield"]
+                        items = st["results"].pop(page)
+                        if items is None or items is _FAILED or items is _CANCELLED:
+                            # 첫 빈 페이지(또는 에러/취소)에서 해당 job 종료
+                            finish(idx, "end" if items is None else "error" if items is _FAILED else "cancelled")
+                            break
+                        st["next_yield"] += 1
+                        if page == max_pages and outcome is not None:
+                            outcome[idx] = "max_pages"
+                        yield jobs[idx], page, items
+                        if stop is not None and page < max_pages and stop(jobs[idx]):
+                            finish(idx, "stopped")
+                            break
+                        submit(idx)
@@ -0,0 +1,151 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+from crawler.product import BRAND_CU, BRAND_GS25, BRAND_SEVEN, promo_code, promo_name
+from crawler.storage import open_client
+from crawler.writer import BulkWriter
+
+# ==========================================
+# 📈 가격/행사 이력 (바뀐 순간만 append-only로 기록)
+# ==========================================
+# new_products는 price/promotion_type을 덮어쓰므로, 이전 값과 달라진 상품만 이 테이블에 한 줄씩 남깁니다.
+# 켜려면 CRAWLER_HISTORY=1 (테이블은 HISTORY_DDL로 먼저 만들어 둘 것)
+HISTORY_ENABLED = os.environ.get("CRAWLER_HISTORY", "").lower() in ("1", "true", "on", "yes")
+HISTORY_TABLE = "price_history"
+
+HISTORY_DDL = f"""
+CREATE TABLE IF NOT EXISTS {HISTORY_TABLE} (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    brand_id SMALLINT NOT NULL,
+    external_id BIGINT NOT NULL,
+    price INTEGER NOT NULL,
+    promo SMALLINT NOT NULL,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS {HISTORY_TABLE}_product_idx ON {HISTORY_TABLE} (brand_id, external_id, changed_at);
+""".strip()
+
+def price_state(p):
+    """이력 비교용 (price, promo 코드)"""
+    return (p.get('price') or 0, promo_code(p.get('promotion_type')))
+
+
+class HistoryLog:
+    """
+    ProductPipeline이 신규/변경으로 판단한 상품만 record()로 받아,
+    직전 상태(기존 맵의 price/promo 또는 이번 실행에서 마지막으로 기록한 값)와 다르면 이력 행을 insert 스트림에 넣습니다.
+    - 이미지/NEW 표시만 바뀐 행은 기록하지 않음
+    - 기존 맵에 가격 정보가 없으면 (스냅샷 스키마 이전 항목) 지금 상태를 기준점으로 한 번 기록
+    - changed_at은 실행마다 하나 (같은 실행의 변경은 같은 시각)
+    """
+
+    def __init__(self, supabase, label="", brand="", queue_size=None):
+        self.writer = BulkWriter(supabase, table=HISTORY_TABLE, on_conflict=None, label=f"{label} 이력", brand=brand,
+                                  stamp=False)
+        self.queue_size = queue_size
+        self.changed_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.recorded = 0
+        self.write_stats = None
+        self._last = {}
+        self._stream = None
+
+    def __enter__(self):
+        self._stream = self.writer.stream(self.queue_size).__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def record(self, p, known=None):
+        key = (p['brand_id'], p['external_id'])
+        state = price_state(p)
+        previous = self._last.get(key)
+        if previous is None and known is not None and known.get('promo') is not None:
+            previous = (known.get('price') or 0, known['promo'])
+        if state == previous:
+            return False
+        self._last[key] = state
+        self._stream.add({"brand_id": key[0], "external_id": key[1], "price": state[0], "promo": state[1],
+                          "changed_at": self.changed_at})
+        self.recorded += 1
+        return True
+
+    def summary(self):
+        return f"가격/행사 변경 {self.recorded}건 이력 기록"
+
+    def close(self):
+        if self._stream is not None:
+            self.write_stats = self._stream.close()
+            self._stream = None
+        return self.write_stats
+
+
+def default_history(supabase, label="", brand=""):
+    """CRAWLER_HISTORY가 꺼져 있으면 None (이력 안 남김)"""
+    return HistoryLog(supabase, label=label, brand=brand) if HISTORY_ENABLED else None
+
+
+def fetch_history(supabase, brand_id, external_id, since=None, until=None, batch_size=1000):
+    """
+    상품 하나의 이력 (changed_at 오름차순). since 이상 ~ until 미만 (ISO 문자열)
+    반환: [{"price", "promotion_type", "changed_at"}]
+    """
+    rows, start = [], 0
+    while True:
+        query = supabase.table(HISTORY_TABLE).select("price, promo, changed_at")\
+            .eq("brand_id", brand_id)\
+            .eq("external_id", external_id)
+        if since: query = query.gte("changed_at", since)
+        if until: query = query.lt("changed_at", until)
+        data = query.order("changed_at").range(start, start + batch_size - 1).execute().data
+        rows.extend({"price": r["price"], "promotion_type": promo_name(r["promo"]), "changed_at": r["changed_at"]}
+                    for r in data)
+        if len(data) < batch_size:
+            return rows
+        start += batch_size
+
+
+def state_at(history, when):
+    """fetch_history 결과에서 when 시점의 상태 (그 전 기록이 없으면 None)"""
+    current = None
+    for row in history:
+        if row["changed_at"] > when:
+            break
+        current = row
+    return current
+
+
+def main(argv=None):
+    brands = {"cu": BRAND_CU, "gs25": BRAND_GS25, "seven": BRAND_SEVEN}
+    parser = argparse.ArgumentParser(description="상품 하나의 가격/행사 이력 조회")
+    parser.add_argument("--ddl", action="store_true", help="이력 테이블 생성 SQL만 출력")
+    parser.add_argument("--brand", choices=sorted(brands), help="브랜드")
+    parser.add_argument("--id", type=int, help="external_id")
+    parser.add_argument("--since", help="이 시각 이후 (예: 2024-01-01)")
+    parser.add_argument("--until", help="이 시각 이전")
+    args = parser.parse_args(argv)
+
+    if args.ddl:
+        print(HISTORY_DDL)
+        return 0
+    if args.brand is None or args.id is None:
+        parser.error("--brand와 --id가 필요합니다")
+    supabase = open_client()
+    if supabase is None:
+        print("❌ 설정 오류: 환경변수가 없습니다.")
+        return 1
+
+    started = time.perf_counter()
+    history = fetch_history(supabase, brands[args.brand], args.id, args.since, args.until)
+    for row in history:
+        print(f" {row['changed_at']}  {row['price']:>7,}원  {row['promotion_type']}")
+    print(f"📈 이력 {len(history)}건 ({time.perf_counter() - started:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
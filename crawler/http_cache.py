@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import threading
+
+from crawler.product import to_json
+
+# ==========================================
+# 🗃️ 목록 페이지 응답 캐시 (ETag/Last-Modified + 본문 해시)
+# ==========================================
+CACHE_DIR = os.environ.get("CRAWLER_HTTP_CACHE", ".cache/http")
+MAX_CACHE_BYTES = 50 * 1024 * 1024
+
+# 파서/분류기가 바뀌면 올린다 → 캐시된 파싱 결과를 쓰지 않고 다시 파싱
+PARSE_VERSION = "2"
+
+
+class ResponseCache:
+    """
+    (endpoint, form payload) 별로 마지막 응답의 검증자와 파싱 결과를 디스크에 보관합니다.
+    - 서버가 ETag/Last-Modified를 주면 조건부 요청을 보내 304면 캐시된 결과를 씁니다.
+    - 아니면 본문 해시가 같을 때 파싱을 건너뛰고 캐시된 결과를 씁니다.
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, version=PARSE_VERSION):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size = None
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, url, payload=None, ignore=()):
+        """ignore에 있는 필드(CSRF 토큰 등 매번 바뀌는 값)는 키에서 뺍니다."""
+        items = sorted((str(k), str(v)) for k, v in (payload or {}).items() if k not in ignore)
+        raw = json.dumps([url, items], ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _load(self, key):
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("version") == self.version else None
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def fetch(self, engine, method, url, parse, data=None, ignore=(), on_response=None, **kwargs):
+        """
+        engine으로 요청을 보내고 parse(response)의 결과를 돌려줍니다.
+        응답이 지난번과 같으면(304 또는 같은 본문 해시) parse를 호출하지 않습니다.
+        on_response(response)는 적중 여부와 상관없이 파싱 전에 호출됩니다. (원본 아카이브 등)
+        parse 결과는 JSON으로 저장 가능한 값이어야 합니다. (Product는 dict 행으로 저장되어 적중 시 dict로 돌아옴)
+        """
+        key = self.key(url, data, ignore)
+        entry = self._load(key)
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(self.conditional_headers(entry))
+        r = engine.request(method, url, data=data, headers=headers, **kwargs)
+        if on_response: on_response(r)
+
+        if entry and r.status_code == 304:
+            return self._hit(key, entry)
+        body_hash = hashlib.sha256(r.content).hexdigest()
+        if entry and r.status_code == 200 and entry.get("body_hash") == body_hash:
+            return self._hit(key, entry)
+
+        self.misses += 1
+        records = parse(r)
+        if r.status_code == 200:
+            self._store(key, {
+                "version": self.version,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "body_hash": body_hash,
+                "records": records,
+            })
+        return records
+
+    def _hit(self, key, entry):
+        self.hits += 1
+        try:
+            os.utime(self._path(key))  # LRU 순서 갱신
+        except OSError:
+            pass
+        return entry["records"]
+
+    def _store(self, key, entry):
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, default=to_json)
+        with self._lock:
+            old = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp, path)
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += os.path.getsize(path) - old
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # 최대 크기의 80%까지 오래된 항목부터 삭제
+        target = self.max_bytes * 0.8
+        for path, size, _ in sorted(self._entries(), key=lambda e: e[2]):
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except OSError:
+                pass
+
+    def summary(self):
+        total = self.hits + self.misses
+        return f"캐시 적중 {self.hits}/{total}"
+
+
+def default_cache():
+    """CRAWLER_HTTP_CACHE=off 이면 캐시를 쓰지 않습니다."""
+    if CACHE_DIR.lower() in ("", "0", "off", "none"):
+        return None
+    try:
+        return ResponseCache()
+    except OSError as e:
+        print(f"⚠️ 응답 캐시 사용 불가: {e}")
+        return None
+
+
+def fetch_parsed(engine, cache, method, url, parse, data=None, ignore=(), on_response=None, **kwargs):
+    """캐시가 없으면(None/False) 그냥 요청 후 파싱, 있으면 ResponseCache.fetch"""
+    if not cache:
+        r = engine.request(method, url, data=data, **kwargs)
+        if on_response: on_response(r)
+        return parse(r)
+    return cache.fetch(engine, method, url, parse, data=data, ignore=ignore, on_response=on_response, **kwargs)
@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+import time
+
+# ==========================================
+# ⏩ 증분 크롤링 (변경 없는 페이지가 이어지면 조기 종료) + 주기적 전체 순회
+# ==========================================
+# auto: 마지막 전체 순회가 FULL_SWEEP_INTERVAL보다 오래됐으면 full, 아니면 incremental
+CRAWL_MODE = os.environ.get("CRAWLER_MODE", "auto")
+CRAWL_MODES = ("auto", "full", "incremental")
+
+# 신규/변경 상품이 없는 페이지가 연속으로 이만큼 나오면 그 목록(카테고리/행사)은 중단
+STOP_AFTER_PAGES = int(os.environ.get("CRAWLER_STOP_PAGES", "2"))
+
+# 사라진 상품 비활성화는 목록 끝까지 본 실행에서만 하므로 이 주기로는 전체를 순회
+FULL_SWEEP_INTERVAL = float(os.environ.get("CRAWLER_FULL_SWEEP_HOURS", "168")) * 60 * 60
+
+# 브랜드별 마지막 전체 순회 시각 (워크플로 캐시로 실행 간 유지)
+SWEEP_STATE_PATH = os.environ.get("CRAWLER_SWEEP_STATE", ".cache/full_sweep.json")
+
+
+class QuietPages:
+    """
+    목록(job)별로 '신규/변경 상품이 없는 페이지'가 연속 몇 번인지 셉니다.
+    stop_after가 None(또는 0)이면 멈추지 않습니다. (전체 순회)
+    """
+
+    def __init__(self, stop_after=None):
+        self.stop_after = stop_after
+        self._quiet = {}
+
+    def page(self, job, changed):
+        """페이지 하나의 신규/변경 상품 수를 기록하고, 이제 멈춰야 하면 True"""
+        self._quiet[job] = 0 if changed else self._quiet.get(job, 0) + 1
+        return self.stopped(job)
+
+    def stopped(self, job):
+        return bool(self.stop_after) and self._quiet.get(job, 0) >= self.stop_after
+
+
+class SweepSchedule:
+    """
+    브랜드별로 이번 실행을 전체 순회로 할지 증분으로 할지 정하고,
+    목록을 끝까지 본 실행이 끝나면 record()로 전체 순회 시각을 남깁니다.
+    """
+
+    def __init__(self, mode=CRAWL_MODE, path=SWEEP_STATE_PATH, stop_after=STOP_AFTER_PAGES,
+                 interval=FULL_SWEEP_INTERVAL):
+        if mode not in CRAWL_MODES:
+            raise ValueError(f"알 수 없는 크롤링 모드: {mode}")
+        self.mode = mode
+        self.path = path
+        self.stop_after = stop_after
+        self.interval = interval
+        self._lock = threading.Lock()
+        self.last = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def full(self, brand):
+        if self.mode != "auto":
+            return self.mode == "full"
+        return time.time() - self.last.get(brand, 0) >= self.interval
+
+    def quiet_pages(self, brand):
+        """이 브랜드용 QuietPages (전체 순회면 멈추지 않음)"""
+        return QuietPages(None if self.full(brand) else self.stop_after)
+
+    def describe(self, brand):
+        if self.full(brand):
+            return "전체 순회"
+        return f"증분 (변경 없는 페이지 {self.stop_after}개 연속이면 중단)"
+
+    def record(self, brand):
+        with self._lock:
+            self.last[brand] = time.time()
+            parent = os.path.dirname(self.path)
+            try:
+                if parent:
+                    os.makedirs(parent, exist_ok=True)
+                tmp = f"{self.path}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self.last, f)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"⚠️ 전체 순회 기록 실패: {e}")
@@ -0,0 +1,204 @@
+import re
+
+from lxml import etree
+
+from crawler.classifier import CU_CLASSIFIER, SEVEN_CLASSIFIER
+from crawler.metrics import METRICS
+from crawler.product import BRAND_CU, BRAND_SEVEN, Product
+
+# ==========================================
+# ⚡ lxml 기반 고속 파서 (BeautifulSoup 경로와 동일한 Product 반환)
+# ==========================================
+# BeautifulSoup의 find/find_all/get_text(strip=True) 동작을 그대로 옮긴
+# 미리 컴파일된 XPath 셀렉터들입니다.
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+def _first(tag, cls=None):
+    pred = f"[{_has_class(cls)}]" if cls else ""
+    return etree.XPath(f"descendant::{tag}{pred}[1]")
+
+# script/style/주석은 get_text()와 마찬가지로 제외
+_TEXT = etree.XPath("descendant::text()[not(parent::script or parent::style)]")
+
+def _text(el):
+    # get_text(strip=True)
+    return "".join(t.strip() for t in _TEXT(el) if t.strip())
+
+def _raw_text(el):
+    # get_text()
+    return "".join(_TEXT(el))
+
+def _one(xpath, el):
+    found = xpath(el)
+    return found[0] if found else None
+
+VIEW_RE = re.compile(r"view\s*\(\s*['\"]?(\d+)['\"]?\s*\)")
+VIEW_CALL_RE = re.compile(r"view\(")
+FNC_GO_VIEW_RE = re.compile(r"fncGoView\('(\d+)'\)")
+
+_ALL_LI = etree.XPath("//li")
+_CU_ITEMS = etree.XPath(f"//li[{_has_class('prod_list')}]")
+_CU_NAME = _first("div", "name")
+_CU_PRICE = _first("div", "price")
+_CU_BADGE = _first("div", "badge")
+_CU_PHOTO = _first("div", "photo")
+_STRONG = _first("strong")
+_SPAN = _first("span")
+_IMG = _first("img")
+_A = _first("a")
+_ALL_IMG_SRC = etree.XPath("descendant::img/@src")
+_ONCLICK_DIVS = etree.XPath("descendant::div[@onclick]")
+
+_SEVEN_NAME = _first("div", "tit_product")
+_SEVEN_PRICE = _first("div", "price")
+_SEVEN_PIC = _first("div", "pic_product")
+_SEVEN_TAG_LIST = _first("ul", "tag_list_01")
+_SEVEN_TAGS = etree.XPath("descendant::li")
+_A_HREF = etree.XPath("descendant::a[@href][1]")
+
+
+def parse_html(html):
+    """HTML 문자열(페이지 조각 포함)을 lxml 트리로 만듭니다. 빈 문서는 None."""
+    if not html or not html.strip():
+        return None
+    return etree.HTML(html)
+
+
+def parse_cu_item(item, raw_cat_name):
+    try:
+        name_tag = _one(_CU_NAME, item)
+        if name_tag is None: return METRICS.drop("cu", "no_title")
+        title = _text(name_tag)
+
+        # 제외 로직
+        if raw_cat_name == "즉석조리": return METRICS.drop("cu", "excluded_category")
+        if "GET" in title and ("아메리카노" in title or "라떼" in title or "커피" in title): return METRICS.drop("cu", "excluded_coffee")
+
+        price = 0
+        price_tag = _one(_CU_PRICE, item)
+        if price_tag is not None:
+            strong = _one(_STRONG, price_tag)
+            if strong is not None:
+                price = int(_text(strong).replace(",", ""))
+
+        img_src = ""
+        img_tag = _one(_IMG, item)
+        if img_tag is not None:
+            img_src = img_tag.get("src") or ""
+            if img_src and not img_src.startswith("http"):
+                if img_src.startswith("//"): img_src = "https:" + img_src
+                else: img_src = "https://cu.bgfretail.com" + img_src
+
+        # NEW 판별: 이미지 파일명 → 배지 텍스트
+        is_new = any("tag_new.png" in src for src in _ALL_IMG_SRC(item))
+        promo = "일반"
+
+        badge_tag = _one(_CU_BADGE, item)
+        if badge_tag is not None:
+            badge_text = _text(badge_tag).upper()
+            if "NEW" in badge_text: is_new = True
+
+            span = _one(_SPAN, badge_tag)
+            if span is not None:
+                promo = _text(span)
+            else:
+                clean = badge_text.replace("NEW", "").strip()
+                if clean: promo = clean
+
+        # 덤증정 제외
+        if "덤" in promo or "증정" in promo: return METRICS.drop("cu", "excluded_gift")
+
+        # ID 추출
+        gdIdx = None
+        for div in _ONCLICK_DIVS(item):
+            onclick = div.get("onclick")
+            if VIEW_CALL_RE.search(onclick):
+                m = VIEW_RE.search(onclick)
+                if m: gdIdx = int(m.group(1))
+                break
+
+        if not gdIdx:
+            photo_div = _one(_CU_PHOTO, item)
+            a = _one(_A, photo_div) if photo_div is not None else None
+            if a is not None:
+                m = VIEW_RE.search(a.get("onclick") or "")
+                if m: gdIdx = int(m.group(1))
+
+        if not gdIdx: return METRICS.drop("cu", "no_id")
+
+        return Product(BRAND_CU, gdIdx, title, price, img_src,
+                       METRICS.timed("cu", "classify", CU_CLASSIFIER.classify, title, raw_cat_name),
+                       raw_cat_name, promo, is_new)
+    except: return METRICS.drop("cu", "error")
+
+
+def parse_cu_page(html, raw_cat_name):
+    """CU productAjax.do 응답 → Product 리스트. li.prod_list가 없으면 None."""
+    root = parse_html(html)
+    items = _CU_ITEMS(root) if root is not None else []
+    if not items: return None
+    return [p for p in (parse_cu_item(item, raw_cat_name) for item in items) if p]
+
+
+def parse_seven_item(item, fixed_category=None):
+    try:
+        name_tag = _one(_SEVEN_NAME, item)
+        if name_tag is None: return METRICS.drop("seven", "no_title")
+        title = _text(name_tag)
+
+        price = 0
+        price_tag = _one(_SEVEN_PRICE, item)
+        if price_tag is not None:
+            span = _one(_SPAN, price_tag)
+            if span is not None:
+                price = int(_text(span).replace(",", ""))
+
+        pic = _one(_SEVEN_PIC, item)
+        if pic is None: raise ValueError("pic_product 없음")
+        img_tag = _one(_IMG, pic)
+        img_src = ""
+        if img_tag is not None:
+            img_src = img_tag.get("src")
+            if img_src and not img_src.startswith("http"):
+                img_src = "https://www.7-eleven.co.kr" + img_src
+
+        promo = "일반"
+        tag_list = _one(_SEVEN_TAG_LIST, item)
+        if tag_list is not None:
+            for tag in _SEVEN_TAGS(tag_list):
+                text = _text(tag)
+                if "1+1" in text: promo = "1+1"
+                elif "2+1" in text: promo = "2+1"
+                elif "신상품" in text: promo = "NEW"
+
+        gdIdx = None
+        link = _one(_A_HREF, item)
+        if link is not None:
+            m = FNC_GO_VIEW_RE.search(link.get("href"))
+            if m: gdIdx = int(m.group(1))
+
+        if not gdIdx: return METRICS.drop("seven", "no_id")
+
+        category = fixed_category if fixed_category else METRICS.timed("seven", "classify", SEVEN_CLASSIFIER.classify, title, None)
+        return Product(BRAND_SEVEN, gdIdx, title, price, img_src, category, fixed_category, promo, promo == "NEW")
+    except Exception as e:
+        print(f"   ⚠️ 파싱 에러: {e}")
+        return METRICS.drop("seven", "error")
+
+
+def parse_seven_page(html, fixed_category=None):
+    """
+    세븐일레븐 AJAX 목록 응답 → Product 리스트. li가 하나도 없으면 None.
+    '데이터가 없습니다' 항목을 만나면 거기서 멈춥니다.
+    """
+    root = parse_html(html)
+    items = _ALL_LI(root) if root is not None else []
+    if not items: return None
+    products = []
+    for item in items:
+        if "데이터가 없습니다" in _raw_text(item): break
+        p = parse_seven_item(item, fixed_category)
+        if p: products.append(p)
+    return products
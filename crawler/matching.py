@@ -0,0 +1,370 @@
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from array import array
+from functools import lru_cache
+
+from crawler.product import BRAND_CU, BRAND_GS25, BRAND_SEVEN
+from crawler.snapshot import fetch_rows
+from crawler.storage import LOCAL_DB, open_client
+from crawler.writer import BulkWriter
+
+# ==========================================
+# 🔗 브랜드 간 같은 상품 매칭 (제목 정규화 + MinHash LSH)
+# ==========================================
+MATCH_PATH = os.environ.get("CRAWLER_MATCH_PATH", ".cache/matches.sqlite3")
+
+# 로컬 인덱스는 LSH 작업용이고, 매칭 결과는 저장소(Supabase/로컬 DB)의 이 테이블에 반영
+# Supabase에서는 MATCH_DDL로 먼저 만들어 둘 것 (python -m crawler match --ddl). 끄려면 CRAWLER_MATCH_PUBLISH=0
+MATCH_TABLE = "product_matches"
+MATCH_KEY = "a_brand,a_id,b_brand,b_id"
+MATCH_PUBLISH = os.environ.get("CRAWLER_MATCH_PUBLISH", "1").lower() in ("1", "true", "on", "yes")
+
+MATCH_DDL = f"""
+CREATE TABLE IF NOT EXISTS {MATCH_TABLE} (
+    a_brand SMALLINT NOT NULL,
+    a_id BIGINT NOT NULL,
+    b_brand SMALLINT NOT NULL,
+    b_id BIGINT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (a_brand, a_id, b_brand, b_id)
+);
+CREATE INDEX IF NOT EXISTS {MATCH_TABLE}_b_idx ON {MATCH_TABLE} (b_brand, b_id);
+""".strip()
+
+# 스키마/정규화/해시 파라미터가 바뀌면 버전을 올린다 → 기존 인덱스는 버리고 다시 만듦
+SCHEMA_VERSION = 1
+
+# MinHash: 서명 길이 = BANDS * ROWS. 밴드 하나가 통째로 같으면 후보
+# (자카드 s일 때 후보가 될 확률 1-(1-s^ROWS)^BANDS → 0.5 부근에서 급격히 올라감)
+BANDS, ROWS = 16, 4
+SHINGLE = 2            # 공백을 뺀 제목의 글자 n-gram (한글 상품명이 짧아서 2)
+MATCH_THRESHOLD = 0.6  # 후보 쌍의 실제 n-gram 자카드가 이 이상이면 같은 상품
+
+BRAND_NAMES = {BRAND_CU: "CU", BRAND_GS25: "GS25", BRAND_SEVEN: "7-Eleven"}
+
+# 제목 앞의 브랜드/PB/분류 꼬리표: "유어스)", "세븐셀렉트)", "도)", "[1+1]", "(NEW)"
+_PREFIX = re.compile(r"^\s*(?:\[[^\]]{0,12}\]|\([^)]{0,12}\)|[0-9a-z가-힣!]{1,8}\))\s*")
+_BRAND_WORDS = re.compile(r"(?<![0-9a-z])(?:cu|gs25|gs|7-?eleven|youus|heyroo|pb)(?![0-9a-z])|세븐일레븐|세븐셀렉트|유어스|헤이루")
+_UNIT = re.compile(r"(\d+(?:\.\d+)?)\s*(ml|l|kg|g|매|개입|입|개)(?![a-z])")
+_UNIT_SCALE = {"l": ("ml", 1000), "kg": ("g", 1000), "개입": ("입", 1), "개": ("입", 1)}
+_NOISE = re.compile(r"[^0-9a-z가-힣]")
+_SIZE = re.compile(r"\d+(?:\.\d+)?(?:ml|g|매|입)")
+
+
+def _unit(m):
+    unit, scale = _UNIT_SCALE.get(m.group(2), (m.group(2), 1))
+    amount = float(m.group(1)) * scale
+    return f"{amount:g}{unit} "
+
+
+def normalize_title(title):
+    """
+    매칭용 제목: NFKC + 소문자, 앞쪽 브랜드/분류 꼬리표 제거, 용량 단위 통일(1.5L → 1500ml, 1kg → 1000g),
+    공백/기호 제거. 예) "유어스)코카콜라 1.5L" → "코카콜라1500ml"
+    """
+    text = unicodedata.normalize("NFKC", title or "").casefold()
+    while True:
+        stripped = _PREFIX.sub("", text, count=1)
+        if stripped == text: break
+        text = stripped
+    text = _UNIT.sub(_unit, text)
+    text = _BRAND_WORDS.sub("", text)
+    return _NOISE.sub("", text)
+
+
+def size_key(normalized):
+    """정규화된 제목의 용량/중량 표기 ("500ml", "2입"...) 집합. 둘 다 있는데 다르면 다른 상품"""
+    return frozenset(_SIZE.findall(normalized))
+
+
+def shingles(normalized):
+    """용량 표기를 뺀 이름 부분의 글자 n-gram (용량은 size_key로 따로 비교)"""
+    normalized = _SIZE.sub("", normalized)
+    if len(normalized) <= SHINGLE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE] for i in range(len(normalized) - SHINGLE + 1)}
+
+
+@lru_cache(maxsize=1 << 16)
+def _shingle_hashes(gram):
+    """n-gram 하나의 해시 BANDS * ROWS개 (shake_128 출력을 32비트씩 → 서로 독립인 해시 함수들)
+    n-gram 종류는 상품 수보다 훨씬 적어서 캐시하면 해시는 거의 한 번씩만 계산"""
+    return array("I", hashlib.shake_128(gram.encode("utf-8")).digest(4 * BANDS * ROWS))
+
+
+def minhash(grams):
+    """n-gram 집합의 MinHash 서명 (길이 BANDS * ROWS): 해시 함수마다 n-gram들 중 최솟값"""
+    if not grams:
+        return [0] * (BANDS * ROWS)
+    return list(map(min, zip(*(_shingle_hashes(g) for g in grams))))
+
+
+def band_keys(signature):
+    """밴드별 버킷 키 (부호 있는 64비트, SQLite INTEGER)"""
+    keys = []
+    for band in range(BANDS):
+        raw = array("I", signature[band * ROWS:(band + 1) * ROWS]).tobytes()
+        keys.append(int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "big", signed=True))
+    return keys
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def similar(norm_a, norm_b):
+    """두 정규화 제목의 점수 (용량 표기가 서로 다르면 0)"""
+    sa, sb = size_key(norm_a), size_key(norm_b)
+    if sa and sb and sa != sb:
+        return 0.0
+    return jaccard(shingles(norm_a), shingles(norm_b))
+
+
+class MatchIndex:
+    """
+    (brand_id, external_id) → 정규화 제목/LSH 버킷을 로컬 SQLite에 두고, 다른 브랜드 상품과의 매칭 표를 유지합니다.
+    - update(rows): 새 상품이나 제목이 바뀐 상품만 서명을 계산해 버킷에 넣고,
+      같은 버킷에 있는 다른 브랜드 상품만 후보로 실제 유사도를 확인 (전체 쌍 비교 없음)
+    - 제목이 바뀐 상품은 예전 버킷/매칭을 지우고 다시 계산
+    - matches(key), groups(): 매칭 조회 (groups는 매칭으로 이어진 상품 묶음)
+    - publish(supabase): 지난 반영 이후 바뀐 매칭만 저장소 product_matches 테이블에 반영
+      (이 인덱스에서 반영에 성공한 적이 없으면 전체를 다시 올림)
+    """
+
+    def __init__(self, path=MATCH_PATH, threshold=MATCH_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.stats = {"indexed": 0, "unchanged": 0, "candidates": 0, "matched": 0}
+        self._norms = None   # (brand_id, external_id) → 정규화 제목 (첫 update에서 한 번 로드)
+        self._removed = set()   # 지난 publish 이후 매칭을 지운 상품
+        self._found = {}        # 지난 publish 이후 새로 찾은 매칭 (a, b) → score
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None or row[0] != str(SCHEMA_VERSION):
+            self.reset()
+
+    def reset(self):
+        with self.conn:
+            for table in ("items", "buckets", "matches"):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute("""
+                CREATE TABLE items (
+                    brand_id INTEGER NOT NULL,
+                    external_id INTEGER NOT NULL,
+                    title TEXT,
+                    norm TEXT,
+                    PRIMARY KEY (brand_id, external_id)
+                ) WITHOUT ROWID
+            """)
+            self.conn.execute("""
+                CREATE TABLE buckets (
+                    band INTEGER NOT NULL,
+                    key INTEGER NOT NULL,
+                    brand_id INTEGER NOT NULL,
+                    external_id INTEGER NOT NULL,
+                    PRIMARY KEY (band, key, brand_id, external_id)
+                ) WITHOUT ROWID
+            """)
+            self.conn.execute("CREATE INDEX buckets_item_idx ON buckets (brand_id, external_id)")
+            self.conn.execute("""
+                CREATE TABLE matches (
+                    a_brand INTEGER NOT NULL, a_id INTEGER NOT NULL,
+                    b_brand INTEGER NOT NULL, b_id INTEGER NOT NULL,
+                    score REAL,
+                    PRIMARY KEY (a_brand, a_id, b_brand, b_id)
+                ) WITHOUT ROWID
+            """)
+            self.conn.execute("CREATE INDEX matches_b_idx ON matches (b_brand, b_id)")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                              (str(SCHEMA_VERSION),))
+            self.conn.execute("DELETE FROM meta WHERE key = 'published'")   # 저장소 쪽도 전체를 다시 올림
+        self._norms = None
+        self._removed, self._found = set(), {}
+
+    def _changed(self, rows):
+        """새 상품이거나 정규화 제목이 바뀐 행만 [(key, title, norm)]"""
+        if self._norms is None:
+            self._norms = {(b, e): n for b, e, n in self.conn.execute("SELECT brand_id, external_id, norm FROM items")}
+        changed = {}
+        for r in rows:
+            key = (r['brand_id'], r['external_id'])
+            if key[1] is None: continue
+            norm = normalize_title(r.get('title'))
+            if self._norms.get(key) == norm:
+                self.stats["unchanged"] += 1
+                continue
+            changed[key] = (key, r.get('title'), norm)
+        return list(changed.values())
+
+    def update(self, rows):
+        """rows: brand_id/external_id/title을 가진 dict 또는 Product. 새로 찾은 매칭 수를 반환"""
+        changed = self._changed(rows)
+        if not changed:
+            return 0
+        keys = [key for key, _, _ in changed]
+        stale = [key for key in keys if key in self._norms]   # 제목이 바뀐 기존 상품
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS pending (brand_id INTEGER, external_id INTEGER)")
+            self.conn.execute("DELETE FROM pending")
+            self.conn.executemany("INSERT INTO pending VALUES (?, ?)", keys)
+            for sql in ("DELETE FROM buckets WHERE brand_id = ? AND external_id = ?",
+                        "DELETE FROM matches WHERE a_brand = ? AND a_id = ?",
+                        "DELETE FROM matches WHERE b_brand = ? AND b_id = ?"):
+                self.conn.executemany(sql, stale)   # 키마다 인덱스로 (예전 버킷/매칭 정리)
+            self.conn.executemany("INSERT OR REPLACE INTO items (brand_id, external_id, title, norm) VALUES (?, ?, ?, ?)",
+                                  [(k[0], k[1], title, norm) for k, title, norm in changed])
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO buckets (band, key, brand_id, external_id) VALUES (?, ?, ?, ?)",
+                ((band, bucket, k[0], k[1]) for k, _, norm in changed if norm
+                 for band, bucket in enumerate(band_keys(minhash(shingles(norm))))))
+            self.stats["indexed"] += len(changed)
+
+            # 바뀐 상품과 같은 버킷에 있는 다른 브랜드 상품만 후보 (SQL 조인 한 번)
+            # CROSS JOIN: pending → 그 상품의 버킷 → 같은 버킷 순서로 고정 (통계 없는 임시 테이블이라 플래너가 전체 스캔을 고름)
+            candidates = self.conn.execute("""
+                SELECT DISTINCT p.brand_id, p.external_id, o.brand_id, o.external_id, pi.norm, oi.norm
+                FROM pending p
+                CROSS JOIN buckets pb ON pb.brand_id = p.brand_id AND pb.external_id = p.external_id
+                CROSS JOIN buckets o ON o.band = pb.band AND o.key = pb.key AND o.brand_id != p.brand_id
+                JOIN items pi ON pi.brand_id = p.brand_id AND pi.external_id = p.external_id
+                JOIN items oi ON oi.brand_id = o.brand_id AND oi.external_id = o.external_id
+            """).fetchall()
+            found, seen = {}, set()
+            for pb, pe, ob, oe, pn, on in candidates:
+                pair = tuple(sorted(((pb, pe), (ob, oe))))
+                if pair in seen: continue   # 둘 다 이번에 바뀐 상품이면 양쪽에서 한 번씩 나옴
+                seen.add(pair)
+                self.stats["candidates"] += 1
+                score = similar(pn, on)
+                if score >= self.threshold:
+                    found[pair] = score
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO matches (a_brand, a_id, b_brand, b_id, score) VALUES (?, ?, ?, ?, ?)",
+                [(a[0], a[1], b[0], b[1], score) for (a, b), score in found.items()])
+        self._norms.update((k, norm) for k, _, norm in changed)
+        if stale:
+            self._removed.update(stale)
+            self._found = {(a, b): score for (a, b), score in self._found.items()
+                           if a not in self._removed and b not in self._removed}
+        self._found.update(found)
+        self.stats["matched"] += len(found)
+        return len(found)
+
+    def publish(self, supabase):
+        """
+        바뀐 매칭을 저장소 product_matches 테이블에 반영합니다. 지운 상품의 매칭은 삭제 후 새 매칭을 Upsert.
+        전체를 다시 올릴 때는 테이블을 비우고 로컬 매칭 표 전체를 씁니다. 성공하면 True
+        """
+        full = self.conn.execute("SELECT value FROM meta WHERE key = 'published'").fetchone() is None
+        try:
+            if full:
+                supabase.table(MATCH_TABLE).delete().gte("a_brand", 0).execute()
+                found = {((ab, ai), (bb, bi)): score for ab, ai, bb, bi, score
+                         in self.conn.execute("SELECT a_brand, a_id, b_brand, b_id, score FROM matches")}
+            else:
+                for brand_id, external_id in sorted(self._removed):
+                    supabase.table(MATCH_TABLE).delete().eq("a_brand", brand_id).eq("a_id", external_id).execute()
+                    supabase.table(MATCH_TABLE).delete().eq("b_brand", brand_id).eq("b_id", external_id).execute()
+                found = self._found
+        except Exception as e:
+            print(f"❌ 매칭 테이블 정리 실패 ({MATCH_TABLE}가 없으면 --ddl의 SQL로 먼저 만들 것): {e}")
+            return False
+        rows = [{"a_brand": a[0], "a_id": a[1], "b_brand": b[0], "b_id": b[1], "score": round(score, 4)}
+                for (a, b), score in found.items()]
+        writer = BulkWriter(supabase, table=MATCH_TABLE, on_conflict=MATCH_KEY, label="매칭", stamp=False)
+        failed = writer.write(rows)["failed"] if rows else 0
+        with self.conn:
+            if failed:   # 일부 배치가 빠졌으면 다음 실행에서 전체를 다시 올림
+                self.conn.execute("DELETE FROM meta WHERE key = 'published'")
+            else:
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('published', '1')")
+        self._removed, self._found = set(), {}
+        return not failed
+
+    def matches(self, key):
+        """다른 브랜드의 같은 상품 [((brand_id, external_id), score)] (점수 높은 순)"""
+        rows = self.conn.execute(
+            "SELECT b_brand, b_id, score FROM matches WHERE a_brand = ? AND a_id = ? "
+            "UNION ALL SELECT a_brand, a_id, score FROM matches WHERE b_brand = ? AND b_id = ?", (*key, *key))
+        return sorted((((b, e), s) for b, e, s in rows), key=lambda m: -m[1])
+
+    def groups(self):
+        """매칭으로 이어진 상품 묶음 (union-find). [[(brand_id, external_id), ...]] 큰 묶음 순"""
+        parent = {}
+
+        def find(x):
+            while parent.setdefault(x, x) != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for ab, ai, bb, bi in self.conn.execute("SELECT a_brand, a_id, b_brand, b_id FROM matches"):
+            ra, rb = find((ab, ai)), find((bb, bi))
+            if ra != rb: parent[max(ra, rb)] = min(ra, rb)
+        groups = {}
+        for key in parent:
+            groups.setdefault(find(key), []).append(key)
+        return sorted((sorted(g) for g in groups.values()), key=lambda g: (-len(g), g))
+
+    def titles(self, keys):
+        found = {}
+        for key in keys:
+            row = self.conn.execute("SELECT title FROM items WHERE brand_id = ? AND external_id = ?", key).fetchone()
+            found[key] = row[0] if row else None
+        return found
+
+    def summary(self):
+        s = self.stats
+        return f"색인 {s['indexed']} / 변경 없음 {s['unchanged']} / 후보 쌍 {s['candidates']} / 매칭 {s['matched']}"
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CU / GS25 / 7-Eleven 같은 상품 매칭 표 갱신")
+    parser.add_argument("--index", default=MATCH_PATH, help="매칭 인덱스 SQLite 경로 (기본: CRAWLER_MATCH_PATH)")
+    parser.add_argument("--db", default=LOCAL_DB, help="상품을 읽을 로컬 SQLite (없으면 Supabase)")
+    parser.add_argument("--rebuild", action="store_true", help="인덱스를 지우고 처음부터 다시 만듦")
+    parser.add_argument("--show", type=int, default=10, help="출력할 매칭 묶음 수")
+    parser.add_argument("--no-publish", dest="publish", action="store_false", default=MATCH_PUBLISH,
+                        help=f"매칭을 저장소 {MATCH_TABLE} 테이블에 반영하지 않음 (기본: CRAWLER_MATCH_PUBLISH)")
+    parser.add_argument("--ddl", action="store_true", help="매칭 테이블 생성 SQL만 출력")
+    args = parser.parse_args(argv)
+
+    if args.ddl:
+        print(MATCH_DDL)
+        return 0
+    supabase = open_client(args.db)
+    if supabase is None:
+        print("❌ 설정 오류: 환경변수가 없습니다.")
+        return 1
+    index = MatchIndex(args.index)
+    if args.rebuild: index.reset()
+
+    started = time.perf_counter()
+    for rows in fetch_rows(supabase, columns=["brand_id", "external_id", "title"]):
+        index.update(rows)
+    print(f"🔗 {index.summary()} ({time.perf_counter() - started:.1f}s)")
+    published = index.publish(supabase) if args.publish else True
+
+    groups = index.groups()
+    print(f"✅ 브랜드 간 같은 상품 묶음 {len(groups)}개")
+    for group in groups[:args.show]:
+        titles = index.titles(group)
+        print("   " + " ↔ ".join(f"{BRAND_NAMES.get(b, b)} {titles[(b, e)]}" for b, e in group))
+    index.close()
+    return 0 if published else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+# ==========================================
+# 📊 단계별 계측 (fetch / parse / classify / upsert)
+# ==========================================
+# CRAWLER_METRICS=경로 (또는 '-' = 표준출력) 이면 실행 끝에 JSON 요약을 남깁니다.
+METRICS_PATH = os.environ.get("CRAWLER_METRICS", "")
+
+# 지연 히스토그램 버킷 상한 (ms), 마지막 버킷은 그 이상 전부
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """고정 버킷 지연 히스토그램. 백분위는 버킷 상한으로 근사합니다."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q):
+        if not self.count: return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max
+        return self.max
+
+    def to_dict(self):
+        labels = [f"<={b}" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "min_ms": round(self.min, 3) if self.min is not None else None,
+            "max_ms": round(self.max, 3) if self.max is not None else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
+class _Timer:
+    __slots__ = ("metrics", "brand", "stage", "started")
+
+    def __init__(self, metrics, brand, stage):
+        self.metrics = metrics
+        self.brand = brand
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.brand, self.stage, (time.perf_counter() - self.started) * 1000)
+        if exc_type is not None:
+            self.metrics.incr(self.brand, f"{self.stage}.errors")
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    브랜드 x 단계별 카운터와 지연 히스토그램을 모읍니다. (스레드 안전)
+    꺼져 있으면 모든 메서드가 enabled 확인 한 번으로 바로 돌아가므로
+    파서 안쪽처럼 자주 불리는 곳에 그대로 둬도 됩니다.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+            self.started = time.time()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def timer(self, brand, stage):
+        """with METRICS.timer("cu", "parse"): ... → stage 히스토그램에 ms 기록 (예외면 stage.errors 증가)"""
+        if not self.enabled: return _NULL_TIMER
+        return _Timer(self, brand, stage)
+
+    def timed(self, brand, stage, fn, *args):
+        """fn(*args)를 실행하며 시간을 잽니다. (분류기 호출처럼 한 줄짜리 호출용)"""
+        if not self.enabled: return fn(*args)
+        with _Timer(self, brand, stage):
+            return fn(*args)
+
+    def observe(self, brand, stage, value_ms):
+        if not self.enabled: return
+        with self._lock:
+            hist = self._histograms.get((brand, stage))
+            if hist is None:
+                hist = self._histograms[(brand, stage)] = Histogram()
+            hist.add(value_ms)
+
+    def incr(self, brand, name, n=1):
+        if not self.enabled: return
+        with self._lock:
+            self._counters[(brand, name)] = self._counters.get((brand, name), 0) + n
+
+    def drop(self, brand, reason):
+        """파서가 버린 항목을 사유별로 셉니다. 항상 None (return METRICS.drop(...) 형태로 사용)"""
+        if self.enabled: self.incr(brand, f"dropped.{reason}")
+        return None
+
+    def summary(self, extra=None):
+        brands = {}
+        with self._lock:
+            for (brand, name), value in sorted(self._counters.items()):
+                brands.setdefault(brand, {"counters": {}, "timers": {}})["counters"][name] = value
+            for (brand, stage), hist in sorted(self._histograms.items()):
+                brands.setdefault(brand, {"counters": {}, "timers": {}})["timers"][stage] = hist.to_dict()
+        summary = {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "elapsed_s": round(time.time() - self.started, 3),
+            "brands": brands,
+        }
+        if extra: summary.update(extra)
+        return summary
+
+    def dump(self, path=None, extra=None):
+        """JSON 요약을 path에 저장 (None 또는 '-'이면 표준출력)"""
+        data = json.dumps(self.summary(extra), ensure_ascii=False, indent=2)
+        if not path or path == "-":
+            print(data)
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data)
+        print(f"📊 실행 지표 저장: {path}")
+
+
+METRICS = Metrics(enabled=bool(METRICS_PATH))
@@ -0,0 +1,55 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ==========================================
+# 🎛️ 브랜드 병렬 실행 오케스트레이터
+# ==========================================
+class BrandTask:
+    """
+    브랜드 크롤러 하나를 나타내는 작업 단위.
+    - run(engine): 실제 크롤링 함수 (블로킹, 별도 스레드에서 실행)
+    - make_engine(): 브랜드 전용 FetchEngine 생성 (브랜드별 속도 제한 포함)
+    - timeout: 초 단위 제한시간, 초과하면 엔진을 취소하고 다음 브랜드를 기다리지 않음
+    """
+
+    def __init__(self, name, run, make_engine, timeout=None):
+        self.name = name
+        self.run = run
+        self.make_engine = make_engine
+        self.timeout = timeout
+
+
+async def _run_task(executor, task):
+    loop = asyncio.get_running_loop()
+    engine = task.make_engine()
+    started = time.monotonic()
+    future = loop.run_in_executor(executor, task.run, engine)
+    try:
+        await asyncio.wait_for(asyncio.shield(future), task.timeout)
+        status = "ok"
+    except asyncio.TimeoutError:
+        # 스레드는 강제 종료할 수 없으므로 엔진을 취소해 남은 요청을 빠르게 끊는다
+        engine.cancel()
+        status = "timeout"
+        print(f"⏱️ {task.name} 제한시간({task.timeout}s) 초과 → 중단 요청")
+    except Exception as e:
+        status = "error"
+        print(f"❌ {task.name} 크롤링 실패: {e}")
+    elapsed = time.monotonic() - started
+    print(f"🏁 {task.name} 종료 ({status}, {elapsed:.1f}s)")
+    return task.name, status, elapsed
+
+
+async def run_brands(tasks):
+    """
+    모든 브랜드 작업을 동시에 실행하고 {브랜드: (상태, 소요시간)}를 반환합니다.
+    전체 소요시간은 가장 느린 브랜드(또는 그 제한시간)에 수렴합니다.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(len(tasks), 1), thread_name_prefix="brand")
+    try:
+        results = await asyncio.gather(*(_run_task(executor, t) for t in tasks))
+    finally:
+        # 시간 초과된 작업은 취소 신호를 받은 상태이므로 기다리지 않는다
+        executor.shutdown(wait=False, cancel_futures=True)
+    return {name: (status, elapsed) for name, status, elapsed in results}
@@ -0,0 +1,102 @@
+from crawler.diffing import change_kind, content_hash, format_stats
+from crawler.product import to_row
+
+# ==========================================
+# 🚰 스트리밍 파이프라인 (파싱된 페이지 → 기존값 유지 → 중복 제거 → 변경분만 → 배치 writer)
+# ==========================================
+class ProductPipeline:
+    """
+    크롤러가 페이지마다 feed()로 상품을 넘기면 바로 걸러서 BulkWriter 스트림으로 보냅니다.
+    카테고리/브랜드 전체를 모아 두지 않으므로 메모리는 (brand_id, external_id) → 해시 맵만 남고,
+    도중에 죽더라도 이미 보낸 배치는 DB에 남습니다.
+    상품은 Product(crawler/product.py) 또는 같은 키의 dict이며, 써야 할 행만 Upsert payload로 바꿉니다.
+
+    - keep_manual: 이미 DB에 있는 상품이면 제목/카테고리를 DB 값으로 유지 (수동 수정본 보존)
+    - 같은 실행에서 같은 상품이 다시 나오면 건너뛰고, 값이 달라졌을 때만 다시 씁니다 (마지막 값 우선)
+    - reclassify: 상품 → 이전 분류기가 냈을 카테고리 함수. 제목이 DB와 같고 DB 카테고리도 그 값과 같은
+      (수동으로 고치지 않은) 상품만 새로 분류한 카테고리를 쓰고, 달라졌으면 변경으로 봅니다.
+      나머지는 keep_manual 규칙을 따릅니다. (분류기 변경 후 재처리용, crawler/reprocess.py)
+    - history: 신규/변경 상품을 넘길 HistoryLog (crawler/history.py, 가격/행사가 바뀐 것만 기록). 파이프라인이 함께 닫습니다.
+    """
+
+    def __init__(self, writer, existing_map, keep_manual=True, queue_size=None, reclassify=None, history=None):
+        self.writer = writer
+        self.existing_map = existing_map or {}
+        self.keep_manual = keep_manual
+        self.reclassify = reclassify
+        self.queue_size = queue_size
+        self.history = history
+        self.stats = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        self.write_stats = None
+        self._seen = {}
+        self._stream = None
+
+    def __enter__(self):
+        self._stream = self.writer.stream(self.queue_size).__enter__()
+        if self.history is not None: self.history.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def feed(self, products):
+        """상품을 걸러 스트림에 넣고, 이 중 새로 쓰게 된(신규/변경) 상품 수를 반환합니다."""
+        changed = 0
+        for p in products or []:
+            if p.get('external_id') is None:
+                self.stats["skipped"] += 1
+                continue
+            key = (p['brand_id'], p['external_id'])
+            known = self.existing_map.get(key)
+            recategorized = False
+            if (self.reclassify is not None and known is not None and known['title'] == p['title']
+                    and known['category'] == self.reclassify(p)):
+                recategorized = known['category'] != p['category']
+            elif self.keep_manual and known is not None:
+                p['title'] = known['title']       # 사용자가 수정한 제목 유지
+                p['category'] = known['category'] # 사용자가 수정한 카테고리 유지
+
+            digest = content_hash(p)
+            previous = self._seen.get(key)
+            self._seen[key] = digest
+            if previous is not None:
+                self.stats["skipped"] += 1
+                if previous != digest:
+                    self._stream.add(to_row(p))
+                    if self.history is not None: self.history.record(p, known)
+                    changed += 1
+                continue
+
+            kind = change_kind(p, self.existing_map, digest)
+            if kind == "unchanged" and recategorized: kind = "updated"
+            self.stats[kind] += 1
+            if kind != "unchanged":
+                self._stream.add(to_row(p))
+                if self.history is not None: self.history.record(p, known)
+                changed += 1
+        return changed
+
+    def mark(self, callback):
+        """지금까지 feed한 상품이 모두 DB에 저장되면 callback(written) 호출 (체크포인트용)"""
+        self._stream.mark(callback)
+
+    def seen_ids(self, brand_id):
+        """이번 실행에서 본 external_id 집합 (사라진 상품 비활성화용)"""
+        return {ext for (b, ext) in self._seen if b == brand_id}
+
+    @property
+    def queued(self):
+        return self.stats["inserted"] + self.stats["updated"]
+
+    def summary(self):
+        summary = format_stats(self.stats)
+        if self.history is not None: summary += f" / {self.history.summary()}"
+        return summary
+
+    def close(self):
+        if self.history is not None: self.history.close()
+        if self._stream is not None:
+            self.write_stats = self._stream.close()
+            self._stream = None
+        return self.write_stats
@@ -0,0 +1,139 @@
+import hashlib
+import re
+import sys
+import unicodedata
+
+# ==========================================
+# 📦 공용 상품 레코드 (CU / GS25 / 세븐일레븐 공통 스키마)
+# ==========================================
+BRAND_CU, BRAND_GS25, BRAND_SEVEN = 1, 2, 3
+
+# brand_id → 상세 페이지 URL 형식 ({0} = external_id, GS25는 상품별 페이지가 없음)
+SOURCE_URLS = {
+    BRAND_CU: "https://cu.bgfretail.com/product/view.do?category=product&gdIdx={0}",
+    BRAND_GS25: "http://gs25.gsretail.com/gscvs/ko/products/event-goods",
+    BRAND_SEVEN: "https://www.7-eleven.co.kr/product/productView.asp?pCd={0}",
+}
+
+# new_products Upsert payload 컬럼
+ROW_FIELDS = ("title", "price", "image_url", "category", "original_category", "promotion_type",
+              "brand_id", "source_url", "is_active", "external_id", "is_new")
+
+# 상품마다 같은 값이 반복되는 문자열 필드 → intern해서 한 객체를 공유
+INTERNED_FIELDS = frozenset(("category", "original_category", "promotion_type"))
+
+# promotion_type 문자열 → 정수 코드 (가격 이력/스냅샷에 저장되는 값이므로 바꾸지 말고 뒤에만 추가)
+PROMO_CODES = {"일반": 0, "1+1": 1, "2+1": 2, "할인": 3}
+PROMO_OTHER = 99   # 목록에 없는 행사 문자열
+PROMO_NAMES = {code: name for name, code in PROMO_CODES.items()}
+
+# stable_id 범위: 사이트 ID(최대 18자리 숫자)와 겹치지 않도록 [10^18, 2^63)
+STABLE_ID_MIN = 10 ** 18
+STABLE_ID_MAX = 2 ** 63 - 1
+
+_SPACES = re.compile(r"\s+")
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _normalize(text):
+    return _SPACES.sub(" ", unicodedata.normalize("NFKC", text or "")).strip().casefold()
+
+
+def stable_id(*parts):
+    """
+    사이트가 ID를 주지 않는 상품용 결정적 external_id.
+    정규화(NFKC, 공백 정리, 대소문자 무시)한 parts의 blake2b 해시를 63비트 양수로 만들어
+    실행이 바뀌어도 같은 상품이면 같은 값 → on_conflict Upsert로 합쳐집니다.
+    """
+    raw = "\x1f".join(_normalize(p) for p in parts).encode("utf-8")
+    h = int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "big")
+    return STABLE_ID_MIN + h % (STABLE_ID_MAX - STABLE_ID_MIN + 1)
+
+
+def promo_code(promotion_type):
+    return PROMO_CODES.get(promotion_type or "일반", PROMO_OTHER)
+
+
+def promo_name(code):
+    return PROMO_NAMES.get(code, "기타")
+
+
+class Product:
+    """
+    파서가 만드는 상품 한 건. dict 대신 __slots__라 항목당 메모리와 할당이 적고,
+    카테고리/원본 카테고리/행사 문자열은 intern해서 같은 객체를 공유합니다.
+    - source_url은 저장 직전 to_row()에서 brand_id로 만듭니다.
+    - p['title'], p.get('external_id')처럼 dict 방식으로도 읽고 쓸 수 있어서
+      캐시에서 읽은 dict 행과 같은 코드(분류/중복 제거/변경 감지)로 다룹니다.
+    """
+
+    __slots__ = ("brand_id", "external_id", "title", "price", "image_url", "category",
+                 "original_category", "promotion_type", "is_new", "is_active")
+
+    def __init__(self, brand_id, external_id, title, price=0, image_url="", category="기타",
+                 original_category=None, promotion_type="일반", is_new=False, is_active=True):
+        self.brand_id = brand_id
+        self.external_id = external_id
+        self.title = title
+        self.price = price
+        self.image_url = image_url
+        self.category = _intern(category)
+        self.original_category = _intern(original_category)
+        self.promotion_type = _intern(promotion_type)
+        self.is_new = is_new
+        self.is_active = is_active
+
+    @property
+    def source_url(self):
+        return SOURCE_URLS[self.brand_id].format(self.external_id)
+
+    @classmethod
+    def from_row(cls, row):
+        """DB/캐시의 dict 행 → Product (source_url 등 스키마 밖 필드는 버림)"""
+        return cls(row["brand_id"], row.get("external_id"), row.get("title"), row.get("price", 0),
+                   row.get("image_url", ""), row.get("category", "기타"), row.get("original_category"),
+                   row.get("promotion_type", "일반"), row.get("is_new", False), row.get("is_active", True))
+
+    def to_row(self):
+        """Upsert payload dict (바뀐 행만 writer로 갈 때 한 번 만듭니다)"""
+        return {f: getattr(self, f) for f in ROW_FIELDS}
+
+    # --- dict 호환 ---
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, _intern(value) if key in INTERNED_FIELDS else value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __eq__(self, other):
+        if not isinstance(other, Product):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Product({self.brand_id}, {self.external_id!r}, {self.title!r}, {self.price}, {self.promotion_type!r})"
+
+
+def to_row(p):
+    """Product면 payload dict로, 이미 dict 행이면 그대로"""
+    return p.to_row() if isinstance(p, Product) else p
+
+
+def to_json(obj):
+    """json.dump(default=...)용 (캐시에 파싱 결과를 저장할 때)"""
+    if isinstance(obj, Product):
+        return obj.to_row()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,183 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from crawler.archive import ARCHIVE_DIR, list_key, open_archive
+from crawler.cu_crawler import fetch_existing_data_map, parse_cu_page, parse_gs25_results
+from crawler.pipeline import ProductPipeline
+from crawler.product import BRAND_SEVEN
+from crawler.seven_crawler import SEVEN_PROMO_LISTS, FreshPromotions, parse_seven_page
+from crawler.storage import open_client
+from crawler.writer import BulkWriter
+
+# ==========================================
+# ♻️ 보관된 원본 페이지 재처리 (재크롤링 없이 파서/분류기 변경 반영)
+# ==========================================
+# 브랜드별: 저장된 args로 크롤러와 같은 파서를 호출
+PAGE_PARSERS = {
+    "cu": lambda text, args: parse_cu_page(text, args["raw_cat"]),
+    "gs25": lambda text, args: parse_gs25_results(text, args["p_type"]),
+    "seven": lambda text, args: parse_seven_page(text, args.get("fixed_category")),
+}
+
+# 크롤러와 같은 수동 수정본 보존 규칙
+KEEP_MANUAL = {"cu": True, "gs25": True, "seven": True}
+LABELS = {"cu": "CU", "gs25": "GS25", "seven": "7-Eleven"}
+
+
+def parse_saved_page(item):
+    """
+    프로세스 풀 작업 단위: (아카이브 디렉터리, 인덱스 항목) → (brand, 상품 리스트).
+    각 프로세스가 아카이브를 한 번 열어 mmap으로 프레임만 읽습니다. 읽을 수 없으면 (None, [])
+    빈 페이지(목록 끝)면 (brand, None)
+    """
+    directory, entry = item
+    try:
+        page = open_archive(directory).load(entry)
+    except Exception as e:
+        print(f"⚠️ 원본 페이지 읽기 실패 ({entry.get('brand')} {entry.get('args')}): {e}")
+        return None, []
+    brand, args = page.get("brand"), page.get("args") or {}
+    parse = PAGE_PARSERS.get(brand)
+    if parse is None:
+        return None, []
+    products = parse(page["text"], args)
+    if not products:
+        return brand, None
+    if args.get("promotion_type"):
+        for p in products:
+            p['promotion_type'] = args["promotion_type"]
+    return brand, products
+
+
+def classifier_source(ref):
+    """이전 분류기 소스: classifier.py 파일 경로 또는 git 리비전 (그 시점의 crawler/classifier.py)"""
+    if os.path.isfile(ref):
+        with open(ref, encoding="utf-8") as f:
+            return f.read()
+    out = subprocess.run(["git", "show", f"{ref}:crawler/classifier.py"], capture_output=True, text=True)
+    if out.returncode != 0:
+        raise ValueError(f"분류기 소스를 찾을 수 없습니다: {ref} ({out.stderr.strip()})")
+    return out.stdout
+
+
+def previous_categorizer(source):
+    """
+    이전 classifier.py 소스로 상품마다 그때 자동 분류됐을 카테고리를 돌려주는 함수를 만듭니다.
+    크롤러와 같은 규칙: CU/GS25는 CU 분류기(원본 카테고리 우선), 7-Eleven은 고정 카테고리 또는 세븐 분류기
+    """
+    namespace = {"__name__": "crawler.previous_classifier"}
+    exec(compile(source, "previous_classifier.py", "exec"), namespace)
+    cu, seven = namespace["CU_CLASSIFIER"], namespace["SEVEN_CLASSIFIER"]
+
+    def categorize(p):
+        if p['brand_id'] == BRAND_SEVEN:
+            return p.get('original_category') or seven.classify(p['title'], None)
+        return cu.classify(p['title'], p.get('original_category'))
+    return categorize
+
+
+def reprocess(supabase, existing_map, directory, entries, workers=None, reclassify=None, chunksize=8):
+    """
+    아카이브 항목(entries)을 프로세스 풀에서 파싱/분류하고, 브랜드별 ProductPipeline으로 바뀐 행만 씁니다.
+    인덱스 항목만 넘기고 각 프로세스가 직접 읽으므로 프로세스 간에는 파싱된 상품만 오갑니다.
+    entries는 목록마다 페이지 순서여야 하며 (PageArchive.pages), 크롤러처럼 목록의 첫 빈 페이지에서 멈춥니다.
+    (미리 요청해 저장된 그 뒤 페이지는 버림)
+    목록에 실행이 다른 페이지가 섞여 있으면 상품마다 더 최근 응답의 값만 씁니다. (옛 페이지의 가격이 최신 값을 덮지 않게)
+    7-Eleven 프레시푸드 목록은 크롤러처럼 행사 탭 다음에 돌려 FreshPromotions 규칙으로 행사를 정합니다.
+    reclassify: 이전 분류기 카테고리 함수 (previous_categorizer). DB 카테고리가 그 값과 같은 상품만 새로 분류합니다.
+    반환: {brand: {"pages", "items", "stats", "written"}}
+    """
+    pipelines, result, ended, seen_at = {}, {}, set(), {}
+    promotions, promo_ended = FreshPromotions(existing_map), set()
+    fresh_list = lambda e: e["brand"] == "seven" and not e["args"].get("promotion_type")
+    entries = sorted(entries, key=fresh_list)   # 안정 정렬: 목록/페이지 순서는 그대로
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            items = ((directory, e) for e in entries)
+            for entry, (brand, products) in zip(entries, pool.map(parse_saved_page, items, chunksize=chunksize)):
+                if brand is None:
+                    continue
+                key = list_key(entry["brand"], entry["args"])
+                if key in ended:
+                    continue
+                if products is None:
+                    ended.add(key)
+                    if brand == "seven" and not fresh_list(entry): promo_ended.add(entry["args"].get("list"))
+                    continue
+                if brand == "seven":
+                    if not fresh_list(entry):
+                        promotions.record(products)
+                    else:
+                        promotions.complete = promo_ended >= {l["id"] for l in SEVEN_PROMO_LISTS}
+                        promotions.apply(products)
+                pipeline = pipelines.get(brand)
+                if pipeline is None:
+                    writer = BulkWriter(supabase, label=f"{LABELS[brand]} 재처리", brand=brand)
+                    pipeline = pipelines[brand] = ProductPipeline(
+                        writer, existing_map, keep_manual=KEEP_MANUAL[brand], reclassify=reclassify).__enter__()
+                    result[brand] = {"pages": 0, "items": 0}
+                result[brand]["pages"] += 1
+                result[brand]["items"] += len(products)
+                fresh = []
+                for p in products:
+                    k = (p.get('brand_id'), p.get('external_id'))
+                    if seen_at.get(k, 0) > entry["at"]: continue   # 더 최근 페이지에서 이미 본 상품
+                    seen_at[k] = entry["at"]
+                    fresh.append(p)
+                pipeline.feed(fresh)
+    finally:
+        for brand, pipeline in pipelines.items():
+            pipeline.close()
+            result[brand]["stats"] = dict(pipeline.stats)
+            result[brand]["written"] = pipeline.write_stats["written"] if pipeline.write_stats else 0
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="보관된 원본 목록 페이지를 다시 파싱/분류해 DB에 반영")
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help="원본 페이지 아카이브 (기본: CRAWLER_ARCHIVE_DIR)")
+    parser.add_argument("--brands", default="cu,gs25,seven", help="재처리할 브랜드 (쉼표 구분)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="파싱 프로세스 수")
+    parser.add_argument("--reclassify", metavar="REF",
+                        help="지금 DB 카테고리를 만든 분류기 (git 리비전 또는 classifier.py 경로). "
+                             "제목/카테고리를 수동으로 고치지 않은 상품만 새 분류기의 카테고리로 갱신")
+    args = parser.parse_args(argv)
+
+    if not args.archive or not os.path.isdir(args.archive):
+        print(f"❌ 원본 페이지 아카이브가 없습니다: {args.archive or '(CRAWLER_ARCHIVE_DIR 미설정)'}")
+        return 1
+    supabase = open_client()
+    if supabase is None:
+        print("❌ 설정 오류: 환경변수가 없습니다.")
+        return 1
+
+    reclassify = None
+    if args.reclassify:
+        try:
+            reclassify = previous_categorizer(classifier_source(args.reclassify))
+        except Exception as e:
+            print(f"❌ 이전 분류기를 불러오지 못했습니다: {e}")
+            return 1
+
+    brands = [b.strip() for b in args.brands.split(",") if b.strip()]
+    entries = open_archive(args.archive).pages(brands)   # 목록마다 마지막 실행의 페이지만
+    print(f"♻️ 원본 페이지 {len(entries)}개 재처리 (프로세스 {args.workers}개)")
+    existing_map = fetch_existing_data_map(supabase)
+
+    started = time.perf_counter()
+    result = reprocess(supabase, existing_map, args.archive, entries, args.workers, reclassify)
+    seconds = time.perf_counter() - started
+    for brand, r in result.items():
+        s = r["stats"]
+        print(f" 💾 {LABELS[brand]} 페이지 {r['pages']}개 / 상품 {r['items']}개 → "
+              f"신규 {s['inserted']} / 변경 {s['updated']} / 동일 {s['unchanged']} / 저장 {r['written']}")
+    print(f"✅ 재처리 완료 {seconds:.1f}s ({len(entries) / seconds if seconds else 0:.0f} pages/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from crawler.cu_crawler import extract_gs25_token, parse_cu_page, parse_gs25_results
+from crawler.seven_crawler import parse_seven_page
+
+# ==========================================
+# 🩺 셀렉터 상태 점검 (브라우저 없이 저장된 응답으로 실제 파서 실행)
+# ==========================================
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+
+
+class SelectorDrift(Exception):
+    """저장된 응답에서 셀렉터/파서 결과가 기대와 달라졌을 때"""
+
+
+def _count_matches(selector, text):
+    """원본 응답에서 셀렉터 매칭 개수. 'results[]' 형태는 JSON 배열 필드 길이."""
+    if selector.endswith("[]"):
+        return len(json.loads(text).get(selector[:-2], []))
+    return len(BeautifulSoup(text, "html.parser").select(selector))
+
+def _token_items(text):
+    return [{"title": "CSRFToken", "external_id": 1}] if extract_gs25_token(text) else []
+
+# - selector: 목록 항목을 찾는 셀렉터 (원본 응답에 대해 매칭 개수를 셈)
+# - parse: 실제 크롤러 파서 (항목 리스트, 빈 페이지면 None 또는 [])
+# - min_items: 파싱 결과 최소 개수 (0이면 빈 페이지여야 함)
+CHECKS = [
+    {"brand": "CU", "fixture": "cu_productAjax_p1.html", "selector": "li.prod_list",
+     "parse": lambda t: parse_cu_page(t, "간편식사"), "min_items": 1},
+    {"brand": "CU", "fixture": "cu_productAjax_empty.html", "selector": "li.prod_list",
+     "parse": lambda t: parse_cu_page(t, "간편식사"), "min_items": 0},
+    {"brand": "GS25", "fixture": "gs25_event_goods.html", "selector": "input[name=CSRFToken]",
+     "parse": _token_items, "min_items": 1},
+    {"brand": "GS25", "fixture": "gs25_event_goods_search_p1.json", "selector": "results[]",
+     "parse": lambda t: parse_gs25_results(t, "ONE_TO_ONE"), "min_items": 1},
+    {"brand": "GS25", "fixture": "gs25_event_goods_search_empty.json", "selector": "results[]",
+     "parse": lambda t: parse_gs25_results(t, "ONE_TO_ONE"), "min_items": 0},
+    {"brand": "7-Eleven", "fixture": "seven_listMoreAjax_tab1_p1.html", "selector": "li div.tit_product",
+     "parse": lambda t: parse_seven_page(t, None), "min_items": 1},
+    {"brand": "7-Eleven", "fixture": "seven_dosirakNewMoreAjax_p1.html", "selector": "li div.tit_product",
+     "parse": lambda t: parse_seven_page(t, "간편식사"), "min_items": 1},
+    {"brand": "7-Eleven", "fixture": "seven_listMoreAjax_empty.html", "selector": "li div.tit_product",
+     "parse": lambda t: parse_seven_page(t, None), "min_items": 0},
+]
+
+
+def run_check(check, fixtures_dir=FIXTURES_DIR, repeat=20):
+    """
+    체크 하나를 실행해 결과 dict를 반환하고, 기대와 다르면 SelectorDrift를 던집니다.
+    parse_ms는 repeat회 평균 파싱 시간입니다.
+    """
+    with open(os.path.join(fixtures_dir, check["fixture"]), encoding="utf-8") as f:
+        text = f.read()
+
+    matched = _count_matches(check["selector"], text)
+    # 파서의 항목별 에러 로그는 반복 측정 중에는 숨김
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            items = check["parse"](text)
+        parse_ms = (time.perf_counter() - started) * 1000 / repeat
+    items = items or []
+
+    result = {
+        "brand": check["brand"],
+        "fixture": check["fixture"],
+        "selector": check["selector"],
+        "matched": matched,
+        "items": len(items),
+        "parse_ms": round(parse_ms, 3),
+    }
+    if check["min_items"] == 0:
+        if items:
+            raise SelectorDrift(f"{check['fixture']}: 빈 페이지여야 하는데 {len(items)}개 파싱됨")
+    else:
+        if matched == 0:
+            raise SelectorDrift(f"{check['fixture']}: 셀렉터 '{check['selector']}' 매칭 0개")
+        if len(items) < check["min_items"]:
+            raise SelectorDrift(f"{check['fixture']}: 파싱 결과 {len(items)}개 (최소 {check['min_items']}개)")
+        broken = [p for p in items if not p.get("title") or not p.get("external_id")]
+        if broken:
+            raise SelectorDrift(f"{check['fixture']}: 제목/ID가 비어 있는 항목 {len(broken)}개")
+    return result
+
+
+def run_checks(checks=CHECKS, fixtures_dir=FIXTURES_DIR, repeat=20):
+    """모든 체크를 순서대로 실행합니다. 첫 실패에서 바로 SelectorDrift."""
+    return [run_check(c, fixtures_dir, repeat) for c in checks]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="저장된 응답으로 셀렉터/파서 상태 점검")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="응답 fixture 디렉터리")
+    parser.add_argument("--repeat", type=int, default=20, help="파싱 시간 측정 반복 횟수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    results = []
+    try:
+        for check in CHECKS:
+            results.append(run_check(check, args.fixtures, args.repeat))
+    except SelectorDrift as e:
+        print(f"❌ 구조 변경 감지: {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for r in results:
+            print(f"✅ {r['brand']:<9} {r['fixture']:<38} {r['selector']:<24} "
+                  f"매칭 {r['matched']:>3} / 파싱 {r['items']:>3}개 / {r['parse_ms']:.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
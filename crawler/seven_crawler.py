@@ -0,0 +1,228 @@
+import os
+import re
+import urllib3
+
+from crawler.archive import default_archive, response_saver
+from crawler.classifier import SEVEN_CLASSIFIER
+from crawler.fetcher import FetchEngine, create_session
+from crawler.history import default_history
+from crawler.http_cache import default_cache, fetch_parsed
+from crawler.incremental import QuietPages
+from crawler.metrics import METRICS
+from crawler.pipeline import ProductPipeline
+from crawler.product import BRAND_SEVEN, Product, promo_name
+from crawler.sweep import deactivate_missing
+from crawler.writer import BulkWriter
+
+try:
+    from crawler import lxml_parser
+except ImportError:  # lxml 미설치 시 BeautifulSoup 경로만 사용
+    lxml_parser = None
+
+# HTML 파서: lxml(기본, 고속) / bs4(기존 BeautifulSoup 경로)
+HTML_BACKEND = os.environ.get("CRAWLER_HTML_BACKEND", "lxml")
+
+# SSL 경고 무시 (세븐일레븐 구형 서버 호환성)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+SEVEN_BASE_URL = "https://www.7-eleven.co.kr"
+
+# 세븐일레븐은 헤더가 매우 중요함
+SEVEN_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    "Origin": "https://www.7-eleven.co.kr",
+    "Accept": "*/*",
+    "X-Requested-With": "XMLHttpRequest"
+}
+
+# --- 카테고리 분류기 (기존 로직 유지, crawler/classifier.py의 SEVEN_RULES) ---
+def get_standard_category(title, raw_category=None):
+    return SEVEN_CLASSIFIER.classify(title, raw_category)
+
+# --- 세븐일레븐 파싱 함수 ---
+def parse_seven_eleven(item, fixed_category=None):
+    try:
+        name_tag = item.find("div", class_="tit_product")
+        if not name_tag: return METRICS.drop("seven", "no_title")
+        title = name_tag.get_text(strip=True)
+
+        price_tag = item.find("div", class_="price")
+        price = 0
+        if price_tag:
+            span = price_tag.find("span")
+            if span:
+                price = int(span.get_text(strip=True).replace(",", ""))
+
+        img_tag = item.find("div", class_="pic_product").find("img")
+        img_src = ""
+        if img_tag:
+            img_src = img_tag.get("src")
+            if img_src and not img_src.startswith("http"):
+                img_src = "https://www.7-eleven.co.kr" + img_src
+
+        promo = "일반"
+        tag_list = item.find("ul", class_="tag_list_01")
+        if tag_list:
+            for tag in tag_list.find_all("li"):
+                text = tag.get_text(strip=True)
+                if "1+1" in text: promo = "1+1"
+                elif "2+1" in text: promo = "2+1"
+                elif "신상품" in text: promo = "NEW"
+
+        gdIdx = None
+        link = item.find("a", href=True)
+        if link:
+            m = re.search(r"fncGoView\('(\d+)'\)", link['href'])
+            if m: gdIdx = int(m.group(1))
+        
+        if not gdIdx: return METRICS.drop("seven", "no_id")
+
+        category = fixed_category if fixed_category else METRICS.timed("seven", "classify", get_standard_category, title, None)
+        return Product(BRAND_SEVEN, gdIdx, title, price, img_src, category, fixed_category, promo, promo == "NEW")
+    except Exception as e:
+        print(f"   ⚠️ 파싱 에러: {e}")
+        return METRICS.drop("seven", "error")
+
+def parse_seven_page(html, fixed_category=None, backend=None):
+    """
+    AJAX 목록 응답 한 페이지 → Product 리스트. li가 하나도 없으면 None.
+    '데이터가 없습니다' 항목을 만나면 거기서 멈춥니다.
+    """
+    if (backend or HTML_BACKEND) == "lxml" and lxml_parser:
+        return lxml_parser.parse_seven_page(html, fixed_category)
+    from bs4 import BeautifulSoup   # bs4 경로에서만 로드 (시작 시간)
+    items = BeautifulSoup(html, "html.parser").find_all("li")
+    if not items: return None
+    products = []
+    for item in items:
+        if "데이터가 없습니다" in item.get_text(): break
+        p = parse_seven_eleven(item, fixed_category)
+        if p: products.append(p)
+    return products
+
+# --- 크롤링 메인 로직 ---
+# 한 번에 받는 상품 수 (기존 디버그 모드는 10개씩 2페이지)
+SEVEN_PAGE_SIZE = 50
+# '데이터가 없습니다'가 안 나오는 이상 응답 대비 안전 상한
+SEVEN_MAX_PAGES = 200
+SEVEN_NO_DATA = "데이터가 없습니다"
+
+# 행사 탭 (presentList.asp, 3번 덤증정 탭은 main에서 지우는 대상이라 제외)
+SEVEN_PROMO_LISTS = [
+    {"id": f"tab{tab}", "path": "/product/listMoreAjax.asp", "referer": "/product/presentList.asp",
+     "form": {"pTab": tab}, "promotion_type": promo}
+    for tab, promo in ((1, "1+1"), (2, "2+1"), (4, "할인"))
+]
+# 프레시푸드 목록 (카테고리 고정)
+SEVEN_FRESH_LISTS = [
+    {"id": "dosirak", "path": "/product/dosirakNewMoreAjax.asp", "referer": "/product/bestdosirakList.asp",
+     "form": {}, "fixed_category": "간편식사"},
+]
+
+class FreshPromotions:
+    """
+    프레시푸드 목록 상품의 행사를 정합니다. (crawl_seven과 재처리 crawler/reprocess.py가 같이 씀)
+    - 행사 탭에서 본 상품(record)이면 그 행사
+    - 행사 탭을 모두 1페이지부터 끝까지 봤으면(complete) 목록에 표시된 그대로
+    - 아니면 (증분 중단/체크포인트 재개) existing_map에 저장된 행사 탭 행사를 유지 → 실행마다 '일반'으로 뒤집히지 않게
+    """
+    PROMO_TYPES = frozenset(l["promotion_type"] for l in SEVEN_PROMO_LISTS)
+
+    def __init__(self, existing_map):
+        self.existing_map = existing_map or {}
+        self.seen = {}   # 행사 탭에서 본 external_id → 행사
+        self.complete = False
+
+    def record(self, products):
+        self.seen.update((p['external_id'], p['promotion_type']) for p in products)
+
+    def promotion_for(self, p):
+        if p['external_id'] in self.seen: return self.seen[p['external_id']]
+        if self.complete: return p['promotion_type']
+        known = self.existing_map.get((BRAND_SEVEN, p['external_id']))
+        name = promo_name(known['promo']) if known and known.get('promo') is not None else None
+        return name if name in self.PROMO_TYPES else p['promotion_type']
+
+    def apply(self, products):
+        for p in products:
+            p['promotion_type'] = self.promotion_for(p)
+
+
+def crawl_seven(supabase, existing_map, engine=None, cache=None, base_url=SEVEN_BASE_URL, checkpoint=None,
+                schedule=None, archive=None):
+    print("\n🚀 7-Eleven 크롤링 시작 (수동 수정본 보존 모드)...")
+    engine = engine or FetchEngine(create_session(SEVEN_HEADERS), max_workers=4, per_host=2, name="seven")
+    if cache is None: cache = default_cache()
+    if archive is None: archive = default_archive()
+
+    def fetch_page(job, page):
+        def parse(r):
+            r.raise_for_status()
+            with METRICS.timer("seven", "parse"):
+                products = parse_seven_page(r.text, job.get("fixed_category"))
+            # li가 없거나 '데이터가 없습니다'만 있으면 목록 끝
+            if not products and (products is None or SEVEN_NO_DATA in r.text): return None
+            METRICS.incr("seven", "parse.items", len(products))
+            if job.get("promotion_type"):
+                for p in products:
+                    p['promotion_type'] = job["promotion_type"]
+            return products
+
+        return fetch_parsed(engine, cache, "POST", base_url + job["path"], parse,
+                            data={"intPageSize": SEVEN_PAGE_SIZE, "intCurrPage": page, **job["form"]},
+                            headers={"Referer": base_url + job["referer"]}, timeout=15, verify=False,
+                            on_response=response_saver(archive, "seven", {
+                                "list": job["id"], "fixed_category": job.get("fixed_category"),
+                                "promotion_type": job.get("promotion_type"), "page": page}))
+
+    quiet = schedule.quiet_pages("seven") if schedule else QuietPages()
+    if schedule: print(f"⏩ 7-Eleven {schedule.describe('seven')}")
+    counts = {}
+    promotions = FreshPromotions(existing_map)
+
+    def crawl_lists(lists, pipeline):
+        # 📍 체크포인트: 끝난 목록은 건너뛰고, 나머지는 저장까지 끝난 다음 페이지부터
+        jobs = [l for l in lists if not (checkpoint and checkpoint.job_done("seven", l["id"]))]
+        start_pages = [checkpoint.start_page("seven", l["id"]) for l in jobs] if checkpoint else None
+        outcome = []
+        for job, page, products in engine.crawl_pages(jobs, fetch_page, max_pages=SEVEN_MAX_PAGES, prefetch=2,
+                                                      outcome=outcome, start_pages=start_pages,
+                                                      stop=lambda job: quiet.stopped(job["id"])):
+            if job.get("promotion_type"):
+                promotions.record(products)
+            else:
+                promotions.apply(products)
+            counts[job["id"]] = counts.get(job["id"], 0) + len(products)
+            quiet.page(job["id"], pipeline.feed(products))
+            if checkpoint: pipeline.mark(checkpoint.page_marker("seven", job["id"], page))
+        if checkpoint:
+            for job, o in zip(jobs, outcome):
+                if o in ("end", "stopped"): pipeline.mark(checkpoint.job_marker("seven", job["id"], o))
+        complete = len(jobs) == len(lists) and all(o == "end" for o in outcome) \
+            and not any(s > 1 for s in start_pages or [])
+        return outcome, complete
+
+    # 행사 탭들을 먼저 병렬로, 그다음 프레시푸드 목록 (같은 상품이 양쪽에 있으면 행사 정보가 남도록)
+    with ProductPipeline(BulkWriter(supabase, label="7-Eleven", brand="seven"), existing_map,
+                         history=default_history(supabase, "7-Eleven", "seven")) as pipeline:
+        outcome, promotions.complete = crawl_lists(SEVEN_PROMO_LISTS, pipeline)
+        outcome += crawl_lists(SEVEN_FRESH_LISTS, pipeline)[0]
+        print(" 📦 7-Eleven " + ", ".join(f"{name} {n}개" for name, n in counts.items()))
+        print(f" 💾 7-Eleven {pipeline.summary()} → {pipeline.queued}개 Upsert")
+
+    if cache: print(f" 🗃️ 7-Eleven {cache.summary()}")
+
+    # 🧹 모든 목록을 끝까지 본 경우에만 사라진 상품 비활성화
+    complete = all(o == "end" for o in outcome)
+    done = all(o in ("end", "stopped") for o in outcome)
+    if checkpoint and checkpoint.resumed("seven"):
+        print(" ⏭️ 7-Eleven 체크포인트에서 이어받은 실행 → 비활성화 생략")
+    elif complete:
+        deactivate_missing(supabase, BRAND_SEVEN, pipeline.seen_ids(BRAND_SEVEN), existing_map, label="7-Eleven")
+        if schedule and not pipeline.write_stats["failed"]: schedule.record("seven")
+    elif done:
+        print(" ⏭️ 7-Eleven 증분 실행 → 비활성화는 전체 순회에서만")
+    else:
+        print(f" ⏭️ 7-Eleven 일부 목록 미완료 {outcome} → 비활성화 생략")
+    if checkpoint and done and not pipeline.write_stats["failed"]:
+        checkpoint.finish("seven")
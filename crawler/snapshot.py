@@ -0,0 +1,161 @@
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+from crawler.diffing import HASH_FIELDS, content_hash
+from crawler.product import promo_code
+
+# ==========================================
+# 🗂️ 기존 데이터 로컬 스냅샷 (SQLite + updated_at 워터마크)
+# ==========================================
+SNAPSHOT_PATH = os.environ.get("CRAWLER_SNAPSHOT_PATH", ".cache/existing_snapshot.sqlite3")
+
+# 스키마가 바뀌면 버전을 올린다 → 기존 스냅샷은 버리고 전체 재로딩
+SCHEMA_VERSION = 4
+
+# 워터마크로는 DB에서 삭제된 행을 알 수 없으므로 주기적으로 전체 재로딩
+FULL_REFRESH_SECONDS = 7 * 24 * 3600
+
+# 쓰기에 updated_at을 넣을지. Supabase에는 수정 시각을 찍는 트리거가 없으므로 쓰는 쪽이 직접 넣어야
+# 워터마크 증분 조회에 잡히지만, 컬럼이 없는 테이블에 넣으면 모든 쓰기가 실패함
+# → fetch_existing_data_map이 updated_at 조회에 성공해 컬럼이 있다고 확인한 뒤에만 켭니다.
+_stamp_writes = False
+
+
+def stamp_now():
+    """updated_at 값 (UTC ISO)"""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def stamp_fields():
+    """new_products 쓰기 payload에 더할 {"updated_at": 지금}. 컬럼이 확인되지 않았으면 빈 dict"""
+    return {"updated_at": stamp_now()} if _stamp_writes else {}
+
+
+def set_stamp_writes(enabled):
+    global _stamp_writes
+    _stamp_writes = bool(enabled)
+
+
+# updated_at은 항상 마지막 (없는 테이블에서는 잘라서 조회)
+SNAPSHOT_COLUMNS = ["brand_id", "external_id", "title", "category", *HASH_FIELDS, "updated_at"]
+
+
+class ExistingSnapshot:
+    """
+    (brand_id, external_id) → {'title', 'category', 'hash', 'is_active', 'price', 'promo'} 맵을 로컬 SQLite 파일로 보관합니다.
+    hash는 변경 감지용 content_hash (crawler/diffing.py), price/promo는 가격 이력(crawler/history.py)의 직전 상태입니다.
+    - watermark: 마지막으로 반영한 행의 최대 updated_at
+    - last_full: 마지막 전체 재로딩 시각 (epoch 초)
+    """
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        if self._meta("schema_version") != str(SCHEMA_VERSION):
+            self.reset()
+
+    def _meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def reset(self):
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS products")
+            self.conn.execute("""
+                CREATE TABLE products (
+                    brand_id INTEGER NOT NULL,
+                    external_id INTEGER NOT NULL,
+                    title TEXT,
+                    category TEXT,
+                    hash INTEGER,
+                    is_active INTEGER,
+                    price INTEGER,
+                    promo INTEGER,
+                    updated_at TEXT,
+                    PRIMARY KEY (brand_id, external_id)
+                ) WITHOUT ROWID
+            """)
+            self.conn.execute("DELETE FROM meta")
+            self._set_meta("schema_version", str(SCHEMA_VERSION))
+
+    @property
+    def watermark(self):
+        return self._meta("watermark")
+
+    @property
+    def needs_full_refresh(self):
+        last_full = self._meta("last_full")
+        return last_full is None or time.time() - float(last_full) > FULL_REFRESH_SECONDS
+
+    def apply(self, rows):
+        """가져온 행들을 반영하고 워터마크를 전진시킵니다."""
+        if not rows:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO products "
+                "(brand_id, external_id, title, category, hash, is_active, price, promo, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(r['brand_id'], r['external_id'], r['title'], r['category'], content_hash(r),
+                  r.get('is_active'), r.get('price') or 0, promo_code(r.get('promotion_type')), r.get('updated_at'))
+                 for r in rows],
+            )
+            stamps = [r['updated_at'] for r in rows if r.get('updated_at')]
+            if stamps:
+                newest = max(stamps)
+                if self.watermark is None or newest > self.watermark:
+                    self._set_meta("watermark", newest)
+
+    def discard(self, keys):
+        """DB에서 지운 (brand_id, external_id) 행을 스냅샷에서도 지웁니다. (워터마크로는 삭제를 알 수 없음)"""
+        with self.conn:
+            self.conn.executemany("DELETE FROM products WHERE brand_id = ? AND external_id = ?", list(keys))
+
+    def mark_full_refresh(self):
+        with self.conn:
+            self._set_meta("last_full", str(time.time()))
+
+    def load_map(self):
+        return {
+            (brand_id, external_id): {'title': title, 'category': category, 'hash': h, 'is_active': bool(active),
+                                      'price': price, 'promo': promo}
+            for brand_id, external_id, title, category, h, active, price, promo in self.conn.execute(
+                "SELECT brand_id, external_id, title, category, hash, is_active, price, promo FROM products"
+            )
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+def fetch_rows(supabase, since=None, batch_size=1000, columns=SNAPSHOT_COLUMNS):
+    """
+    new_products를 batch_size씩 가져옵니다. since가 있으면 updated_at >= since 인 행만.
+    (같은 시각에 찍힌 행을 놓치지 않도록 gte로 가져오고, 반영은 멱등)
+    columns에 updated_at이 없으면 필터 없이 전체를 (brand_id, external_id) 순서로 가져옵니다.
+    offset 페이지는 순서가 고정돼야 겹치거나 빠지지 않으므로 항상 키로 정렬합니다.
+    (updated_at은 같은 배치가 같은 시각이라 그것만으로는 부족)
+    """
+    start = 0
+    while True:
+        query = supabase.table("new_products").select(", ".join(columns))
+        if "updated_at" in columns:
+            if since:
+                query = query.gte("updated_at", since)
+            query = query.order("updated_at")
+        query = query.order("brand_id").order("external_id")
+        rows = query.range(start, start + batch_size - 1).execute().data
+        if not rows:
+            break
+        yield rows
+        if len(rows) < batch_size:
+            break
+        start += batch_size
@@ -0,0 +1,361 @@
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from crawler.product import ROW_FIELDS
+
+# ==========================================
+# 🔌 저장소 백엔드 (Supabase 또는 로컬 SQLite)
+# ==========================================
+# 경로가 있으면 Supabase 대신 로컬 SQLite 파일에 씁니다. (개발/테스트/오프라인 크롤링/분석용)
+LOCAL_DB = os.environ.get("CRAWLER_DB", "")
+
+# 테이블별 컬럼 타입과 기본 충돌 키 (Supabase 테이블과 같은 이름/의미)
+# bool 컬럼은 SQLite에 0/1로 저장하고 읽을 때 다시 bool로 (content_hash가 Supabase 응답과 같도록)
+TABLES = {
+    "new_products": {
+        "columns": {
+            "title": "TEXT", "price": "INTEGER", "image_url": "TEXT", "category": "TEXT",
+            "original_category": "TEXT", "promotion_type": "TEXT", "brand_id": "INTEGER", "source_url": "TEXT",
+            "is_active": "BOOL", "external_id": "INTEGER", "is_new": "BOOL", "updated_at": "TEXT",
+        },
+        "key": ("brand_id", "external_id"),
+        "stamp": "updated_at",
+    },
+    "price_history": {
+        "columns": {"id": "INTEGER", "brand_id": "INTEGER", "external_id": "INTEGER", "price": "INTEGER",
+                    "promo": "INTEGER", "changed_at": "TEXT"},
+        "key": ("id",),
+        "stamp": None,
+    },
+    "product_matches": {
+        "columns": {"a_brand": "INTEGER", "a_id": "INTEGER", "b_brand": "INTEGER", "b_id": "INTEGER", "score": "REAL"},
+        "key": ("a_brand", "a_id", "b_brand", "b_id"),
+        "stamp": None,
+    },
+}
+
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS new_products_updated_idx ON new_products (updated_at)",
+    "CREATE INDEX IF NOT EXISTS price_history_product_idx ON price_history (brand_id, external_id, changed_at)",
+    "CREATE INDEX IF NOT EXISTS product_matches_b_idx ON product_matches (b_brand, b_id)",
+)
+
+# PostgREST or_() 조건: "col.op.value,col.op.value"
+_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "like": "LIKE", "ilike": "LIKE"}
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+class LocalResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class LocalQuery:
+    """supabase 쿼리 빌더(table().select/upsert/update/delete ... execute())를 SQL로 옮깁니다."""
+
+    def __init__(self, client, table):
+        if table not in TABLES:
+            raise ValueError(f"로컬 DB에 없는 테이블: {table}")
+        self.client = client
+        self.table = table
+        self.schema = TABLES[table]
+        self.action = "select"
+        self.columns = "*"
+        self.payload = None
+        self.on_conflict = None
+        self.where = []
+        self.params = []
+        self.order_by = []
+        self.bounds = None
+
+    def _column(self, name):
+        name = name.strip()
+        if name not in self.schema["columns"]:
+            raise ValueError(f"{self.table}에 없는 컬럼: {name}")
+        return name
+
+    # --- 동작 ---
+    def select(self, columns="*"):
+        self.action, self.columns = "select", columns
+        return self
+
+    def insert(self, rows):
+        self.action, self.payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict=""):
+        self.action, self.payload, self.on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def update(self, values):
+        self.action, self.payload = "update", values
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    # --- 조건 ---
+    def _filter(self, column, op, value):
+        column = self._column(column)
+        if op == "ilike":
+            self.where.append(f"LOWER({column}) LIKE LOWER(?)")
+        else:
+            self.where.append(f"{column} {_OPERATORS[op]} ?")
+        self.params.append(value)
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._filter(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "lte", value)
+
+    def like(self, column, pattern):
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column, pattern):
+        return self._filter(column, "ilike", pattern)
+
+    def in_(self, column, values):
+        values = list(values)
+        column = self._column(column)
+        self.where.append(f"{column} IN ({', '.join('?' * len(values))})" if values else "0")
+        self.params.extend(values)
+        return self
+
+    def or_(self, expression):
+        parts, params = [], []
+        for cond in expression.split(","):
+            column, op, value = cond.split(".", 2)
+            column = self._column(column)
+            if op not in _OPERATORS:
+                raise ValueError(f"지원하지 않는 or_ 연산자: {op}")
+            parts.append(f"LOWER({column}) LIKE LOWER(?)" if op == "ilike" else f"{column} {_OPERATORS[op]} ?")
+            params.append(value.replace("*", "%"))
+        self.where.append(f"({' OR '.join(parts)})")
+        self.params.extend(params)
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by.append(f"{self._column(column)} {'DESC' if desc else 'ASC'}")
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def execute(self):
+        return self.client._execute(self)
+
+    # --- SQL ---
+    def _where_sql(self):
+        return f" WHERE {' AND '.join(self.where)}" if self.where else ""
+
+
+class LocalClient:
+    """
+    supabase 클라이언트 대신 쓰는 로컬 SQLite 저장소. 크롤러/BulkWriter/스냅샷이 쓰는 체인을 그대로 지원합니다.
+    - upsert(on_conflict=...)는 INSERT ... ON CONFLICT DO UPDATE (행에 없는 컬럼은 기존 값 유지)
+    - new_products는 쓰기/수정 때마다 updated_at을 찍어서 스냅샷 워터마크 증분 조회가 그대로 동작
+    - 여러 writer 스레드가 연결 하나를 락으로 나눠 씁니다. (WAL)
+    """
+
+    def __init__(self, path=LOCAL_DB):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            for table, schema in TABLES.items():
+                cols = [f"{name} {'INTEGER' if kind == 'BOOL' else kind}" for name, kind in schema["columns"].items()]
+                if schema["key"] == ("id",):
+                    cols[0] = "id INTEGER PRIMARY KEY AUTOINCREMENT"
+                else:
+                    cols.append(f"PRIMARY KEY ({', '.join(schema['key'])})")
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(cols)})")
+            for sql in _INDEXES:
+                self.conn.execute(sql)
+
+    def table(self, name):
+        return LocalQuery(self, name)
+
+    def _decode(self, table, cursor):
+        names = [d[0] for d in cursor.description]
+        kinds = TABLES[table]["columns"]
+        bools = [i for i, n in enumerate(names) if kinds.get(n) == "BOOL"]
+        rows = []
+        for values in cursor:
+            row = dict(zip(names, values))
+            for i in bools:
+                if values[i] is not None: row[names[i]] = bool(values[i])
+            rows.append(row)
+        return rows
+
+    def _write_sql(self, q, columns):
+        schema = q.schema
+        for c in columns: q._column(c)
+        sql = f"INSERT INTO {q.table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        if q.action == "upsert":
+            key = tuple(c.strip() for c in (q.on_conflict or "").split(",") if c.strip()) or schema["key"]
+            updates = [f"{c} = excluded.{c}" for c in columns if c not in key]
+            sql += f" ON CONFLICT ({', '.join(key)}) DO " + (f"UPDATE SET {', '.join(updates)}" if updates else "NOTHING")
+        return sql
+
+    def _write(self, q, rows):
+        stamp = q.schema["stamp"]
+        now = _now()
+        groups = {}   # 컬럼 구성이 같은 행끼리 executemany
+        for row in rows:
+            row = dict(row, **{stamp: now}) if stamp else row
+            groups.setdefault(tuple(row), []).append(row)
+        for columns, group in groups.items():
+            self.conn.executemany(self._write_sql(q, columns), [tuple(r[c] for c in columns) for r in group])
+
+    def _execute(self, q):
+        with self._lock, self.conn:
+            if q.action in ("insert", "upsert"):
+                rows = q.payload if isinstance(q.payload, list) else [q.payload]
+                self._write(q, rows)
+                return LocalResult(rows)
+            if q.action == "update":
+                values = dict(q.payload)
+                if q.schema["stamp"]: values[q.schema["stamp"]] = _now()
+                sets = ", ".join(f"{q._column(c)} = ?" for c in values)
+                self.conn.execute(f"UPDATE {q.table} SET {sets}{q._where_sql()}", [*values.values(), *q.params])
+                return LocalResult([])
+            if q.action == "delete":
+                self.conn.execute(f"DELETE FROM {q.table}{q._where_sql()}", q.params)
+                return LocalResult([])
+            columns = "*" if q.columns.strip() == "*" else ", ".join(q._column(c) for c in q.columns.split(","))
+            sql = f"SELECT {columns} FROM {q.table}{q._where_sql()}"
+            params = list(q.params)
+            if q.order_by: sql += f" ORDER BY {', '.join(q.order_by)}"
+            if q.bounds:
+                sql += " LIMIT ? OFFSET ?"
+                params += [q.bounds[1] - q.bounds[0] + 1, q.bounds[0]]
+            return LocalResult(self._decode(q.table, self.conn.execute(sql, params)))
+
+    # --- 대량 적재 / 분석 ---
+    def bulk_load(self, table, batches, on_conflict=""):
+        """행 리스트(또는 리스트들의 iterable)를 트랜잭션 하나로 Upsert. 적재한 행 수를 반환"""
+        if isinstance(batches, list) and batches and isinstance(batches[0], dict):
+            batches = [batches]
+        q = LocalQuery(self, table).upsert([], on_conflict)
+        count = 0
+        with self._lock, self.conn:
+            for rows in batches:
+                self._write(q, rows)
+                count += len(rows)
+        return count
+
+    def rows(self, table="new_products"):
+        return self.table(table).select("*").execute().data
+
+    def count(self, table="new_products"):
+        table = LocalQuery(self, table).table   # 테이블 이름 검증
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def export_parquet(self, table, path, batch_rows=50_000):
+        """테이블을 Parquet 파일로 (pyarrow 필요). 내보낸 행 수를 반환"""
+        try:
+            import pyarrow   # 내보낼 때만 로드 (무거움)
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet 내보내기에는 pyarrow 패키지가 필요합니다") from None
+        kinds = LocalQuery(self, table).schema["columns"]
+        types = {"INTEGER": pyarrow.int64(), "REAL": pyarrow.float64(), "TEXT": pyarrow.string(), "BOOL": pyarrow.bool_()}
+        schema = pyarrow.schema([(name, types[kind]) for name, kind in kinds.items()])
+        count = 0
+        with self._lock:
+            cursor = self.conn.execute(f"SELECT {', '.join(kinds)} FROM {table}")
+            with pyarrow.parquet.ParquetWriter(path, schema, compression="zstd") as writer:
+                while True:
+                    chunk = cursor.fetchmany(batch_rows)
+                    if not chunk: break
+                    arrays = [pyarrow.array([r[i] if kind != "BOOL" or r[i] is None else bool(r[i]) for r in chunk],
+                                            type=types[kind]) for i, kind in enumerate(kinds.values())]
+                    writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+                    count += len(chunk)
+        return count
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def supabase_client():
+    """SUPABASE_URL/SUPABASE_SERVICE_KEY로 만든 Supabase 클라이언트 (환경변수가 없으면 None)"""
+    url, key = os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_SERVICE_KEY")
+    if not url or not key:
+        return None
+    from supabase import create_client   # 로컬 DB만 쓸 때는 supabase 패키지가 없어도 됨
+    return create_client(url, key)
+
+
+def open_client(db=None):
+    """db(또는 CRAWLER_DB) 경로가 있으면 LocalClient, 없으면 Supabase. 둘 다 없으면 None"""
+    db = db or LOCAL_DB
+    return LocalClient(db) if db else supabase_client()
+
+
+def pull(local, remote, batch_size=1000):
+    """원격(Supabase) new_products 전체를 로컬 DB로 복사 (개발/분석용). 복사한 행 수"""
+    from crawler.snapshot import fetch_rows
+    return local.bulk_load("new_products", fetch_rows(remote, batch_size=batch_size, columns=list(ROW_FIELDS)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 SQLite 저장소 관리 (Supabase 복사 / Parquet 내보내기)")
+    parser.add_argument("--db", default=LOCAL_DB or ".cache/local.sqlite3", help="로컬 DB 경로 (기본: CRAWLER_DB)")
+    parser.add_argument("--pull", action="store_true", help="Supabase new_products를 로컬 DB로 복사")
+    parser.add_argument("--export", help="Parquet 파일로 내보낼 경로")
+    parser.add_argument("--table", default="new_products", choices=sorted(TABLES), help="내보낼 테이블")
+    args = parser.parse_args(argv)
+
+    local = LocalClient(args.db)
+    if args.pull:
+        remote = supabase_client()
+        if remote is None:
+            print("❌ 설정 오류: 환경변수가 없습니다.")
+            return 1
+        started = time.perf_counter()
+        print(f"📥 Supabase → {args.db}: {pull(local, remote)}행 ({time.perf_counter() - started:.1f}s)")
+    if args.export:
+        try:
+            count = local.export_parquet(args.table, args.export)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"📤 {args.table} {count}행 → {args.export}")
+    print(f"🗄️ {args.db}: " + ", ".join(f"{t} {local.count(t)}행" for t in TABLES))
+    local.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+from crawler.snapshot import stamp_fields
+
+# ==========================================
+# 🧹 사라진 상품 비활성화 (is_active = False)
+# ==========================================
+# 한 번의 실행에서 활성 상품의 이 비율 이상이 사라졌다면 크롤링이 깨진 것으로 보고 중단
+MAX_DEACTIVATE_RATIO = 0.3
+
+# external_id IN (...) 한 번에 넣을 개수 (URL 길이 제한 고려)
+DEACTIVATE_CHUNK = 200
+
+
+def find_missing(brand_id, seen_ids, existing_map):
+    """기존 맵에서 활성 상태인데 이번 실행에서 보이지 않은 external_id 집합"""
+    active = {ext for (b, ext), v in existing_map.items() if b == brand_id and v.get('is_active')}
+    return active, active - set(seen_ids)
+
+
+def deactivate_missing(supabase, brand_id, seen_ids, existing_map, label=None, max_ratio=MAX_DEACTIVATE_RATIO):
+    """
+    이번 크롤링에서 보이지 않은 활성 상품을 몇 번의 bulk update로 비활성화합니다.
+    목록 전체를 끝까지 본 실행에서만 호출해야 합니다. 비활성화한 개수를 반환합니다.
+    """
+    label = label or f"brand {brand_id}"
+    active, missing = find_missing(brand_id, seen_ids, existing_map)
+    if not missing:
+        print(f" 🧹 {label} 비활성화 대상 없음")
+        return 0
+    if not seen_ids or len(missing) > len(active) * max_ratio:
+        print(f" 🛑 {label} 활성 {len(active)}개 중 {len(missing)}개가 사라짐 → 안전장치로 비활성화 중단")
+        return 0
+
+    ids = sorted(missing)
+    done = 0
+    try:
+        for i in range(0, len(ids), DEACTIVATE_CHUNK):
+            chunk = ids[i:i + DEACTIVATE_CHUNK]
+            supabase.table("new_products").update({"is_active": False, **stamp_fields()})\
+                .eq("brand_id", brand_id)\
+                .in_("external_id", chunk)\
+                .execute()
+            done += len(chunk)
+    except Exception as e:
+        print(f" ❌ {label} 비활성화 실패 ({done}/{len(ids)}): {e}")
+        return done
+    print(f" 🧹 {label} 사라진 상품 {done}개 비활성화")
+    return done
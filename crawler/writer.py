@@ -0,0 +1,209 @@
+import json
+import queue
+import random
+import threading
+import time
+
+from crawler.metrics import METRICS
+from crawler.snapshot import stamp_fields
+
+# ==========================================
+# 💾 공용 Bulk Writer (병렬 + 적응형 배치 + 재시도)
+# ==========================================
+class BulkWriter:
+    """
+    Supabase upsert를 몇 개의 동시 writer로 나눠 보냅니다.
+    - 배치 크기: 행의 JSON 크기로 target_bytes에 맞춰 시작하고,
+      응답이 target_latency보다 느리면 줄이고 충분히 빠르면 늘립니다.
+    - 배치마다 지수 백오프로 재시도하며, 끝내 실패한 배치만 버리고 나머지는 계속 씁니다.
+    - brand: 계측(crawler/metrics.py)에 쓰는 브랜드 이름
+    - stamp: 배치를 보낼 때 updated_at을 넣음 (스냅샷 증분 조회용, 컬럼이 확인된 new_products만 - crawler/snapshot.py)
+    """
+
+    def __init__(self, supabase, table="new_products", on_conflict="brand_id,external_id", label="",
+                 workers=3, target_bytes=256 * 1024, min_batch=20, max_batch=500,
+                 target_latency=1.0, retries=3, backoff=0.5, brand="", stamp=True):
+        self.supabase = supabase
+        self.table = table
+        self.on_conflict = on_conflict
+        self.stamp = stamp
+        self.label = label
+        self.brand = brand
+        self.workers = workers
+        self.target_bytes = target_bytes
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.target_latency = target_latency
+        self.retries = retries
+        self.backoff = backoff
+        self.batch_size = None
+
+    def _initial_batch_size(self, rows):
+        sample = rows[:50]
+        avg = sum(len(json.dumps(r, ensure_ascii=False, default=str)) for r in sample) / len(sample)
+        return max(self.min_batch, min(self.max_batch, int(self.target_bytes / max(avg, 1))))
+
+    def _adapt(self, latency):
+        if latency > self.target_latency:
+            self.batch_size = max(self.min_batch, self.batch_size // 2)
+        elif latency < self.target_latency / 2:
+            self.batch_size = min(self.max_batch, int(self.batch_size * 1.5))
+
+    def _send(self, chunk):
+        """배치 하나를 재시도하며 전송. (성공 여부, 마지막 시도 소요시간, 재시도 횟수)"""
+        fields = stamp_fields() if self.stamp else None
+        if fields:
+            chunk = [dict(r, **fields) for r in chunk]
+        for attempt in range(self.retries + 1):
+            started = time.monotonic()
+            try:
+                query = self.supabase.table(self.table)
+                if self.on_conflict:
+                    query = query.upsert(chunk, on_conflict=self.on_conflict)
+                else:
+                    query = query.insert(chunk)
+                with METRICS.timer(self.brand, "upsert"):
+                    query.execute()
+                return True, time.monotonic() - started, attempt
+            except Exception as e:
+                if attempt == self.retries:
+                    print(f"❌ {self.label} 배치 {len(chunk)}행 저장 실패 (재시도 {attempt}회): {e}")
+                    return False, time.monotonic() - started, attempt
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    def stream(self, queue_size=None):
+        """행을 조금씩 넘기면 배치가 찰 때마다 바로 쓰는 WriteStream (with 문으로 사용)"""
+        return WriteStream(self, queue_size or self.workers * 2)
+
+    def write(self, rows):
+        """rows를 모두 쓰고 처리량 통계 dict를 반환합니다."""
+        with self.stream() as s:
+            s.extend(rows)
+        return s.stats
+
+
+class WriteStream:
+    """
+    BulkWriter 앞에 두는 bounded queue.
+    - add/extend로 들어온 행을 모아 배치 크기가 되면 큐에 넣고, writer 스레드들이 꺼내 씁니다.
+    - 큐가 가득 차면 add가 기다리므로 (backpressure) 크롤러가 DB보다 앞서 나가도 메모리는 일정합니다.
+    - with 블록이 예외로 끝나도 이미 모인 행까지는 쓰고 나서 예외를 그대로 올립니다.
+    - mark(callback): 그때까지 넣은 행이 모두 저장되면 callback(written)을 호출 (체크포인트용)
+    """
+
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        self.stats = {"rows": 0, "written": 0, "failed": 0, "batches": 0, "retries": 0, "seconds": 0.0}
+        self._buffer = []
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._started = None
+        self._queued = 0        # 큐에 넣은 행 수 (배치는 [시작, 끝) 행 범위)
+        self._low = 0           # 이 행 번호 전까지는 모두 저장 성공
+        self._done = {}         # 저장된 배치의 시작 행 → 끝 행 (앞 배치가 아직이라 _low에 못 붙은 것)
+        self._markers = []      # (필요한 행 수, callback) - 행 수 순
+
+    def __enter__(self):
+        self._started = time.monotonic()
+        for _ in range(self.writer.workers):
+            t = threading.Thread(target=self._worker, daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def add(self, row):
+        self._buffer.append(row)
+        self.stats["rows"] += 1
+        w = self.writer
+        if w.batch_size is None:
+            # 처음 50행(또는 close 시점의 전부)으로 시작 배치 크기 결정
+            if len(self._buffer) < 50: return
+            w.batch_size = w._initial_batch_size(self._buffer)
+        while len(self._buffer) >= w.batch_size:
+            chunk, self._buffer = self._buffer[:w.batch_size], self._buffer[w.batch_size:]
+            self._enqueue(chunk)
+
+    def extend(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def _enqueue(self, chunk):
+        start = self._queued
+        self._queued += len(chunk)
+        self._queue.put((start, chunk))
+
+    def mark(self, callback):
+        """
+        지금까지 add한 행이 전부 저장되면 callback(written)을 writer 스레드에서 호출합니다.
+        행 번호로 기다리므로 버퍼의 행이 나중에 몇 개의 배치로 나뉘어도 (배치 크기 조절/close) 마지막 행까지 저장된 뒤에만 호출됩니다.
+        앞선 배치 중 하나라도 최종 실패하면 그 뒤 표시는 호출되지 않습니다.
+        """
+        need = self.stats["rows"]
+        with self._lock:
+            if need > self._low:
+                self._markers.append((need, callback))
+            else:
+                self._fire(callback)
+
+    def _fire(self, callback):
+        # 표시 callback이 실패해도 writer 스레드는 살아 있어야 함 (죽으면 add/close가 큐에서 멈춤)
+        try:
+            callback(self.stats["written"])
+        except Exception as e:
+            print(f"⚠️ {self.writer.label} 저장 표시 처리 실패: {e}")
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            start, chunk = item
+            ok, latency, retries = self.writer._send(chunk)
+            # 표시 callback은 순서대로 호출되도록 락 안에서 (체크포인트 기록처럼 짧은 작업만)
+            with self._lock:
+                self.stats["batches"] += 1
+                self.stats["retries"] += retries
+                self.stats["written" if ok else "failed"] += len(chunk)
+                if ok:
+                    self.writer._adapt(latency)
+                    self._done[start] = start + len(chunk)
+                    while self._low in self._done:
+                        self._low = self._done.pop(self._low)
+                    while self._markers and self._markers[0][0] <= self._low:
+                        self._fire(self._markers.pop(0)[1])
+
+    def close(self):
+        """남은 행을 보내고 writer 스레드가 모두 끝날 때까지 기다린 뒤 통계를 반환합니다."""
+        if self._started is None:
+            return self.stats
+        w = self.writer
+        if self._buffer:
+            if w.batch_size is None:
+                w.batch_size = w._initial_batch_size(self._buffer)
+            for i in range(0, len(self._buffer), w.batch_size):
+                self._enqueue(self._buffer[i:i + w.batch_size])
+            self._buffer = []
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+        self._threads = []
+
+        stats = self.stats
+        stats["seconds"] = time.monotonic() - self._started
+        self._started = None
+        if not stats["rows"]:
+            return stats
+        if METRICS.enabled:
+            for name in ("written", "failed", "batches", "retries"):
+                METRICS.incr(w.brand, f"upsert.{name}", stats[name])
+        rate = stats["written"] / stats["seconds"] if stats["seconds"] else 0
+        print(f" 📈 {w.label} {stats['written']}/{stats['rows']}행 저장, {stats['batches']}배치, "
+              f"{stats['seconds']:.2f}s ({rate:.0f} rows/s), 재시도 {stats['retries']}, 실패 {stats['failed']}, "
+              f"배치크기 {w.batch_size}")
+        return stats
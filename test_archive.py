@@ -0,0 +1,71 @@
+import os
+
+from crawler.archive import INDEX_NAME, PageArchive
+from crawler.bench import MemorySupabase, StubServer, bench_replay
+from crawler.cu_crawler import crawl_cu
+from crawler.fetcher import FetchEngine
+from crawler.http_cache import ResponseCache
+
+
+def test_archive_dedups_rolls_segments_and_reopens(tmp_path):
+    directory = str(tmp_path)
+    archive = PageArchive(directory, segment_bytes=200)
+    pages = [f"<li class='prod_list'>{os.urandom(150).hex()}</li>" for _ in range(3)]   # 압축이 안 되는 본문
+    for i, text in enumerate(pages):
+        archive.save("cu", {"raw_cat": "간편식사", "page": i + 1}, text)
+    archive.save("cu", {"raw_cat": "간편식사", "page": 1}, pages[0])   # 같은 본문 → 프레임 재사용
+    assert archive.deduped == 1
+    assert archive.read(archive.entries[-1]) == pages[0]
+    archive.close()
+    assert len([n for n in os.listdir(directory) if n.startswith("segment-")]) == 3
+
+    with open(os.path.join(directory, INDEX_NAME), "a", encoding="utf-8") as f:
+        f.write('{"brand": "cu", "args"')   # 강제 종료로 잘린 줄
+    reopened = PageArchive(directory)
+    assert len(reopened.entries) == 4
+    latest = reopened.pages(["cu"])
+    assert [e["args"]["page"] for e in latest] == [1, 2, 3]
+    assert [reopened.read(e) for e in latest] == pages
+    reopened.save("gs25", {"p_type": "ONE_TO_ONE", "page": 1}, '{"results": []}')
+    assert reopened.read(reopened.entries[-1]) == '{"results": []}'
+    reopened.close()
+
+    assert bench_replay(directory, ["cu"])["pages"] == 3
+    # 304: 본문 없이 같은 페이지의 마지막 프레임을 다시 가리킴
+    again = PageArchive(directory)
+    assert again.save("cu", {"raw_cat": "간편식사", "page": 2}) is True
+    assert again.read(again.entries[-1]) == pages[1] and again.entries[-1]["run"] == again.run
+    assert again.save("cu", {"raw_cat": "간편식사", "page": 9}) is False   # 처음 보는 페이지
+    again.close()
+
+
+def test_latest_pages_fill_gaps_from_earlier_runs(tmp_path):
+    directory = str(tmp_path)
+    first = PageArchive(directory)
+    for page in (1, 2, 3):
+        first.save("cu", {"raw_cat": "간편식사", "page": page}, f"old {page}")
+    first.close()
+    second = PageArchive(directory)   # 예전 아카이브처럼 바뀐 페이지만 저장된 실행
+    second.save("cu", {"raw_cat": "간편식사", "page": 2}, "new 2")
+    second.save("cu", {"raw_cat": "음료", "page": 1}, "drink 1")
+    latest = second.pages()
+    assert [(e["args"]["raw_cat"], second.read(e)) for e in latest] == [
+        ("간편식사", "old 1"), ("간편식사", "new 2"), ("간편식사", "old 3"), ("음료", "drink 1")]
+    second.close()
+
+
+def test_crawl_archives_pages_served_from_cache(tmp_path):
+    directory = str(tmp_path / "archive")
+    cache = ResponseCache(str(tmp_path / "http"))
+    runs = []
+    with StubServer(pages=2) as server:
+        for _ in range(2):
+            archive = PageArchive(directory)
+            crawl_cu(MemorySupabase(), {}, FetchEngine(name="cu"), cache=cache, base_url=server.base_url,
+                     archive=archive)
+            runs.append({(e["args"]["raw_cat"], e["args"]["page"]) for e in archive.entries
+                         if e["run"] == archive.run and e["args"]["page"] <= 3})
+            archive.close()
+    assert cache.hits >= 6 * 3
+    # 두 번째 실행은 전부 캐시 적중이어도 카테고리 6개 x (2페이지 + 빈 페이지)를 모두 보관
+    assert len(runs[0]) == 6 * 3 and runs[1] == runs[0]
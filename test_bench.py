@@ -0,0 +1,66 @@
+import json
+
+from crawler.bench import MemorySupabase, StubServer, run_benchmark
+
+
+def test_stub_serves_pages_then_empty():
+    import requests
+    with StubServer(pages=2) as server:
+        url = server.base_url + "/product/productAjax.do"
+        full = requests.post(url, data={"pageIndex": 2, "searchMainCategory": 10}).text
+        empty = requests.post(url, data={"pageIndex": 3, "searchMainCategory": 10}).text
+    assert "prod_list" in full and "prod_list" not in empty
+
+
+def test_memory_supabase_upsert_on_conflict():
+    db = MemorySupabase()
+    db.table("new_products").upsert([{"brand_id": 1, "external_id": 7, "price": 100}], on_conflict="brand_id,external_id").execute()
+    db.table("new_products").upsert([{"brand_id": 1, "external_id": 7, "price": 200}], on_conflict="brand_id,external_id").execute()
+    db.table("new_products").update({"is_active": False}).eq("brand_id", 1).in_("external_id", [7]).execute()
+    assert db.rows() == [{"brand_id": 1, "external_id": 7, "price": 200, "is_active": False}]
+
+
+def test_run_benchmark_offline():
+    result = run_benchmark(pages=2, latency=0, db_latency=0, repeat=2, pacing=False)
+    json.dumps(result)
+    for brand in ("cu", "gs25", "seven"):
+        assert result["crawl"][brand]["pages"] > 0
+        assert result["crawl"][brand]["rows_stored"] > 0
+    assert result["parse_ms_per_page"]["cu"] > 0
+
+
+def test_crawl_seven_all_lists_until_empty():
+    from crawler.fetcher import FetchEngine, create_session
+    from crawler.seven_crawler import crawl_seven
+    db = MemorySupabase()
+    with StubServer(pages=2) as server:
+        engine = FetchEngine(create_session({}), max_workers=2, per_host=2, name="seven")
+        crawl_seven(db, {}, engine, cache=False, base_url=server.base_url)
+    rows = db.rows()
+    assert {r["promotion_type"] for r in rows} >= {"1+1", "2+1", "할인"}
+    assert any(r["category"] == "간편식사" for r in rows)
+
+
+def test_seven_fresh_items_keep_stored_promotion_when_promo_tabs_incomplete(monkeypatch):
+    from crawler import seven_crawler
+    from crawler.fetcher import FetchEngine, create_session
+    from crawler.product import BRAND_SEVEN, promo_code
+
+    def crawl(existing_map):
+        db = MemorySupabase()
+        with StubServer(pages=2) as server:
+            engine = FetchEngine(create_session({}), max_workers=2, per_host=2, name="seven")
+            seven_crawler.crawl_seven(db, existing_map, engine, cache=False, base_url=server.base_url)
+        return {r["external_id"]: r["promotion_type"] for r in db.rows() if r["category"] == "간편식사"}
+
+    fresh = crawl({})   # 프레시푸드 목록에만 있는 상품
+    assert fresh and set(fresh.values()) <= {"일반", "NEW"}
+    # 지난 실행에서 행사 탭에도 있던 상품 (DB에 1+1로 저장됨)
+    existing = {(BRAND_SEVEN, ext): {"title": "", "category": "간편식사", "hash": 0, "is_active": True,
+                                     "price": 0, "promo": promo_code("1+1")} for ext in fresh}
+
+    # 행사 탭을 끝까지 봤으면 탭에 없는 상품은 목록에 표시된 그대로
+    assert crawl(existing) == fresh
+    # 행사 탭이 중간에 끝났으면 (페이지 상한) 행사 여부를 알 수 없으므로 DB 값을 유지
+    monkeypatch.setattr(seven_crawler, "SEVEN_MAX_PAGES", 1)
+    assert set(crawl(existing).values()) == {"1+1"}
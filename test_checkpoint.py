@@ -0,0 +1,79 @@
+import json
+
+from crawler.bench import MemorySupabase, StubServer
+from crawler.checkpoint import CheckpointJournal
+from crawler.cu_crawler import crawl_cu
+from crawler.fetcher import FetchEngine
+from crawler.writer import BulkWriter
+
+
+def run_cu(server, journal):
+    db = MemorySupabase()
+    crawl_cu(db, {}, FetchEngine(name="cu"), cache=False, base_url=server.base_url, checkpoint=journal)
+    return db
+
+
+def test_resume_skips_finished_categories_and_pages(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    journal = CheckpointJournal(path, brands=["cu"])
+    journal.page("cu", "10", 2, 10)
+    journal.job("cu", "30", "end")
+    journal.close()
+
+    resumed = CheckpointJournal(path, resume=True, brands=["cu"])
+    assert resumed.resumed("cu") and resumed.start_page("cu", "10") == 3
+    with StubServer(pages=3) as server:
+        db = run_cu(server, resumed)
+    resumed.close()
+    # 간편식사는 3페이지만, 과자류는 건너뜀, 나머지 4개 카테고리는 3페이지씩 (페이지당 5개)
+    assert len(db.rows()) == 5 + 4 * 15
+
+    events = [json.loads(line) for line in open(path, encoding="utf-8")]
+    assert events[-1] == {"event": "finished", "brand": "cu"}
+    # 끝난 실행은 이어받지 않고 새로 시작
+    assert not CheckpointJournal(path, resume=True, brands=["cu"]).resumed("cu")
+
+
+def test_write_stream_marks_fire_in_order_and_stop_after_failure():
+    class Flaky(MemorySupabase):
+        def _execute(self, q):
+            if q.action == "upsert" and any(r["external_id"] == 13 for r in q.payload):
+                raise RuntimeError("db down")
+            return super()._execute(q)
+
+    fired = []
+    writer = BulkWriter(Flaky(), workers=2, min_batch=1, retries=0)
+    writer.batch_size = 5
+    with writer.stream() as s:
+        for page in range(4):
+            s.extend({"brand_id": 1, "external_id": page * 5 + i} for i in range(5))
+            s.mark(lambda written, page=page: fired.append(page))
+    assert fired == [0, 1]
+
+
+def test_write_stream_mark_waits_for_rows_split_across_batches():
+    db = MemorySupabase(latency=0.01)
+    writer = BulkWriter(db, workers=3, min_batch=1)
+    writer.batch_size = 100
+    saved_at_mark = []
+    with writer.stream() as s:
+        s.extend({"brand_id": 1, "external_id": i} for i in range(180))   # 100행 배치 + 버퍼 80행
+        s.mark(lambda written: saved_at_mark.append(len(db.rows())))
+        writer.batch_size = 20   # 배치 크기가 줄어 버퍼가 여러 배치로 나뉨 (_adapt와 같은 효과)
+        s.extend({"brand_id": 1, "external_id": i} for i in range(180, 200))
+    assert saved_at_mark and saved_at_mark[0] >= 180
+
+
+def test_write_stream_survives_failing_mark_callback():
+    def broken(written):
+        raise RuntimeError("checkpoint disk full")
+
+    fired = []
+    writer = BulkWriter(MemorySupabase(), workers=1, min_batch=1)
+    writer.batch_size = 5
+    with writer.stream() as s:
+        for page in range(3):
+            s.extend({"brand_id": 1, "external_id": page * 5 + i} for i in range(5))
+            s.mark(broken if page == 0 else lambda written, page=page: fired.append(page))
+        s.extend({"brand_id": 1, "external_id": 100 + i} for i in range(20))   # 큐가 계속 비워져야 함
+    assert fired == [1, 2] and s.stats["written"] == 35
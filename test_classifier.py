@@ -0,0 +1,115 @@
+import itertools
+import random
+import re
+
+from crawler.classifier import CU_CLASSIFIER, CU_RULES, SEVEN_CLASSIFIER, SEVEN_RULES
+
+# ==========================================
+# 기존 get_standard_category 원본 (패리티 비교 기준)
+# ==========================================
+def legacy_cu_category(title, raw_category=None):
+    # [1] CU 원본 카테고리 절대 적용
+    if raw_category:
+        if raw_category == "간편식사": return "간편식사"
+        if raw_category == "과자류": return "과자류"
+        if raw_category == "아이스크림": return "아이스크림"
+        if raw_category == "음료": return "음료"
+        if raw_category == "생활용품": return "생활용품"
+        if raw_category == "식품": return "식품"
+        if raw_category == "즉석조리": return None
+
+    # [2] 키워드 분류
+    # 1. 생활용품
+    if any(k in title for k in ['치약', '칫솔', '가글', '가그린', '페리오', '메디안', '2080', '리치', '덴탈', '마우스', '쉐이빙', '면도기', '물티슈', '티슈', '마스크', '생리대', '중형', '대형', '소형', '오버나이트', '입는오버', '패드', '라이너', '탐폰', '팬티', '라엘', '쏘피', '화이트', '좋은느낌', '시크릿데이', '애니데이', '디어스킨', '순수한면', '샴푸', '린스', '트리트먼트', '헤어', '세럼', '비누', '엘라스틴', '케라시스', '오가니스트', '온더바디', '바디워시', '로션', '핸드크림', '수딩젤', '클렌징', '워터마이드', '에센셜', '존슨즈', '아비노', '니베아', '메디힐', '립케어', '오일', '세제', '락스', '슈가버블', '무균무때', '퐁퐁', '피지', '건전지', '스타킹', '밴드', '일회용', '제거', '클린핏', '우산', '양말', '바디']):
+        return "생활용품"
+
+    # 2. 간편식사
+    if any(k in title for k in ['도시락', '김밥', '주먹밥', '샌드위치', '햄버거', '버거', '샐러드', '죽', '컵반', '비빔밥']):
+        return "간편식사"
+
+    # 3. 식품
+    is_food_bar = re.search(r'바\s*\d+g', title)
+    if is_food_bar or any(k in title for k in ['라면', '면', '우동', '국밥', '탕', '찌개', '국', '햇반', '핫바', '소시지', '후랑크', '만두', '닭가슴살', '치킨', '육개장', '베이컨', '스테이크', '육포', '어묵', '크랩', '튀김', '브리또', '파스타', '직화', '꼬치', '떡볶이', '3XL', '킬바사', '오징어', '밥바']):
+        return "식품"
+
+    # 4. 과자류
+    if any(k in title for k in ['스낵', '젤리', '사탕', '껌', '초코', '쿠키', '칩', '빵', '케익', '약과', '양갱', '프레첼', '팝콘', '아몬드', '맛밤', '말차빵', '허쉬', '그릭요거트', '오팜', '푸딩', '디저트', '킷캣', '도넛', '크런키', '자유시간']):
+        return "과자류"
+
+    # 5. 아이스크림
+    if any(k in title for k in ['하겐', '소르베', '라라스윗', '나뚜루', '벤앤', '아이스', '콘', '파인트', '설레임', '폴라포', '스크류', '돼지바', '빙수', '샤베트', '찰옥수수', '미니컵', '비비빅', '메로나', '누가바', '쌍쌍바', '바밤바', '옥동자', '와일드바디', '붕어싸만코', '더위사냥', '빵빠레', '구슬', '탱크보이', '빠삐코', '요맘때', '쿠앤크', '수박바', '죠스바', '제로윗', '로우윗', '서주', '동그린', '삼우', '파르페', '쿨리쉬']):
+        return "아이스크림"
+
+    # 6. 음료
+    if any(k in title for k in ['우유', '커피', '라떼', '아메리카노', '콜라', '사이다', '에이드', '주스', '보리차', '옥수수수염차', '비타', '박카스', '쌍화', '두유', '요구르트', '요거트', '물', '워터', '프로틴', '콤부차', '드링크', '이온', '티', 'TEA', '바리스타', '콘트라', '카페', '마이노멀', '서울FB', '맥주', '하이볼']):
+        return "음료"
+
+    return "기타"
+
+
+def legacy_seven_category(title, raw_category=None):
+    if raw_category == "간편식사": return "간편식사"
+    
+    # 1. 생활용품
+    if any(k in title for k in ['치약', '칫솔', '가글', '생리대', '샴푸', '린스', '면도기', '물티슈', '마스크', '스타킹', '건전지', '비누', '로션', '립케어', '세제', '락스', '우산', '양말']):
+        return "생활용품"
+    # 2. 간편식사
+    if any(k in title for k in ['도시락', '김밥', '주먹밥', '샌드위치', '햄버거', '버거', '샐러드']):
+        return "간편식사"
+    # 3. 식품
+    if re.search(r'바\s*\d+g', title) or any(k in title for k in ['라면', '우동', '국수', '햇반', '핫바', '후랑크', '소시지', '만두', '치킨', '육개장', '죽', '탕', '찌개']):
+        return "식품"
+    # 4. 과자류
+    if any(k in title for k in ['스낵', '젤리', '사탕', '껌', '초코', '쿠키', '칩', '빵', '약과', '양갱', '팝콘', '아몬드']):
+        return "과자류"
+    # 5. 아이스
+    if title.endswith('바') or any(k in title for k in ['하겐', '소르베', '나뚜루', '아이스', '콘', '파인트', '설레임', '폴라포', '스크류', '돼지바', '빙수', '구슬', '빵빠레']):
+        return "아이스"
+    # 6. 음료
+    if any(k in title for k in ['우유', '커피', '라떼', '콜라', '사이다', '에이드', '주스', '보리차', '비타', '박카스', '두유', '요거트', '물', '워터', '맥주', '하이볼']):
+        return "음료"
+    
+    return "기타"
+
+
+def _corpus(rules):
+    keywords = sorted({k for r in rules for k in r.get("keywords", [])})
+    titles = ["", "바", "초코바", "에너지바 40g", "프로틴바40g", "바 3g", "아이스 아메리카노", "GET 카페라떼"]
+    titles += keywords
+    titles += [f"맛있는 {k} 500ml" for k in keywords]
+    titles += [a + b for a, b in itertools.product(keywords, repeat=2)]
+    rng = random.Random(20240101)
+    fillers = ["", " ", "바", "g", "1", "매콤", "우", "면도", "크림"]
+    for _ in range(3000):
+        parts = rng.sample(keywords, 3) + rng.sample(fillers, 2)
+        rng.shuffle(parts)
+        titles.append("".join(parts))
+    return titles
+
+
+def test_cu_classifier_matches_legacy():
+    for title in _corpus(CU_RULES):
+        assert CU_CLASSIFIER.classify(title) == legacy_cu_category(title), title
+
+
+def test_cu_raw_category_matches_legacy():
+    for raw in ["간편식사", "과자류", "아이스크림", "음료", "생활용품", "식품", "즉석조리", "기타", "", None]:
+        for title in ["치약", "콜라", "이름없음"]:
+            assert CU_CLASSIFIER.classify(title, raw) == legacy_cu_category(title, raw)
+
+
+def test_seven_classifier_matches_legacy():
+    for title in _corpus(SEVEN_RULES):
+        assert SEVEN_CLASSIFIER.classify(title) == legacy_seven_category(title), title
+    for raw in ["간편식사", "음료", None]:
+        assert SEVEN_CLASSIFIER.classify("콜라", raw) == legacy_seven_category("콜라", raw)
+
+
+def test_classify_many_matches_single():
+    titles = _corpus(CU_RULES)[:5000]
+    raws = [[None, "음료", "즉석조리", None][i % 4] for i in range(len(titles))]
+    assert CU_CLASSIFIER.classify_many(titles, raws) == [
+        legacy_cu_category(t, r) for t, r in zip(titles, raws)
+    ]
+    titles = _corpus(SEVEN_RULES)[:5000]
+    assert SEVEN_CLASSIFIER.classify_many(titles) == [legacy_seven_category(t) for t in titles]
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+from crawler.__main__ import COMMANDS, main
+
+# 도움말/짧은 명령이 import만으로 쓰는 시간 상한 (ms, 느린 CI 여유 포함)
+IMPORT_BUDGET_MS = 100
+HEAVY = ("bs4", "requests", "supabase", "postgrest", "lxml", "pyarrow", "asyncio")
+
+
+def import_profile(module):
+    """새 인터프리터에서 module을 import → (누적 import ms, 함께 로드된 무거운 패키지)"""
+    code = f"import sys, {module}; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    line = [l for l in out.stderr.splitlines() if l.rstrip().endswith(f"| {module}")][-1]
+    return int(line.split("|")[1]) / 1000, out.stdout.split()
+
+
+def test_cli_and_helper_modules_start_fast():
+    for module in ("crawler.__main__", "crawler.history", "crawler.storage", "crawler.incremental"):
+        ms, heavy = import_profile(module)
+        assert heavy == [], f"{module}: {heavy}"
+        assert ms < IMPORT_BUDGET_MS, f"{module}: {ms:.1f}ms"
+
+
+def test_crawler_loads_optional_parsers_lazily():
+    _, heavy = import_profile("crawler.cu_crawler")
+    assert not {"bs4", "supabase", "pyarrow"} & set(heavy)
+
+
+def test_cli_dispatches_to_module_main(capsys):
+    assert set(COMMANDS) >= {"crawl", "reprocess", "bench", "verify"}
+    assert main(["history", "--ddl"]) == 0
+    assert "CREATE TABLE" in capsys.readouterr().out
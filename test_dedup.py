@@ -0,0 +1,39 @@
+import json
+
+from crawler.bench import MemorySupabase
+from crawler.cu_crawler import parse_gs25_results
+from crawler.dedup import apply_merge, fetch_brand_rows, plan_merge
+from crawler.product import STABLE_ID_MIN, stable_id
+from crawler.snapshot import ExistingSnapshot
+
+
+def test_gs25_fallback_id_is_stable():
+    text = json.dumps({"results": [{"goodsNm": " 바나나  우유 ", "price": 1500, "attFileId": "", "attFileNm": "a.jpg"}]})
+    first, second = parse_gs25_results(text, "ONE_TO_ONE"), parse_gs25_results(text, "TWO_TO_ONE")
+    assert first[0]["external_id"] == second[0]["external_id"] == stable_id("바나나 우유", "a.jpg")
+    assert STABLE_ID_MIN <= first[0]["external_id"] < 2 ** 63
+
+
+def test_merge_collapses_time_based_duplicates(tmp_path):
+    db = MemorySupabase()
+    legacy = [(1700000000001, "바나나우유", False), (1700000000002, "바나나우유", True),
+              (1700000000003, "바나나우유", False), (1700000000004, "딸기우유", True)]
+    rows = [{"brand_id": 2, "external_id": ext, "title": title, "image_url": "", "price": 1500, "is_active": active}
+            for ext, title, active in legacy]
+    rows.append({"brand_id": 2, "external_id": 8801, "title": "바나나우유", "image_url": "", "is_active": True})
+    rows.append({"brand_id": 2, "external_id": stable_id("딸기우유", ""), "title": "딸기우유", "image_url": "",
+                 "is_active": True})
+    db.table("new_products").upsert(rows, on_conflict="brand_id,external_id").execute()
+
+    snapshot = ExistingSnapshot(str(tmp_path / "snap.sqlite3"))
+    snapshot.apply([dict(r, category="기타") for r in rows])
+    removed = apply_merge(db, plan_merge(fetch_brand_rows(db)))
+    snapshot.discard(removed)
+
+    ids = sorted(r["external_id"] for r in db.rows())
+    assert ids == sorted([8801, stable_id("바나나우유", ""), stable_id("딸기우유", "")])
+    merged = [r for r in db.rows() if r["external_id"] == stable_id("바나나우유", "")][0]
+    assert merged["is_active"]   # 활성 행 우선
+    assert set(snapshot.load_map()) == {(2, ext) for ext in ids} - {(2, stable_id("바나나우유", ""))}
+    # 다시 실행해도 더 지울 것이 없음
+    assert apply_merge(db, plan_merge(fetch_brand_rows(db))) == []
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+from crawler.bench import StubServer
+from crawler.fetcher import CrawlCancelled, FetchEngine, FetchError, HostLimiter, RetryPolicy
+
+
+def test_host_limiter_aimd():
+    limiter = HostLimiter(rate=10, max_rate=12, min_rate=1, target_latency=1.0)
+    limiter.on_response(200, 0.1)
+    assert limiter.rate == 11
+    limiter.on_response(200, 0.1)
+    limiter.on_response(200, 0.1)
+    assert limiter.rate == 12
+    limiter.on_response(503, 0.1)
+    assert limiter.rate == 6
+    limiter.on_response(200, 5.0)
+    assert limiter.rate == pytest.approx(4.8)
+    for _ in range(10):
+        limiter.on_failure()
+    assert limiter.rate == 1
+
+
+def test_retry_delay_is_jittered_and_capped():
+    policy = RetryPolicy(backoff=1.0, max_backoff=4.0)
+    assert all(0 <= policy.delay(attempt) <= 4.0 for attempt in range(10))
+    assert policy.delay(0, retry_after=10) == 4.0
+
+
+def test_engine_retries_only_failed_requests():
+    engine = FetchEngine(max_workers=4, per_host=2, rate=50, max_rate=100, retry=RetryPolicy(retries=8, backoff=0))
+    with StubServer(pages=1, error_rate=0.3, seed=1) as server:
+        url = server.base_url + "/product/productAjax.do"
+        for cat in range(10, 20):
+            r = engine.post(url, data={"pageIndex": 1, "searchMainCategory": cat})
+            assert r.status_code == 200
+        assert server.errors > 0
+        assert server.total_requests() == 10 + server.errors
+
+
+def test_engine_raises_after_retries():
+    engine = FetchEngine(retry=RetryPolicy(retries=2, backoff=0))
+    with StubServer(error_rate=1.0) as server:
+        with pytest.raises(FetchError):
+            engine.post(server.base_url + "/product/productAjax.do", data={"pageIndex": 1})
+        assert server.total_requests() == 3
+
+
+def crawl(engine, jobs, fetch_page, max_pages=10, **kwargs):
+    """crawl_pages 결과를 job별 페이지 리스트와 outcome으로"""
+    outcome, pages = [], {job: [] for job in jobs}
+    for job, page, items in engine.crawl_pages(jobs, fetch_page, max_pages, outcome=outcome, **kwargs):
+        assert items == [f"{job}{page}"]
+        pages[job].append(page)
+    return pages, outcome
+
+
+def test_crawl_pages_yields_in_page_order_when_pages_finish_out_of_order():
+    def fetch_page(job, page):
+        time.sleep(0.02 * (4 - page % 4))   # 먼저 보낸 페이지가 늦게 끝남
+        return [f"{job}{page}"] if page <= 6 else None
+
+    pages, outcome = crawl(FetchEngine(max_workers=8), ["a", "b"], fetch_page, prefetch=4)
+    assert pages == {"a": [1, 2, 3, 4, 5, 6], "b": [1, 2, 3, 4, 5, 6]}
+    assert outcome == ["end", "end"]
+
+
+def test_crawl_pages_stops_at_first_empty_page_or_error():
+    def fetch_page(job, page):
+        if job == "a" and page == 3: return None
+        if job == "b" and page == 2: raise ValueError("broken page")
+        return [f"{job}{page}"]   # 멈춘 뒤 미리 받은 페이지는 버려져야 함
+
+    pages, outcome = crawl(FetchEngine(max_workers=4), ["a", "b"], fetch_page, prefetch=3)
+    assert pages == {"a": [1, 2], "b": [1]}
+    assert outcome == ["end", "error"]
+
+
+def test_crawl_pages_max_pages_stop_and_start_pages():
+    fetch_page = lambda job, page: [f"{job}{page}"]
+    engine = FetchEngine(max_workers=4)
+    assert crawl(engine, ["a"], fetch_page, max_pages=3) == ({"a": [1, 2, 3]}, ["max_pages"])
+
+    seen = []
+    def stop(job):
+        seen.append(job)
+        return len(seen) == 2
+    assert crawl(engine, ["a"], fetch_page, stop=stop) == ({"a": [1, 2]}, ["stopped"])
+
+    pages, outcome = crawl(engine, ["a", "b", "c"], lambda job, page: [f"{job}{page}"] if page < 5 else None,
+                           start_pages=[3, 1, 11])
+    assert pages == {"a": [3, 4], "b": [1, 2, 3, 4], "c": []}
+    assert outcome == ["end", "end", "max_pages"]
+
+
+def test_crawl_pages_reports_cancel_separately_from_errors():
+    engine = FetchEngine(max_workers=2)
+
+    def fetch_page(job, page):
+        if page == 2:
+            engine.cancel()
+            raise CrawlCancelled(job)
+        return [f"{job}{page}"]
+
+    pages, outcome = crawl(engine, ["a"], fetch_page, prefetch=1)
+    assert pages == {"a": [1]}
+    assert outcome == ["cancelled"]
@@ -0,0 +1,36 @@
+from crawler.bench import MemorySupabase
+from crawler.history import HISTORY_TABLE, HistoryLog, fetch_history, state_at
+from crawler.pipeline import ProductPipeline
+from crawler.product import PROMO_OTHER, Product, promo_code
+from crawler.snapshot import ExistingSnapshot
+from crawler.writer import BulkWriter
+
+
+def test_history_records_only_price_and_promo_transitions():
+    db = MemorySupabase()
+    snapshot = ExistingSnapshot(":memory:")
+    snapshot.apply([
+        {"brand_id": 1, "external_id": 1, "title": "김밥", "category": "간편식사", "price": 1500, "promotion_type": "1+1"},
+        {"brand_id": 1, "external_id": 2, "title": "우유", "category": "음료", "price": 1200, "promotion_type": "1+1"},
+    ])
+    existing = snapshot.load_map()
+    history = HistoryLog(db, label="CU", brand="cu")
+    history.writer.min_batch = 1
+    with ProductPipeline(BulkWriter(db, min_batch=1), existing, history=history) as pipeline:
+        pipeline.feed([
+            Product(1, 1, "김밥", 1500, "new.jpg", promotion_type="1+1"),   # 이미지만 바뀜 → 이력 없음
+            Product(1, 2, "우유", 1200, promotion_type="2+1"),              # 행사 변경
+            Product(1, 3, "빵", 2000, promotion_type="특가"),               # 신규
+        ])
+        pipeline.feed([Product(1, 2, "우유", 1200, promotion_type="2+1")])
+
+    rows = sorted(db.rows(HISTORY_TABLE), key=lambda r: r["external_id"])
+    assert [(r["external_id"], r["price"], r["promo"]) for r in rows] == [(2, 1200, 2), (3, 2000, PROMO_OTHER)]
+    assert history.recorded == 2 and promo_code(None) == 0
+
+    db.table(HISTORY_TABLE).insert([{"brand_id": 1, "external_id": 2, "price": 1100, "promo": 3,
+                                     "changed_at": "2000-01-01T00:00:00+00:00"}]).execute()
+    found = fetch_history(db, 1, 2, since="1999-01-01")
+    assert [r["promotion_type"] for r in found] == ["할인", "2+1"]
+    assert state_at(found, "2001-01-01")["price"] == 1100
+    assert fetch_history(db, 1, 2, until="2001-01-01") == found[:1]
@@ -0,0 +1,93 @@
+import os
+
+from crawler.http_cache import ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeEngine:
+    """응답 목록을 차례로 돌려주고 받은 요청(헤더/폼)을 기록"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        self.requests.append({"data": data, "headers": headers})
+        return self.responses.pop(0)
+
+
+def counting_parser():
+    calls = []
+
+    def parse(r):
+        calls.append(r)
+        return [{"body": r.content.decode()}]
+    return parse, calls
+
+
+def test_not_modified_uses_cached_records(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    engine = FakeEngine(FakeResponse(200, b"page", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+                        FakeResponse(304))
+    parse, calls = counting_parser()
+    first = cache.fetch(engine, "POST", "http://x/list", parse, data={"page": 1})
+    second = cache.fetch(engine, "POST", "http://x/list", parse, data={"page": 1})
+    assert first == second == [{"body": "page"}]
+    assert len(calls) == 1 and (cache.hits, cache.misses) == (1, 1)
+    assert engine.requests[0]["headers"] == {}
+    assert engine.requests[1]["headers"] == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+
+def test_same_body_hash_skips_parse_and_changed_body_reparses(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    engine = FakeEngine(FakeResponse(200, b"page"), FakeResponse(200, b"page"), FakeResponse(200, b"new"))
+    parse, calls = counting_parser()
+    results = [cache.fetch(engine, "GET", "http://x/list", parse) for _ in range(3)]
+    assert results == [[{"body": "page"}], [{"body": "page"}], [{"body": "new"}]]
+    assert len(calls) == 2 and (cache.hits, cache.misses) == (1, 2)
+
+
+def test_key_ignores_csrf_token(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    key = cache.key("http://x/list", {"pageNum": "1", "CSRFToken": "a"}, ignore=("CSRFToken",))
+    assert key == cache.key("http://x/list", {"CSRFToken": "b", "pageNum": "1"}, ignore=("CSRFToken",))
+    assert key != cache.key("http://x/list", {"pageNum": "2", "CSRFToken": "a"}, ignore=("CSRFToken",))
+    assert key != cache.key("http://x/list", {"pageNum": "1", "CSRFToken": "a"})
+
+    engine = FakeEngine(FakeResponse(200, b"page"), FakeResponse(200, b"page"))
+    parse, calls = counting_parser()
+    for token in ("a", "b"):
+        cache.fetch(engine, "POST", "http://x/list", parse, data={"pageNum": "1", "CSRFToken": token},
+                    ignore=("CSRFToken",))
+    assert len(calls) == 1 and cache.hits == 1
+
+
+def test_parse_version_change_invalidates(tmp_path):
+    engine = FakeEngine(FakeResponse(200, b"page", {"ETag": '"v1"'}), FakeResponse(200, b"page"))
+    parse, calls = counting_parser()
+    ResponseCache(str(tmp_path), version="1").fetch(engine, "GET", "http://x/list", parse)
+    cache = ResponseCache(str(tmp_path), version="2")
+    cache.fetch(engine, "GET", "http://x/list", parse)
+    assert len(calls) == 2 and cache.hits == 0
+    assert engine.requests[1]["headers"] == {}   # 예전 버전의 검증자로 조건부 요청도 보내지 않음
+
+
+def test_evicts_least_recently_used_over_max_bytes(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    parse = lambda r: [{"body": r.content.decode()}]
+    path = lambda i: os.path.join(str(tmp_path), cache.key(f"http://x/{i}") + ".json")
+    for i in range(3):
+        cache.fetch(FakeEngine(FakeResponse(200, b"%d" % i * 400)), "GET", f"http://x/{i}", parse)
+        os.utime(path(i), (i + 1, i + 1))   # 0 → 2 순서로 오래됨
+    cache.max_bytes = os.path.getsize(path(0)) * 3.5
+
+    cache.fetch(FakeEngine(FakeResponse(200, b"0" * 400)), "GET", "http://x/0", parse)   # 적중 → 최근 사용
+    assert cache.hits == 1
+    cache.fetch(FakeEngine(FakeResponse(200, b"3" * 400)), "GET", "http://x/3", parse)   # 4개째 → 80%까지 정리
+    assert [os.path.exists(path(i)) for i in range(4)] == [True, False, False, True]
@@ -0,0 +1,45 @@
+import json
+
+from crawler.bench import MemorySupabase, StubServer
+from crawler.cu_crawler import crawl_cu
+from crawler.diffing import content_hash
+from crawler.fetcher import FetchEngine
+from crawler.incremental import QuietPages, SweepSchedule
+
+
+def test_quiet_pages_counts_consecutive_unchanged_pages():
+    quiet = QuietPages(stop_after=2)
+    assert not quiet.page("a", 0)
+    assert not quiet.page("a", 3)   # 변경이 있으면 다시 0부터
+    assert not quiet.page("a", 0)
+    assert quiet.page("a", 0) and not quiet.stopped("b")
+    assert not QuietPages().page("a", 0)
+
+
+def test_incremental_run_stops_early_and_skips_deactivation(tmp_path):
+    path = str(tmp_path / "full_sweep.json")
+    db = MemorySupabase()
+    db.table("new_products").insert([{"brand_id": 1, "external_id": -1, "title": "사라진 상품", "is_active": True}]).execute()
+    with StubServer(pages=10) as server:
+        crawl_cu(db, {}, FetchEngine(name="cu"), cache=False, base_url=server.base_url,
+                 schedule=SweepSchedule("auto", path))
+        full_requests = server.total_requests()
+        assert "cu" in json.load(open(path, encoding="utf-8"))   # 전체 순회 기록
+
+        existing = {(r["brand_id"], r["external_id"]): {"title": r["title"], "category": r.get("category"),
+                                                         "hash": content_hash(r), "is_active": True}
+                    for r in db.rows()}
+        schedule = SweepSchedule("auto", path, stop_after=2)
+        assert not schedule.full("cu")
+        crawl_cu(db, existing, FetchEngine(name="cu"), cache=False, base_url=server.base_url, schedule=schedule)
+        incremental_requests = server.total_requests() - full_requests
+        assert [r["is_active"] for r in db.rows() if r["external_id"] == -1] == [True]
+
+        # 강제 전체 순회에서만 사라진 상품 비활성화
+        crawl_cu(db, existing, FetchEngine(name="cu"), cache=False, base_url=server.base_url,
+                 schedule=SweepSchedule("full", path))
+
+    # 전체 순회: 카테고리 6개 x (10페이지 + 빈 페이지), 증분: 카테고리당 변경 없는 2페이지 + 미리 요청한 페이지
+    assert full_requests >= 6 * 11
+    assert incremental_requests <= 6 * 5
+    assert [r["is_active"] for r in db.rows() if r["external_id"] == -1] == [False]
@@ -0,0 +1,72 @@
+from crawler.matching import MatchIndex, normalize_title, similar
+from crawler.product import Product
+from crawler.storage import LocalClient
+
+
+def test_normalize_title_units_prefixes_and_spacing():
+    assert normalize_title("유어스)코카콜라 1.5L") == normalize_title("코카콜라1500ML") == "코카콜라1500ml"
+    assert normalize_title("(NEW)[1+1] 도)한끼 정식") == "한끼정식"
+    assert normalize_title("hey!roo)바나나우유 240 ml") == "바나나우유240ml"
+    assert similar(normalize_title("코카콜라 500ml"), normalize_title("코카콜라 1.5L")) == 0.0
+
+
+def test_match_index_links_brands_incrementally(tmp_path):
+    path = str(tmp_path / "matches.sqlite3")
+    index = MatchIndex(path)
+    index.update([
+        Product(1, 11, "코카콜라 제로 500ml"),
+        Product(2, 21, "유어스)코카콜라제로 500ML"),
+        Product(2, 22, "코카콜라 제로 1.5L"),       # 용량이 다르면 다른 상품
+        Product(3, 31, "신라면 컵"),
+        {"brand_id": 1, "external_id": 12, "title": "신라면 큰사발"},
+    ])
+    assert [k for k, _ in index.matches((1, 11))] == [(2, 21)]
+    index.close()
+
+    # 다시 열어서 새 상품만 추가 → 기존 상품과 매칭, 바뀌지 않은 상품은 다시 계산하지 않음
+    index = MatchIndex(path)
+    assert index.update([Product(1, 11, "코카콜라 제로 500ml"), Product(3, 32, "세븐)코카콜라 제로 500ml")]) == 2
+    assert index.stats["unchanged"] == 1
+    assert index.groups()[0] == [(1, 11), (2, 21), (3, 32)]
+
+    # 제목이 바뀌면 예전 매칭은 지워짐
+    index.update([Product(3, 32, "삼각김밥 참치마요")])
+    assert index.groups() == [[(1, 11), (2, 21)]]
+    index.close()
+
+
+def test_match_candidates_are_sub_quadratic():
+    import random
+    rng = random.Random(0)
+    syllables = [chr(c) for c in range(0xAC00, 0xAC00 + 300)]
+    titles = ["".join(rng.choice(syllables) for _ in range(6)) for _ in range(300)]
+    index = MatchIndex(":memory:")
+    index.update([{"brand_id": b, "external_id": i, "title": t} for b in (1, 2) for i, t in enumerate(titles)])
+    assert index.stats["matched"] == 300
+    assert index.stats["candidates"] < 300 * 300 // 20
+
+
+def test_match_index_publishes_matches_to_storage(tmp_path):
+    path = str(tmp_path / "matches.sqlite3")
+    db = LocalClient(str(tmp_path / "local.sqlite3"))
+    stored = lambda: sorted((r["a_brand"], r["a_id"], r["b_brand"], r["b_id"]) for r in db.rows("product_matches"))
+
+    index = MatchIndex(path)
+    index.update([Product(1, 11, "코카콜라 제로 500ml"), Product(2, 21, "유어스)코카콜라제로 500ML"),
+                  Product(3, 31, "신라면 컵"), Product(1, 12, "신라면 컵")])
+    assert index.publish(db)
+    assert stored() == [(1, 11, 2, 21), (1, 12, 3, 31)]
+
+    # 바뀐 것만 반영: 제목이 바뀐 상품의 매칭은 지우고 새 매칭은 추가
+    index.update([Product(3, 31, "세븐)코카콜라 제로 500ml")])
+    assert index.publish(db)
+    assert stored() == [(1, 11, 2, 21), (1, 11, 3, 31), (2, 21, 3, 31)]
+    index.close()
+
+    # 저장소에 반영한 적 없는 인덱스(새로 만듦)는 테이블을 비우고 전체를 다시 올림
+    db.table("product_matches").upsert({"a_brand": 1, "a_id": 99, "b_brand": 2, "b_id": 99, "score": 1.0}).execute()
+    index = MatchIndex(str(tmp_path / "fresh.sqlite3"))
+    index.update([Product(1, 11, "코카콜라 제로 500ml"), Product(2, 21, "코카콜라제로 500ml")])
+    assert index.publish(db)
+    assert stored() == [(1, 11, 2, 21)]
+    index.close()
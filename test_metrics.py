@@ -0,0 +1,30 @@
+from crawler.metrics import Metrics
+
+
+def test_disabled_metrics_record_nothing():
+    m = Metrics(enabled=False)
+    with m.timer("cu", "parse"):
+        pass
+    m.incr("cu", "parse.items", 3)
+    assert m.drop("cu", "no_id") is None
+    assert m.timed("cu", "classify", len, "abc") == 3
+    assert m.summary()["brands"] == {}
+
+
+def test_enabled_metrics_summary():
+    m = Metrics(enabled=True)
+    for ms in (3, 30, 300):
+        m.observe("cu", "fetch", ms)
+    m.incr("cu", "fetch.bytes", 100)
+    m.drop("cu", "no_id")
+    try:
+        with m.timer("cu", "upsert"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    cu = m.summary()["brands"]["cu"]
+    assert cu["counters"] == {"fetch.bytes": 100, "dropped.no_id": 1, "upsert.errors": 1}
+    fetch = cu["timers"]["fetch"]
+    assert fetch["count"] == 3 and fetch["max_ms"] == 300 and fetch["p50_ms"] == 50
+    assert cu["timers"]["upsert"]["count"] == 1
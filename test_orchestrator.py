@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+
+from crawler.bench import MemorySupabase
+from crawler.cu_crawler import BRAND_CRAWLERS, build_brand_tasks, main
+from crawler.fetcher import CrawlCancelled, FetchEngine
+from crawler.orchestrator import BrandTask, run_brands
+
+
+def test_brand_tasks_build_engines_named_after_their_brand():
+    tasks = build_brand_tasks(MemorySupabase(), {}, list(BRAND_CRAWLERS))
+    assert [t.name for t in tasks] == list(BRAND_CRAWLERS)
+    assert [t.make_engine().name for t in tasks] == list(BRAND_CRAWLERS)
+
+
+def test_run_brands_cancels_timed_out_brand_and_isolates_failures():
+    engines, stopped, finished = {}, threading.Event(), []
+
+    def make_engine(name):
+        def make():
+            engines[name] = FetchEngine(name=name)
+            return engines[name]
+        return make
+
+    def slow(engine):
+        # 실제 크롤러처럼 엔진 요청이 취소되면 CrawlCancelled로 빠져나옴
+        try:
+            while True:
+                engine.sleep(0.01)
+        except CrawlCancelled:
+            stopped.set()
+
+    def broken(engine):
+        raise RuntimeError("parser exploded")
+
+    def fine(engine):
+        time.sleep(0.05)
+        finished.append(engine.name)
+
+    results = asyncio.run(run_brands([
+        BrandTask("slow", slow, make_engine("slow"), timeout=0.2),
+        BrandTask("broken", broken, make_engine("broken")),
+        BrandTask("fine", fine, make_engine("fine"), timeout=5),
+    ]))
+    assert {name: status for name, (status, _) in results.items()} == {"slow": "timeout", "broken": "error", "fine": "ok"}
+    assert results["slow"][1] < 2
+    assert engines["slow"].cancelled and not engines["fine"].cancelled
+    assert stopped.wait(2)   # 취소가 엔진까지 전달돼 스레드가 끝남
+    assert finished == ["fine"]
+
+
+def test_crawl_main_exits_nonzero_when_a_brand_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)   # 스냅샷/체크포인트 등 .cache 파일은 임시 디렉터리에
+    db = str(tmp_path / "local.sqlite3")
+    monkeypatch.setitem(BRAND_CRAWLERS, "cu", lambda *args: None)
+    assert main(["--brands", "cu", "--db", db, "--metrics", ""]) == 0
+
+    def broken(*args):
+        raise RuntimeError("parser exploded")
+    monkeypatch.setitem(BRAND_CRAWLERS, "cu", broken)
+    assert main(["--brands", "cu", "--db", db, "--metrics", ""]) == 1
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from crawler.cu_crawler import parse_cu_page
+from crawler.seven_crawler import parse_seven_page
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("name", ["cu_productAjax_p1.html", "cu_productAjax_empty.html"])
+@pytest.mark.parametrize("raw_cat", ["간편식사", "음료", "즉석조리"])
+def test_cu_lxml_matches_bs4(name, raw_cat):
+    html = load(name)
+    assert parse_cu_page(html, raw_cat, backend="lxml") == parse_cu_page(html, raw_cat, backend="bs4")
+
+
+def test_cu_fixture_content():
+    products = parse_cu_page(load("cu_productAjax_p1.html"), "간편식사", backend="lxml")
+    ids = [p["external_id"] for p in products]
+    # GET 커피, 덤증정, ID 없음, 가격 오류 상품은 제외
+    assert ids == [8801043015479, 8809482500119, 8801056150011, 8804444444444, 8805555555555]
+    assert products[0]["is_new"] and products[0]["promotion_type"] == "1+1"
+    assert products[1]["title"] == "삼각김밥)전주비빔" and products[1]["promotion_type"] == "2+1"
+    assert parse_cu_page(load("cu_productAjax_empty.html"), "음료") is None
+
+
+@pytest.mark.parametrize("name", [
+    "seven_listMoreAjax_tab1_p1.html",
+    "seven_dosirakNewMoreAjax_p1.html",
+    "seven_listMoreAjax_empty.html",
+])
+@pytest.mark.parametrize("fixed_category", [None, "간편식사"])
+def test_seven_lxml_matches_bs4(name, fixed_category):
+    html = load(name)
+    assert parse_seven_page(html, fixed_category, backend="lxml") == parse_seven_page(html, fixed_category, backend="bs4")
+
+
+def test_seven_stops_at_no_data_sentinel():
+    products = parse_seven_page(load("seven_listMoreAjax_tab1_p1.html"), backend="lxml")
+    assert 8809000000003 not in [p["external_id"] for p in products]
+    assert parse_seven_page(load("seven_listMoreAjax_empty.html"), backend="lxml") == []
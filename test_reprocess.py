@@ -0,0 +1,94 @@
+from crawler.archive import PageArchive
+from crawler.bench import MemorySupabase, StubServer
+from crawler.cu_crawler import crawl_cu
+from crawler.diffing import content_hash
+from crawler.fetcher import FetchEngine
+from crawler.http_cache import ResponseCache
+from crawler.reprocess import classifier_source, previous_categorizer, reprocess
+
+
+def test_reprocess_saved_pages_keeps_manual_edits(tmp_path):
+    directory = str(tmp_path / "archive")
+    archive = PageArchive(directory)
+    db = MemorySupabase()
+    with StubServer(pages=2) as server:
+        crawl_cu(db, {}, FetchEngine(name="cu"), cache=False, base_url=server.base_url, archive=archive)
+    archive.close()
+    entries = PageArchive(directory).pages(["cu"])
+    assert len(entries) >= 6 * 3   # 카테고리 6개 x (2페이지 + 빈 페이지), 미리 요청한 페이지 포함
+
+    rows = sorted(db.rows(), key=lambda r: r["external_id"])
+    existing = {(r["brand_id"], r["external_id"]): {"title": r["title"], "category": r["category"],
+                                                     "hash": content_hash(r), "is_active": True} for r in rows}
+    stale, edited, hand = rows[0], rows[1], rows[2]
+    existing[(1, stale["external_id"])]["category"] = "옛 분류"
+    existing[(1, edited["external_id"])].update(title="고친 제목", category="수동 분류")
+    existing[(1, hand["external_id"])]["category"] = "수동 분류"   # 제목은 그대로, 카테고리만 수정
+
+    # 이전 분류기는 stale 상품만 "옛 분류"로 분류했다고 가정
+    current = previous_categorizer(classifier_source("crawler/classifier.py"))
+    assert all(current(r) == r["category"] for r in rows)
+    previous = lambda p: "옛 분류" if p["external_id"] == stale["external_id"] else current(p)
+
+    out = MemorySupabase()
+    result = reprocess(out, existing, directory, entries, workers=2, reclassify=previous)
+    assert result["cu"]["pages"] == 6 * 2   # 빈 페이지와 그 뒤 미리 받은 페이지는 건너뜀
+    assert result["cu"]["stats"]["updated"] == 1 and result["cu"]["stats"]["inserted"] == 0
+    assert [(r["external_id"], r["category"]) for r in out.rows()] == [(stale["external_id"], stale["category"])]
+
+
+def test_reprocess_replays_only_current_listing_of_shrunk_list(tmp_path):
+    directory = str(tmp_path / "archive")
+    cache = ResponseCache(str(tmp_path / "http"))   # 실제 실행처럼 응답 캐시 사용 (두 번째 실행의 1~3페이지는 적중)
+    db = MemorySupabase()
+    with StubServer(pages=4) as server:
+        for pages in (4, 3):   # 두 번째 실행에서 목록이 줄어 4페이지 상품은 비활성화
+            server.pages = pages
+            archive = PageArchive(directory)
+            existing = {(r["brand_id"], r["external_id"]): {"title": r["title"], "category": r["category"],
+                                                             "hash": content_hash(r), "is_active": r["is_active"]}
+                        for r in db.rows()}
+            crawl_cu(db, existing, FetchEngine(name="cu"), cache=cache, base_url=server.base_url, archive=archive)
+            archive.close()
+    rows = db.rows()
+    assert cache.hits >= 6 * 3 and any(not r["is_active"] for r in rows)
+
+    existing = {(r["brand_id"], r["external_id"]): {"title": r["title"], "category": r["category"],
+                                                     "hash": content_hash(r), "is_active": r["is_active"]} for r in rows}
+    out = MemorySupabase()
+    result = reprocess(out, existing, directory, PageArchive(directory).pages(["cu"]), workers=2)
+    assert result["cu"]["pages"] == 6 * 3
+    assert result["cu"]["stats"]["inserted"] == 0 and result["cu"]["stats"]["updated"] == 0
+    assert out.rows() == []
+
+    # 처음부터 다시 만들어도 지금 목록의 상품 전부, 비활성화된 상품은 제외
+    rebuilt = MemorySupabase()
+    result = reprocess(rebuilt, {}, directory, PageArchive(directory).pages(["cu"]), workers=2)
+    assert result["cu"]["stats"]["inserted"] == sum(r["is_active"] for r in rows)
+    assert {r["external_id"] for r in rebuilt.rows()} == {r["external_id"] for r in rows if r["is_active"]}
+
+
+def test_reprocess_keeps_stored_promotion_for_fresh_items(tmp_path, monkeypatch):
+    from crawler import seven_crawler
+    from crawler.product import BRAND_SEVEN, promo_code
+
+    def crawl_and_reprocess(directory):
+        db, archive = MemorySupabase(), PageArchive(directory)
+        with StubServer(pages=2) as server:
+            seven_crawler.crawl_seven(db, {}, FetchEngine(name="seven"), cache=False, base_url=server.base_url,
+                                      archive=archive)
+        archive.close()
+        fresh = [r for r in db.rows() if r["category"] == "간편식사"]
+        existing = {(BRAND_SEVEN, r["external_id"]): {"title": r["title"], "category": r["category"], "hash": 0,
+                                                       "is_active": True, "promo": promo_code("1+1")} for r in fresh}
+        out = MemorySupabase()
+        reprocess(out, existing, directory, PageArchive(directory).pages(["seven"]), workers=2)
+        return fresh, {r["external_id"]: r["promotion_type"] for r in out.rows() if r["category"] == "간편식사"}
+
+    # 행사 탭을 끝까지 보관했으면 탭에 없는 상품은 목록에 표시된 그대로
+    fresh, replayed = crawl_and_reprocess(str(tmp_path / "full"))
+    assert replayed == {r["external_id"]: r["promotion_type"] for r in fresh}
+    # 행사 탭이 중간에 끊긴 아카이브면 DB에 있던 행사를 유지 (crawl_seven과 같은 규칙)
+    monkeypatch.setattr(seven_crawler, "SEVEN_MAX_PAGES", 1)
+    fresh, replayed = crawl_and_reprocess(str(tmp_path / "partial"))
+    assert fresh and set(replayed.values()) == {"1+1"}
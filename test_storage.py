@@ -0,0 +1,46 @@
+import pytest
+
+from crawler.cu_crawler import fetch_existing_data_map
+from crawler.product import Product
+from crawler.storage import LocalClient, open_client
+from crawler.writer import BulkWriter
+
+
+def test_local_client_upsert_filters_and_snapshot(tmp_path):
+    db = LocalClient(str(tmp_path / "local.sqlite3"))
+    rows = [Product(1, i, f"상품 {i}", 1000 + i, promotion_type="1+1").to_row() for i in range(30)]
+    BulkWriter(db, min_batch=5, max_batch=5).write(rows)
+    db.table("new_products").upsert([{"brand_id": 1, "external_id": 3, "price": 1}], on_conflict="brand_id,external_id").execute()
+    db.table("new_products").update({"is_active": False}).eq("brand_id", 1).in_("external_id", [4, 5]).execute()
+    db.table("new_products").delete().or_("promotion_type.eq.덤,title.ilike.%상품 2_%").execute()
+
+    got = db.table("new_products").select("external_id, title, price, is_active").eq("brand_id", 1)\
+        .order("external_id").range(2, 5).execute().data
+    assert got == [{"external_id": 2, "title": "상품 2", "price": 1002, "is_active": True},
+                   {"external_id": 3, "title": "상품 3", "price": 1, "is_active": True},   # 없는 컬럼은 유지
+                   {"external_id": 4, "title": "상품 4", "price": 1004, "is_active": False},
+                   {"external_id": 5, "title": "상품 5", "price": 1005, "is_active": False}]
+    assert db.count() == 20
+
+    # 스냅샷 워터마크 증분 조회가 updated_at으로 그대로 동작
+    existing = fetch_existing_data_map(db, snapshot_path=str(tmp_path / "snap.sqlite3"))
+    assert existing[(1, 0)]["price"] == 1000 and existing[(1, 4)]["is_active"] is False
+    assert db.bulk_load("new_products", [[dict(r, price=0)] for r in rows[:3]]) == 3
+    assert fetch_existing_data_map(db, snapshot_path=str(tmp_path / "snap.sqlite3"))[(1, 0)]["price"] == 0
+    with pytest.raises(ValueError):
+        db.table("new_products").select("password").execute()
+    db.close()
+
+
+def test_open_client_prefers_local_db(tmp_path, monkeypatch):
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    assert open_client("") is None
+    assert isinstance(open_client(str(tmp_path / "x.sqlite3")), LocalClient)
+
+
+def test_export_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    db = LocalClient(":memory:")
+    db.bulk_load("new_products", [Product(2, i, "우유", 1200).to_row() for i in range(10)])
+    assert db.export_parquet("new_products", str(tmp_path / "p.parquet")) == 10
+    assert pq.read_table(str(tmp_path / "p.parquet")).num_rows == 10
@@ -0,0 +1,59 @@
+from crawler import seven_crawler, sweep
+from crawler.bench import MemorySupabase, StubServer
+from crawler.fetcher import FetchEngine, create_session
+from crawler.product import BRAND_SEVEN
+from crawler.sweep import deactivate_missing
+
+
+def seed(db, brand_id, ids, active=True):
+    db.table("new_products").upsert([{"brand_id": brand_id, "external_id": ext, "is_active": active} for ext in ids],
+                                    on_conflict="brand_id,external_id").execute()
+    return {(brand_id, ext): {"title": "", "category": "", "hash": 0, "is_active": active} for ext in ids}
+
+
+def active_ids(db, brand_id=1):
+    return sorted(r["external_id"] for r in db.rows() if r["brand_id"] == brand_id and r["is_active"])
+
+
+def test_deactivates_missing_products_below_threshold(monkeypatch):
+    monkeypatch.setattr(sweep, "DEACTIVATE_CHUNK", 2)   # 여러 번의 bulk update로 나눠짐
+    db = MemorySupabase()
+    existing = {**seed(db, 1, range(10)), **seed(db, 1, [100], active=False), **seed(db, 2, [5, 6])}
+    assert deactivate_missing(db, 1, range(3, 10), existing) == 3   # 10개 중 3개 = 30%까지는 허용
+    assert active_ids(db) == list(range(3, 10))
+    assert active_ids(db, 2) == [5, 6]   # 다른 브랜드는 그대로
+
+
+def test_skips_when_too_many_would_be_deactivated():
+    db = MemorySupabase()
+    existing = seed(db, 1, range(10))
+    assert deactivate_missing(db, 1, range(4, 10), existing) == 0   # 10개 중 4개가 사라짐 → 크롤링 이상으로 판단
+    assert deactivate_missing(db, 1, [], existing) == 0
+    assert active_ids(db) == list(range(10))
+
+
+def test_crawler_sweeps_only_when_every_list_reached_the_end(monkeypatch):
+    def crawl(db, existing):
+        with StubServer(pages=2) as server:
+            engine = FetchEngine(create_session({}), max_workers=2, per_host=2, name="seven")
+            seven_crawler.crawl_seven(db, existing, engine, cache=False, base_url=server.base_url)
+
+    db = MemorySupabase()
+    crawl(db, {})
+    existing = {(r["brand_id"], r["external_id"]): {"title": r["title"], "category": r["category"], "hash": 0,
+                                                     "is_active": True} for r in db.rows()}
+    existing.update(seed(db, BRAND_SEVEN, [-1]))   # 사이트에서 사라진 상품
+
+    # 프레시푸드 목록만 에러로 끝남 ("error") → 행사 탭은 끝까지 봤어도 비활성화하지 않음
+    broken = dict(seven_crawler.SEVEN_FRESH_LISTS[0], path="/product/missing.asp")
+    monkeypatch.setattr(seven_crawler, "SEVEN_FRESH_LISTS", [broken])
+    crawl(db, existing)
+    assert -1 in active_ids(db, BRAND_SEVEN)
+    monkeypatch.undo()
+    monkeypatch.setattr(seven_crawler, "SEVEN_MAX_PAGES", 1)   # 모든 목록이 "max_pages"
+    crawl(db, existing)
+    assert -1 in active_ids(db, BRAND_SEVEN)
+
+    monkeypatch.undo()
+    crawl(db, existing)   # 모든 목록이 "end"
+    assert -1 not in active_ids(db, BRAND_SEVEN)